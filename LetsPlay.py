@@ -1,8 +1,52 @@
-from gomoku import Gomoku
+import argparse
 
-def main():
-    game = Gomoku()
-    game.start()
+from gomoku import Gomoku, EVALUATION_MODES
+from board import DEFAULT_DIMENSION, MIN_DIMENSION, MAX_DIMENSION
+from cache import EvaluationCache, MemoryBudget
+from record import RecordWriter
+
+# heuristic evaluation 결과를 저장하는 파일입니다.
+# 게임이 끝나면 저장하고, 다음 실행 때 불러옵니다.
+EVALUATION_CACHE_PATH = "evaluation_cache.pkl"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gomoku")
+    parser.add_argument("--dimension", type=int, default=DEFAULT_DIMENSION,
+                        help="오목판의 크기 ({}-{}, 기본값 {})".format(MIN_DIMENSION, MAX_DIMENSION, DEFAULT_DIMENSION))
+    parser.add_argument("--memory", type=int, default=MemoryBudget.DEFAULT_BYTES // (1024 * 1024),
+                        help="캐시들이 사용할 수 있는 전체 메모리 (단위 : MB)")
+    parser.add_argument("--evaluation", choices=EVALUATION_MODES, default="max",
+                        help="leaf의 평가 방식 (max : 가장 큰 패턴 / sum : 모든 패턴의 가중치 합)")
+    parser.add_argument("--quiescence", type=int, default=0,
+                        help="depth 0에서 forcing move(5, 4의 방어, 4)만으로 더 탐색할 수의 수 (0 : 사용하지 않음)")
+    parser.add_argument("--quiescence-threes", action="store_true",
+                        help="quiescence search에서 열린 3을 만드는 수도 탐색합니다.")
+    parser.add_argument("--record", default=None,
+                        help="게임이 끝나면 기보를 추가할 파일 (.gz로 끝나면 압축합니다)")
+    args = parser.parse_args(argv)
+    if args.dimension < MIN_DIMENSION or args.dimension > MAX_DIMENSION:
+        parser.error("오목판의 크기는 {}부터 {}까지입니다.".format(MIN_DIMENSION, MAX_DIMENSION))
+    if args.quiescence < 0:
+        parser.error("quiescence search의 수는 0 이상입니다.")
+
+    memory_budget = MemoryBudget(args.memory * 1024 * 1024)
+
+    evaluation_cache = EvaluationCache(path=EVALUATION_CACHE_PATH)
+    game = Gomoku(evaluation_cache, dimension=args.dimension, memory_budget=memory_budget)
+    game.evaluation_mode = args.evaluation
+    game.quiescence_depth = args.quiescence
+    game.quiescence_threes = args.quiescence_threes
+
+    # game이 캐시들에 메모리를 나눈 뒤에 불러오므로, 파일의 항목들도 budget 안에서만 유지됩니다.
+    evaluation_cache.load()
+    if args.record:
+        game.record_writer = RecordWriter(args.record)
+    try:
+        game.start()
+    finally:
+        evaluation_cache.save()
+        if game.record_writer is not None:
+            game.record_writer.close()
 
 if __name__ == "__main__":
     main()
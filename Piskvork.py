@@ -0,0 +1,247 @@
+import sys
+import time
+
+from board import MIN_DIMENSION, MAX_DIMENSION
+from cache import MemoryBudget
+from gomoku import Gomoku
+from player import COLORS
+
+#####################################################################
+#
+#   Piskvork (Gomocup) protocol
+#   토너먼트 관리 프로그램(piskvork 등)과 stdin/stdout으로 대화하는 engine입니다.
+#   좌표는 protocol의 "x,y"이며, x는 열(column), y는 행(row)입니다.
+#
+#   지원하는 명령
+#   START size          오목판을 준비합니다.
+#   RESTART             같은 크기의 새 게임을 시작합니다.
+#   BEGIN               engine이 첫 수를 둡니다.
+#   TURN x,y            상대가 둔 수를 받고, engine의 수를 답합니다.
+#                       돌이 있는 칸이거나 오목판 밖의 좌표라면 ERROR를 답합니다.
+#   BOARD               "x,y,field" 줄들과 DONE으로 position을 받고, engine의 수를 답합니다.
+#                       field 1 : engine의 돌 / 2 : 상대의 돌
+#   TAKEBACK x,y        x,y의 돌을 치웁니다. 둔 적이 없는 수라면 ERROR를 답합니다.
+#   INFO key value      timeout_turn / timeout_match / time_left (ms), max_memory (byte)
+#   ABOUT               engine의 정보를 답합니다.
+#   END                 종료합니다.
+#
+#   사용법
+#   python Piskvork.py
+#
+#####################################################################
+
+ABOUT = 'name="AI-Gomoku", version="1.0", author="AI-Gomoku", country="KR"'
+
+# 응답을 보내는 데 필요한 시간의 여유입니다. (단위 : 초)
+# search는 모든 노드에서 제한 시간을 확인하므로, 15~20 크기의 오목판에서 측정한 수 하나의 시간은
+# 제한 시간을 최대 5ms 정도 넘었습니다. 응답을 쓰는 시간과 측정의 오차를 위해 그 10배를 둡니다.
+TIME_MARGIN = 0.05
+
+# max_memory 중 캐시들에 나누어줄 비율입니다. 나머지는 interpreter와 search가 사용합니다.
+MEMORY_FRACTION = 0.5
+
+
+class PiskvorkBrain(object):
+
+    #####################################################################
+    #
+    #   Piskvork Brain
+    #   - init(output)
+    #       protocol의 명령을 처리하는 engine을 생성합니다. 응답은 output에 씁니다.
+    #
+    #   - handle(line, lines)
+    #       명령 한 줄을 처리합니다. BOARD 명령의 나머지 줄은 lines에서 읽습니다.
+    #       END를 받으면 False를 반환합니다.
+    #
+    #   - turn_seconds()
+    #       INFO로 받은 시간 제한 안에서 이번 수에 사용할 시간을 반환합니다.
+    #
+    #####################################################################
+
+    def __init__(self, output=sys.stdout):
+        super(PiskvorkBrain, self).__init__()
+        self.output = output
+        self.engine = None
+        self.memory_budget = MemoryBudget()
+        self.moves = []
+
+        # 시간 제한입니다. (단위 : ms, 0이라면 제한이 없습니다)
+        self.timeout_turn = 30000
+        self.timeout_match = 0
+        self.time_left = None
+
+    def send(self, message):
+        self.output.write(message + "\n")
+        self.output.flush()
+
+    def start(self, dimension):
+        if self.engine is None or self.engine.dimension != dimension:
+            self.engine = Gomoku(dimension=dimension, memory_budget=self.memory_budget)
+            self.engine.verbose = False
+            self.engine.pondering = False
+        self.engine.state.board.initialize()
+        self.engine.state.set_current_coordinate(None)
+        self.moves = []
+
+    # x,y 문자열을 (y, x) 좌표로 바꿉니다.
+    def parse(self, text):
+        x, y = [int(value) for value in text.split(",")[:2]]
+        if not (0 <= x < self.engine.dimension and 0 <= y < self.engine.dimension):
+            raise ValueError("오목판 밖의 좌표입니다. : {}".format(text))
+        return (y, x)
+
+    # 흑부터 번갈아 두므로, 다음에 둘 돌의 색은 COLORS[len(self.moves) % 2]입니다.
+    # 상대의 수는 관리 프로그램이 규칙을 검사하므로, 비어있는 칸인지만 확인합니다.
+    # 돌이 있는 칸이라면 오목판과 수 목록을 바꾸지 않고 ValueError를 발생시킵니다.
+    def put(self, coordinate, color):
+        if not self.engine.state.board.is_valid_coordinate(coordinate):
+            raise ValueError("이미 돌이 있는 좌표입니다. : {},{}".format(coordinate[1], coordinate[0]))
+        self.engine.state.board.put(coordinate, color)
+        self.played(coordinate)
+
+    def played(self, coordinate):
+        self.engine.state.set_current_coordinate(coordinate)
+        self.moves.append(coordinate)
+
+    def turn_seconds(self):
+        limits = []
+        if self.timeout_turn > 0:
+            limits.append(self.timeout_turn / 1000.0)
+        if self.timeout_match > 0:
+            time_left = self.time_left if self.time_left is not None else self.timeout_match
+            # 남은 시간을 앞으로 둘 수의 수(최소 10수)로 나누어 사용합니다.
+            moves_left = max(10, (len(self.engine.state.board.cells) - len(self.moves)) // 2)
+            limits.append(time_left / 1000.0 / moves_left)
+        if not limits:
+            return None
+        return max(0.01, min(limits) - TIME_MARGIN)
+
+    def play(self):
+        color = COLORS[len(self.moves) % 2]
+        start = time.monotonic()
+        action, depth = self.engine.think(self.engine.players[COLORS.index(color)], self.turn_seconds())
+        if self.time_left is not None:
+            self.time_left = max(0, self.time_left - int((time.monotonic() - start) * 1000))
+        if action is None:
+            self.send("ERROR 둘 곳이 없습니다.")
+            return
+
+        # engine의 수는 쌍삼을 검사하여 둡니다. 둘 수 없는 수라면 관리 프로그램에 보내지 않습니다.
+        board = self.engine.state.board
+        if not board.is_valid_coordinate(action) or not board.place(board.index(action), color):
+            self.send("ERROR 둘 수 없는 수입니다. : {},{}".format(action[1], action[0]))
+            return
+        self.played(action)
+        self.send("MESSAGE depth {}".format(depth))
+        self.send("{},{}".format(action[1], action[0]))
+
+    def info(self, key, value):
+        if key == "timeout_turn":
+            self.timeout_turn = int(value)
+        elif key == "timeout_match":
+            self.timeout_match = int(value)
+        elif key == "time_left":
+            self.time_left = int(value)
+        elif key == "max_memory":
+            # 0이라면 제한이 없으므로 기본 budget을 사용합니다.
+            max_memory = int(value)
+            self.memory_budget.set_total(int(max_memory * MEMORY_FRACTION) if max_memory > 0 else MemoryBudget.DEFAULT_BYTES)
+
+    def handle(self, line, lines):
+        words = line.strip().split(None, 1)
+        if not words:
+            return True
+        command = words[0].upper()
+        argument = words[1] if len(words) > 1 else ""
+
+        if command == "END":
+            return False
+
+        if command == "START":
+            dimension = int(argument)
+            if dimension < MIN_DIMENSION or dimension > MAX_DIMENSION:
+                self.send("ERROR 오목판의 크기는 {}부터 {}까지입니다.".format(MIN_DIMENSION, MAX_DIMENSION))
+                return True
+            self.start(dimension)
+            self.send("OK")
+        elif command == "RECTSTART":
+            self.send("ERROR 정사각형 오목판만 지원합니다.")
+        elif command == "ABOUT":
+            self.send(ABOUT)
+        elif command == "INFO":
+            key, _, value = argument.partition(" ")
+            self.info(key.lower(), value.strip())
+        elif self.engine is None:
+            self.send("ERROR START를 먼저 보내야 합니다.")
+        elif command == "RESTART":
+            self.start(self.engine.dimension)
+            self.send("OK")
+        elif command == "BEGIN":
+            self.play()
+        elif command == "TURN":
+            self.put(self.parse(argument), COLORS[len(self.moves) % 2])
+            self.play()
+        elif command == "TAKEBACK":
+            # 둔 수만 되돌릴 수 있습니다.
+            coordinate = self.parse(argument)
+            if coordinate not in self.moves:
+                raise ValueError("둔 적이 없는 수입니다. : {}".format(argument))
+            self.engine.state.board.put(coordinate, '.')
+            self.moves.remove(coordinate)
+            self.engine.state.set_current_coordinate(self.moves[-1] if self.moves else None)
+            self.send("OK")
+        elif command == "BOARD":
+            self.board(lines)
+        else:
+            self.send("UNKNOWN {}".format(command))
+        return True
+
+    # BOARD 명령의 position을 받습니다.
+    # 돌의 수가 같다면 engine이 흑, 아니라면 백입니다.
+    def board(self, lines):
+        own = []
+        opponent = []
+        for line in lines:
+            line = line.strip()
+            if line.upper() == "DONE":
+                break
+            if not line:
+                continue
+            fields = line.split(",")
+            coordinate = self.parse(line)
+            if fields[2].strip() == "1":
+                own.append(coordinate)
+            else:
+                opponent.append(coordinate)
+
+        self.start(self.engine.dimension)
+        own_color = 'B' if len(own) == len(opponent) else 'W'
+        opponent_color = 'W' if own_color == 'B' else 'B'
+        board = self.engine.state.board
+        cells = ['.'] * len(board.cells)
+        for coordinate in own:
+            cells[board.index(coordinate)] = own_color
+        for coordinate in opponent:
+            cells[board.index(coordinate)] = opponent_color
+        board.set_position(cells)
+
+        # 마지막으로 둔 수는 알 수 없으므로 상대의 마지막 돌을 최근의 수로 합니다.
+        self.moves = own + opponent
+        last = opponent[-1] if opponent else (own[-1] if own else None)
+        self.engine.state.set_current_coordinate(last)
+        self.play()
+
+
+def main():
+    brain = PiskvorkBrain(sys.stdout)
+    lines = iter(sys.stdin.readline, "")
+    for line in lines:
+        try:
+            if not brain.handle(line, lines):
+                break
+        except (ValueError, IndexError) as error:
+            brain.send("ERROR {}".format(error))
+
+
+if __name__ == "__main__":
+    main()
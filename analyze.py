@@ -0,0 +1,172 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+
+from player import COLORS
+from position import state_from_moves
+from record import read_records
+from scheduler import worker_engine
+from weights import PATTERNS
+
+#####################################################################
+#
+#   Bulk Analysis
+#   기보 파일들의 position들을 process pool에서 분석하여 결과를 JSON lines로 씁니다.
+#   position은 기보의 각 수를 두기 직전의 오목판이며, 둘 차례인 플레이어의 관점에서
+#   best move와 utility, 양쪽 플레이어의 가장 큰 위협(heuristic의 패턴)을 구합니다.
+#
+#   - search는 고정된 노드 수(--nodes)까지만 진행하므로, 실행 환경에 관계없이 같은 결과를 얻습니다.
+#     position마다 transposition table을 비우므로 worker의 순서에도 영향을 받지 않습니다.
+#   - 결과는 입력 순서대로 쓰며, 일정 개수마다 checkpoint(<output>.ckpt)에
+#     완료한 position의 수와 output 파일의 길이를 저장합니다.
+#     같은 명령을 다시 실행하면 checkpoint 이후의 position부터 이어서 분석합니다.
+#
+#   사용법
+#   python analyze.py games.jsonl.gz more.jsonl --output analysis.jsonl --nodes 20000 --workers 8
+#
+#####################################################################
+
+CHECKPOINT_VERSION = 1
+
+
+# 기보 파일들의 position을 (file, game, ply, dimension, moves) 순서로 yield합니다.
+# moves는 position까지 흑부터 번갈아 둔 수들이고, 그 다음 수 moves[ply]는 실제로 둔 수입니다.
+def positions(paths, min_ply=0, every=1):
+    for path in paths:
+        for game, record in enumerate(read_records(path)):
+            for ply in range(min_ply, len(record.moves), every):
+                yield path, game, ply, record.dimension, record.moves[:ply + 1]
+
+
+# 오목판에 있는 패턴들 중 heuristic evaluation의 값이 가장 큰 패턴의 이름입니다.
+# 가중치가 같은 패턴이 여러 개라면 PATTERNS의 앞에 있는(더 강한) 패턴을 고릅니다.
+# 가중치로 패턴을 찾으면 가중치가 같은 패턴들을 구별할 수 없으므로, 패턴의 수(pattern_counts)에서 구합니다.
+def threat(pattern_counts, scores):
+    best = None
+    for pattern, count in enumerate(pattern_counts):
+        if count and (best is None or scores[pattern] > scores[best]):
+            best = pattern
+    return PATTERNS[best] if best is not None else None
+
+
+# worker process에서 position 하나를 분석합니다.
+def analyse_position(job):
+    path, game, ply, dimension, moves, nodes = job
+    engine = worker_engine(dimension)
+    engine.transposition_table.clear()
+
+    state = state_from_moves(moves[:ply], dimension)
+
+    # 가까운 좌표들 중 랜덤하게 고르는 경우에도 같은 position에서는 같은 수를 고르도록 합니다.
+    state.board.rng = random.Random(state.board.hash)
+
+    color = ply % 2
+    player = engine.players[color]
+    started = engine.nodes
+    action, depth = engine.think(player, max_nodes=nodes, state=state)
+
+    # 완료된 depth의 utility는 root의 transposition table 항목에 있습니다.
+    entry = engine.transposition_table.get((state.board.hash, color))
+    utility = entry[2] if entry is not None and depth >= 0 else None
+    own = threat(state.pattern_counts(player), engine.scores)
+    opponent = threat(state.pattern_counts(engine.players[1 - color]), engine.scores)
+
+    return {
+        "file": path, "game": game, "ply": ply, "color": COLORS[color],
+        "move": list(action) if action is not None else None,
+        "played": list(moves[ply]),
+        "utility": utility, "depth": depth, "nodes": engine.nodes - started,
+        "threat": own, "opponent_threat": opponent,
+    }
+
+
+def checkpoint_path(output):
+    return output + ".ckpt"
+
+
+# 이전 실행의 checkpoint를 읽습니다. 같은 입력과 설정의 checkpoint가 아니라면 오류입니다.
+def load_checkpoint(output, settings):
+    path = checkpoint_path(output)
+    if not os.path.exists(path):
+        return 0, 0
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("settings") != settings:
+        raise ValueError("{}는 다른 입력이나 설정의 checkpoint입니다. 파일을 지우거나 다른 --output을 사용하세요.".format(path))
+    return checkpoint["done"], checkpoint["offset"]
+
+
+def save_checkpoint(output, settings, done, offset):
+    path = checkpoint_path(output)
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CHECKPOINT_VERSION, "settings": settings, "done": done, "offset": offset}, f)
+    os.replace(temp_path, path)
+
+
+def run(paths, output, nodes, workers=None, min_ply=0, every=1, batch=256, checkpoint_every=256, log=sys.stderr):
+    settings = {"inputs": [os.path.abspath(path) for path in paths], "nodes": nodes, "min_ply": min_ply, "every": every}
+    done, offset = load_checkpoint(output, settings)
+
+    # checkpoint 이후에 쓰인 결과는 버립니다. 중단될 때 쓰던 줄은 끝나지 않았을 수 있습니다.
+    mode = "r+b" if os.path.exists(output) else "wb"
+    with open(output, mode) as f:
+        f.truncate(offset)
+        f.seek(offset)
+
+        jobs = (position + (nodes,) for position in positions(paths, min_ply, every))
+        jobs = itertools.islice(jobs, done, None)
+        if done:
+            print("{}개의 position을 건너뜁니다.".format(done), file=log)
+
+        workers = workers or multiprocessing.cpu_count() or 1
+        since_checkpoint = 0
+        with multiprocessing.Pool(workers) as pool:
+            while True:
+                # Pool.imap은 입력을 모두 미리 읽으므로, batch만큼씩 나누어 메모리 사용량을 제한합니다.
+                chunk = list(itertools.islice(jobs, batch * workers))
+                if not chunk:
+                    break
+                chunksize = max(1, min(16, len(chunk) // (workers * 4)))
+                for result in pool.imap(analyse_position, chunk, chunksize):
+                    f.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+                    done += 1
+                    since_checkpoint += 1
+                    if since_checkpoint >= checkpoint_every:
+                        f.flush()
+                        save_checkpoint(output, settings, done, f.tell())
+                        since_checkpoint = 0
+                print("{}개의 position을 분석했습니다.".format(done), file=log)
+
+        f.flush()
+        save_checkpoint(output, settings, done, f.tell())
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기보의 position들을 분석합니다.")
+    parser.add_argument("records", nargs="+", help="기보 파일들 (record.py 형식)")
+    parser.add_argument("--output", required=True, help="분석 결과를 쓸 JSON lines 파일")
+    parser.add_argument("--nodes", type=int, default=20000, help="position마다 search할 노드의 수")
+    parser.add_argument("--workers", type=int, default=None, help="worker process의 수 (기본값 : CPU 수)")
+    parser.add_argument("--min-ply", type=int, default=0, help="이 수부터 분석합니다.")
+    parser.add_argument("--every", type=int, default=1, help="이 수마다 한 position을 분석합니다.")
+    parser.add_argument("--checkpoint-every", type=int, default=256, help="이 개수의 결과마다 checkpoint를 저장합니다.")
+    args = parser.parse_args(argv)
+    if args.nodes <= 0 or args.every <= 0 or args.min_ply < 0:
+        parser.error("--nodes와 --every는 1 이상, --min-ply는 0 이상이어야 합니다.")
+
+    try:
+        done = run(args.records, args.output, args.nodes, args.workers, args.min_ply, args.every,
+                   checkpoint_every=args.checkpoint_every)
+    except ValueError as error:
+        parser.exit(1, "{}\n".format(error))
+    print("완료 : {}개의 position".format(done), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+from cache import EvaluationCache
+from gomoku import Gomoku
+from player import Player, COLORS
+from position import state_from_moves
+
+#####################################################################
+#
+#   Benchmark
+#   엔진의 hot path들의 성능을 측정합니다.
+#   - Board.on / Board.find_current_closest / Board.double_three / State.new_state
+#   - State.heuristic_evaluation / Gomoku.finished
+#   - 고정된 depth의 alpha_beta_search
+#
+#   사용법
+#   python benchmark.py --output before.json
+#   python benchmark.py --compare before.json --threshold 0.1
+#       before.json과 비교하여 10% 이상 느려진 항목이 있다면 실패합니다.
+#
+#####################################################################
+
+# 측정에 사용하는 19x19 position들입니다. 흑부터 번갈아 둔 수의 목록입니다.
+POSITIONS = {
+    "early": [(9, 9), (11, 7), (9, 8), (12, 8), (10, 10), (8, 11)],
+    "middle": [(9, 9), (7, 7), (6, 7), (9, 6), (11, 8), (10, 8), (8, 8), (11, 6), (9, 10), (11, 9),
+               (8, 12), (5, 6), (8, 9), (5, 9), (9, 12), (10, 11), (10, 14), (7, 6), (6, 5), (9, 11),
+               (12, 6), (12, 13), (7, 8), (7, 14)],
+    "late": [(9, 9), (11, 11), (9, 11), (13, 9), (10, 9), (9, 8), (10, 10), (12, 11), (11, 12), (7, 8),
+             (5, 8), (9, 10), (8, 9), (8, 10), (13, 10), (12, 14), (3, 8), (11, 10), (12, 13), (2, 6),
+             (5, 6), (15, 11), (5, 7), (4, 10), (17, 9), (4, 6), (7, 10), (8, 12), (3, 9), (4, 5),
+             (9, 12), (11, 7), (11, 14), (4, 7), (5, 5), (2, 7), (14, 13), (10, 13), (8, 11), (11, 8),
+             (9, 14), (13, 15), (5, 11), (6, 6), (10, 12), (7, 13), (11, 13), (1, 4), (6, 8), (15, 7),
+             (6, 3), (14, 9), (4, 8), (13, 7), (13, 8), (13, 12), (7, 9), (2, 8), (6, 11), (0, 8),
+             (6, 7), (8, 7), (5, 10), (8, 8), (10, 8), (4, 4), (14, 10), (6, 9), (14, 11), (2, 9)],
+}
+
+DIMENSION = 19
+
+
+# 수의 목록으로 position을 만듭니다.
+# 반환값 : (state, 다음에 둘 플레이어)
+def load_position(moves, dimension=DIMENSION):
+    state = state_from_moves(moves, dimension)
+    return state, Player(COLORS[len(moves) % 2])
+
+
+# function을 repeat번 실행하여 가장 빠른 실행 시간을 반환합니다.
+# function은 실행한 연산의 수를 반환합니다.
+def measure(function, repeat):
+    best = None
+    ops = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return ops, best
+
+
+def bench_on(state, player):
+    board = state.board
+    coordinates = [(y, x) for y in range(board.dimension) for x in range(board.dimension)]
+
+    def run():
+        for _ in range(20):
+            for coordinate in coordinates:
+                board.on(coordinate)
+        return 20 * len(coordinates)
+    return run
+
+
+def bench_find_current_closest(state, player):
+    board = state.board
+    empties = board.all_possible_coordinate()
+    current = state.get_current_coordinate()
+
+    def run():
+        for _ in range(20):
+            board.find_current_closest(current, empties)
+        return 20
+    return run
+
+
+def bench_double_three(state, player):
+    board = state.board
+    empties = board.all_possible_coordinate()
+
+    def run():
+        for coordinate in empties:
+            board.double_three(coordinate, player)
+            board.put(coordinate, '.')
+        return len(empties)
+    return run
+
+
+def bench_new_state(state, player):
+    empties = state.board.all_possible_coordinate()
+
+    def run():
+        for coordinate in empties:
+            state.new_state(coordinate, player)
+        return len(empties)
+    return run
+
+
+def bench_heuristic_evaluation(state, player):
+    def run():
+        for _ in range(20):
+            state.heuristic_evaluation(player, "max")
+        return 20
+    return run
+
+
+def bench_finished(state, player):
+    game = Gomoku()
+    game.dimension = state.dimension
+    game.state = state
+
+    def run():
+        for _ in range(20):
+            game.finished()
+        return 20
+    return run
+
+
+BENCHMARKS = [
+    ("Board.on", bench_on),
+    ("Board.find_current_closest", bench_find_current_closest),
+    ("Board.double_three", bench_double_three),
+    ("State.new_state", bench_new_state),
+    ("State.heuristic_evaluation", bench_heuristic_evaluation),
+    ("Gomoku.finished", bench_finished),
+]
+
+
+# 고정된 depth의 alpha-beta search를 측정합니다.
+# 매번 비어있는 캐시로 시작하므로 반복 실행의 결과가 서로 영향을 주지 않습니다.
+def bench_search(moves, depth, repeat):
+    best = None
+    for _ in range(repeat):
+        state, player = load_position(moves)
+        game = Gomoku(EvaluationCache())
+        game.dimension = state.dimension
+        game.state = state
+        game.verbose = False
+
+        start = time.perf_counter()
+        game.alpha_beta_search(player, depth)
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best[0]:
+            best = (elapsed, game.nodes, game.evaluations, game.memory_usage()["total"]["bytes"])
+
+    elapsed, nodes, evaluations, cache_bytes = best
+    return {
+        "seconds": elapsed,
+        "nodes": nodes,
+        "evaluations": evaluations,
+        "nodes_per_sec": nodes / elapsed if elapsed > 0 else 0.0,
+        "cache_bytes": cache_bytes,
+    }
+
+
+def run_benchmarks(depth, repeat, positions=None):
+    results = {}
+    for position_name, moves in POSITIONS.items():
+        if positions is not None and position_name not in positions:
+            continue
+
+        for name, bench in BENCHMARKS:
+            state, player = load_position(moves)
+            ops, elapsed = measure(bench(state, player), repeat)
+            results["{}[{}]".format(name, position_name)] = {
+                "seconds": elapsed,
+                "ops": ops,
+                "ops_per_sec": ops / elapsed if elapsed > 0 else 0.0,
+            }
+
+        results["Gomoku.alpha_beta_search(depth={})[{}]".format(depth, position_name)] = bench_search(moves, depth, repeat)
+
+    return results
+
+
+# 이전 결과와 비교하여 threshold 이상 느려진 항목들을 반환합니다.
+# 처리량(ops_per_sec 또는 nodes_per_sec)으로 비교합니다.
+def compare(baseline, current, threshold):
+    regressions = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        metric = "ops_per_sec" if "ops_per_sec" in result else "nodes_per_sec"
+        before = baseline[name].get(metric, 0.0)
+        after = result[metric]
+        if before <= 0:
+            continue
+        change = (after - before) / before
+        if change < -threshold:
+            regressions.append((name, before, after, change))
+    return regressions
+
+
+def print_results(results):
+    for name, result in results.items():
+        if "ops_per_sec" in result:
+            print("{:<60} {:>14.1f} ops/sec".format(name, result["ops_per_sec"]))
+        else:
+            print("{:<60} {:>14.1f} nodes/sec  ({} nodes, {} evaluations, {:.3f} s, cache {} KB)".format(
+                name, result["nodes_per_sec"], result["nodes"], result["evaluations"], result["seconds"],
+                result.get("cache_bytes", 0) // 1024))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gomoku engine benchmark")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.10, help="허용하는 성능 저하 비율 (기본값 0.10)")
+    parser.add_argument("--depth", type=int, default=0, help="alpha_beta_search의 depth (기본값 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="각 항목의 반복 측정 횟수 (기본값 3)")
+    parser.add_argument("--positions", nargs="*", choices=list(POSITIONS), help="측정할 position")
+    args = parser.parse_args(argv)
+
+    # 엔진이 출력하는 메시지(쌍삼 등)는 측정 결과에서 제외합니다.
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run_benchmarks(args.depth, args.repeat, args.positions)
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": sys.version,
+                "platform": platform.platform(),
+                "depth": args.depth,
+                "results": results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for name, before, after, change in regressions:
+            print("REGRESSION {} : {:.1f} -> {:.1f} ({:+.1%})".format(name, before, after, change))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
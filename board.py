@@ -1,6 +1,147 @@
+from array import array
 import random
 import copy
 
+import tables
+
+# 8 방향의 (dy, dx)입니다. direction과 direction+4는 서로 반대 방향입니다.
+# (0, 1) / (1, 1) / (1, 0) / (1, -1) / (0, -1) / (-1, -1) / (-1, 0) / (-1, 1)
+DY = [0,1,1,1,0,-1,-1,-1]
+DX = [1,1,0,-1,-1,-1,0,1]
+
+# 오목판의 크기입니다. 표들은 크기마다 따로 생성되어 캐시됩니다.
+# 5보다 작으면 5개의 돌을 놓을 수 없고, 행의 이름은 ROW_LABELS의 글자 수까지만 있습니다.
+DEFAULT_DIMENSION = 19
+MIN_DIMENSION = 5
+MAX_DIMENSION = 32
+
+# 행(y좌표)의 이름입니다. 26번째 행부터는 소문자를 사용합니다.
+ROW_LABELS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdef"
+
+def check_dimension(dimension):
+    if not isinstance(dimension, int) or dimension < MIN_DIMENSION or dimension > MAX_DIMENSION:
+        raise ValueError("오목판의 크기는 {}부터 {}까지입니다. : {}".format(MIN_DIMENSION, MAX_DIMENSION, dimension))
+    return dimension
+
+def row_label(y):
+    return ROW_LABELS[y]
+
+# 행의 이름을 y좌표로 바꿉니다. 알 수 없는 이름이라면 -1을 반환합니다.
+def parse_row(label):
+    if len(label) != 1 or label not in ROW_LABELS:
+        return -1
+    return ROW_LABELS.index(label)
+
+# ray에 담기는 최대 거리입니다. 오목의 패턴은 한 방향으로 5칸까지만 조사합니다.
+RAY_LENGTH = 5
+
+# Zobrist 해시에 사용되는 난수 표입니다.
+# 프로세스가 달라도 같은 position이 같은 해시를 갖도록 고정된 seed로 생성합니다.
+# zobrist_table(dimension)[color][index]는 index 위의 color 돌의 난수입니다.
+ZOBRIST_SEED = 20191205
+
+def build_zobrist(dimension):
+    rng = random.Random(ZOBRIST_SEED + dimension)
+    table = {'B': [], 'W': []}
+    for y in range(dimension):
+        for x in range(dimension):
+            table['B'].append(rng.getrandbits(64))
+            table['W'].append(rng.getrandbits(64))
+    return table
+
+# Chebyshev 거리(max(|dy|, |dx|))가 r인 좌표들의 offset 표입니다.
+# ring_offsets(dimension)[r]는 거리가 r인 (dy, dx)들의 리스트입니다.
+def build_rings(dimension):
+    rings = [[] for _ in range(dimension)]
+    for dy in range(-dimension + 1, dimension):
+        for dx in range(-dimension + 1, dimension):
+            rings[max(abs(dy), abs(dx))].append((dy, dx))
+    return rings
+
+# 모든 칸의 8 방향 ray 표입니다.
+# ray_table(dimension)[index][direction]는 index(= y*dimension + x)에서 direction 방향으로
+# 거리 1부터 최대 RAY_LENGTH까지, 오목판 안에 있는 칸들의 index tuple입니다.
+# 오목판의 끝에 가까운 칸의 ray는 짧아지므로, 범위 검사를 따로 할 필요가 없습니다.
+def build_rays(dimension):
+    rays = []
+    for y in range(dimension):
+        for x in range(dimension):
+            cell_rays = []
+            for direction in range(8):
+                ray = []
+                for dist in range(1, RAY_LENGTH+1):
+                    y_check = y + dist*DY[direction]
+                    x_check = x + dist*DX[direction]
+                    if (y_check < 0) or (y_check >= dimension) or (x_check < 0) or (x_check >= dimension):
+                        break
+                    ray.append(y_check*dimension + x_check)
+                cell_rays.append(tuple(ray))
+            rays.append(tuple(cell_rays))
+    return tuple(rays)
+
+# 칸마다, 오목판의 모든 칸을 그 칸과의 Chebyshev 거리가 가까운 순으로 정렬한 표입니다.
+# 거리가 같다면 index가 작은 칸이 먼저입니다. 한 칸의 표는 array('H') 하나입니다.
+def build_distance_orders(dimension):
+    size = dimension*dimension
+    orders = []
+    for index in range(size):
+        y, x = divmod(index, dimension)
+        # (거리, index) 순서를 int 하나로 정렬합니다.
+        keys = sorted(max(abs(cell // dimension - y), abs(cell % dimension - x))*size + cell for cell in range(size))
+        orders.append(array('H', [key % size for key in keys]))
+    return orders
+
+def build_tables(dimension):
+    return {
+        "zobrist": build_zobrist(dimension),
+        "rings": build_rings(dimension),
+        "rays": build_rays(dimension),
+        "orders": build_distance_orders(dimension),
+    }
+
+# 파일에서 불러온 표가 dimension 크기의 오목판의 표인지 확인합니다.
+def check_tables(dimension, board_tables):
+    size = dimension*dimension
+    return (len(board_tables["zobrist"]['B']) == size and len(board_tables["zobrist"]['W']) == size
+            and len(board_tables["rings"]) == dimension
+            and len(board_tables["rays"]) == size and all(len(cell_rays) == 8 for cell_rays in board_tables["rays"])
+            and len(board_tables["orders"]) == size and all(len(order) == size for order in board_tables["orders"]))
+
+# 오목판의 크기마다 한 번만 불러오거나 생성하여, 그 크기의 모든 Board가 공유합니다.
+# 생성한 표는 tables 모듈이 cache directory에 저장하므로, 다음 프로세스는 파일에서 불러옵니다.
+_board_tables = {}
+
+def board_tables(dimension):
+    if dimension not in _board_tables:
+        key = (dimension, RAY_LENGTH, ZOBRIST_SEED)
+        _board_tables[dimension] = tables.load("board", key, lambda: build_tables(dimension),
+                                               lambda loaded: check_tables(dimension, loaded))
+    return _board_tables[dimension]
+
+def zobrist_table(dimension):
+    return board_tables(dimension)["zobrist"]
+
+def ring_offsets(dimension):
+    return board_tables(dimension)["rings"]
+
+def ray_table(dimension):
+    return board_tables(dimension)["rays"]
+
+def distance_order(dimension, index):
+    return board_tables(dimension)["orders"][index]
+
+# 쌍삼 판별에서, 열린 3의 유형마다 3을 이루는 나머지 칸들의 위치입니다.
+# 유형 번호 -> [(방향, 거리)] (방향 0 : 3을 이루는 방향 / 4 : 그 반대 방향)
+THREE_MEMBERS = {
+    1: [(4, 1), (4, 2)],
+    2: [(4, 1), (4, 2), (4, 3)],
+    3: [(0, 2), (4, 1)],
+    4: [(0, 1), (4, 2)],
+    5: [(0, 1), (4, 1)],
+    6: [(0, 1), (0, 2)],
+    7: [(0, 1), (0, 2), (0, 3)],
+}
+
 class Board(object):
 
     #####################################################################
@@ -33,28 +174,192 @@ class Board(object):
     #   - find_current_closest(current, valid_actions)
     #       가능한 action(비어있는 좌표에 돌을 올려 놓는 것)의 좌표들 중에서,
     #       최근에 놓인 돌의 좌표(current)와 가장 가까운 좌표를 반환합니다.
-    #       가까운 좌표가 여러 개라면 랜덤으로 선택합니다.
+    #       가까운 좌표가 여러 개라면 self.rng로 랜덤하게 선택합니다.
+    #       self.rng에 seed가 주어진 random.Random을 넣으면 선택 결과를 재현할 수 있습니다.
     # 
     #   - double_three(coordinate, player)
     #       오목판의 coordinate위에 player의 돌을 두었을때, 쌍삼의 성립여부를 반환합니다.
     #
+    #   - longest_line(coordinate)
+    #       coordinate 위의 돌을 지나는 4 방향의 연속된 같은 색 돌의 수 중 가장 큰 값을 반환합니다.
+    #       5 이상이라면 그 돌을 둔 플레이어가 승리합니다.
+    #
+    #   - copy()
+    #       칸들만 복사한 오목판을 반환합니다. 표와 난수 생성기는 공유합니다.
+    #
+    #   - put(coordinate, color)
+    #       coordinate 위의 돌을 color로 바꾸고, position의 Zobrist 해시를 갱신합니다.
+    #
+    #   - open_threes(index, color)
+    #       index의 칸을 기준으로 4 방향에 대해 양 끝이 막히지 않은 3의 유형들을 반환합니다.
+    #
+    #   - index(coordinate) / coordinate(index)
+    #       (y, x) 좌표와 칸의 index(y*dimension + x)를 서로 바꿉니다.
+    #       search는 수를 index 하나로 다루고, 좌표는 게임과 출력에서만 사용합니다.
+    #
+    #   - place(index, color) / remove(index)
+    #       search에서 수를 두고 되돌립니다. place는 쌍삼이라면 돌을 두지 않고 False를 반환합니다.
+    #
+    #   - is_legal(coordinate, color)
+    #       coordinate가 비어있고 color의 돌을 두어도 쌍삼이 아닌지 여부를 반환합니다.
+    #       돌을 두어 확인한 뒤 되돌리므로 오목판은 바뀌지 않습니다.
+    #
+    #   - generate_moves(last, buffer)
+    #       비어있는 칸들을 last와 가까운 순으로 buffer에 채우고, 그 수를 반환합니다.
+    #
+    #   - set_position(cells)
+    #       모든 칸을 한 번에 바꾸고, Zobrist 해시를 한 번의 순회로 다시 계산합니다.
+    #       수마다 put을 호출하는 것보다 빠르며, 쌍삼 여부는 검사하지 않습니다.
+    #
+    #   - stone_counts()
+    #       색마다의 돌의 수를 {'B': 흑의 수, 'W': 백의 수}로 반환합니다.
+    #
+    #   - candidates(distance)
+    #       돌로부터 distance칸 이내에 있는 빈 칸들의 index를 오름차순으로 반환합니다.
+    #
+    #   - forbidden_points(color)
+    #       color의 돌을 두면 쌍삼이 되는 빈 칸들의 index를 오름차순으로 반환합니다.
+    #
+    #   돌의 색은 self.cells[y*dimension + x]에 저장됩니다.
+    #   self.rays는 모든 칸의 8 방향 ray 표로, 패턴을 조사하는 함수들은 이 표를 따라 칸을 조사합니다.
+    #
     #####################################################################
 
-    def __init__(self, dimension):
+    # 인스턴스마다 __dict__를 만들지 않습니다.
+    __slots__ = ('dimension', 'cells', 'rays', 'rng', 'rings', 'hash', 'zobrist')
+
+    def __init__(self, dimension, rng=None):
         super(Board, self).__init__()
-        self.board = {}
-        self.dimension = dimension
+        self.dimension = check_dimension(dimension)
+
+        # 오목판의 칸들입니다. (y, x) 칸의 돌의 색은 self.cells[y*dimension + x]에 있습니다.
+        self.cells = ['.'] * (dimension*dimension)
+        self.rays = ray_table(dimension)
+
+        # 가까운 좌표가 여러 개일 때 사용하는 난수 생성기입니다.
+        # 주어지지 않으면 random 모듈의 전역 난수 생성기를 사용합니다.
+        self.rng = rng if rng is not None else random
+        self.rings = ring_offsets(dimension)
+
+        # 현재 position의 Zobrist 해시입니다. 돌이 놓이거나 치워질 때마다 갱신됩니다.
+        self.hash = 0
+        self.zobrist = zobrist_table(dimension)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def copy(self):
+        # 표들은 같은 dimension의 모든 Board가 공유하므로 복사하지 않습니다.
+        new_board = Board.__new__(Board)
+        new_board.dimension = self.dimension
+        new_board.cells = self.cells[:]
+        new_board.rays = self.rays
+        new_board.hash = self.hash
+        new_board.zobrist = self.zobrist
+        new_board.rng = self.rng
+        new_board.rings = self.rings
+        return new_board
 
     def initialize(self):
-        for y in range(self.dimension):
-            for x in range(self.dimension):
-                self.board[(y, x)] = '.'
+        self.cells = ['.'] * (self.dimension*self.dimension)
+        self.hash = 0
+
+    def put(self, coordinate, color):
+        self.set_cell(coordinate[0]*self.dimension + coordinate[1], color)
+
+    def set_cell(self, index, color):
+        old_color = self.cells[index]
+        new_hash = self.hash
+        if old_color != '.':
+            new_hash ^= self.zobrist[old_color][index]
+        if color != '.':
+            new_hash ^= self.zobrist[color][index]
+        # 칸과 해시를 한 문장에서 함께 바꾸어, 그 사이에 예외가 발생하여 둘이 어긋나는 일이 없도록 합니다.
+        self.cells[index], self.hash = color, new_hash
+
+    def set_position(self, cells):
+        if len(cells) != len(self.cells):
+            raise ValueError("칸의 수가 오목판과 다릅니다. : {}".format(len(cells)))
+        self.cells = list(cells)
+        zobrist = self.zobrist
+        position_hash = 0
+        for index, color in enumerate(self.cells):
+            if color != '.':
+                position_hash ^= zobrist[color][index]
+        self.hash = position_hash
+
+    def stone_counts(self):
+        return {'B': self.cells.count('B'), 'W': self.cells.count('W')}
+
+    def candidates(self, distance=1):
+        cells = self.cells
+        dimension = self.dimension
+        near = [False] * len(cells)
+        # 돌마다 주변의 (2*distance+1) x (2*distance+1) 칸들을 표시합니다.
+        for index, color in enumerate(cells):
+            if color == '.':
+                continue
+            y, x = divmod(index, dimension)
+            for ny in range(max(0, y - distance), min(dimension, y + distance + 1)):
+                row = ny * dimension
+                for nx in range(max(0, x - distance), min(dimension, x + distance + 1)):
+                    near[row + nx] = True
+        return [index for index, color in enumerate(cells) if near[index] and color == '.']
+
+    def forbidden_points(self, color):
+        # 열린 3은 ray(최대 5칸) 안의 같은 색 돌로만 만들어지므로, 그 주변의 칸만 검사합니다.
+        forbidden = []
+        for index in self.candidates(RAY_LENGTH):
+            if not self.place(index, color):
+                forbidden.append(index)
+            else:
+                self.remove(index)
+        return forbidden
+
+    def index(self, coordinate):
+        return coordinate[0]*self.dimension + coordinate[1]
+
+    def coordinate(self, index):
+        return divmod(index, self.dimension)
+
+    # search에서 index에 color의 돌을 둡니다.
+    # 쌍삼이라면 돌을 두지 않고 False를 반환합니다. (double_three와 달리 메시지를 출력하지 않습니다.)
+    def place(self, index, color):
+        self.set_cell(index, color)
+        if self.is_double_three(index, color):
+            self.set_cell(index, '.')
+            return False
+        return True
+
+    def remove(self, index):
+        self.set_cell(index, '.')
+
+    def is_legal(self, coordinate, color):
+        if not self.is_valid_coordinate(coordinate):
+            return False
+        index = self.index(coordinate)
+        if not self.place(index, color):
+            return False
+        self.remove(index)
+        return True
+
+    # 비어있는 칸들을 last와 가까운 순으로 buffer에 채우고, 채운 칸의 수를 반환합니다.
+    # last가 None이라면 index 순서입니다.
+    def generate_moves(self, last, buffer):
+        cells = self.cells
+        order = distance_order(self.dimension, last) if last is not None else range(len(cells))
+        count = 0
+        for cell in order:
+            if cells[cell] == '.':
+                buffer[count] = cell
+                count += 1
+        return count
 
     def on(self, coordinate):
         if (coordinate[0] < 0) or (coordinate[0] >= self.dimension) \
              or (coordinate[1]< 0) or (coordinate[1] >= self.dimension ):
             return "not on board"
-        return self.board[coordinate]
+        return self.cells[coordinate[0]*self.dimension + coordinate[1]]
 
     def print_board(self):
         print("  ", end=" ")
@@ -62,15 +367,15 @@ class Board(object):
             print("%2d"%(x), end="  ")
         print("\n")
         for y in range(self.dimension):
-            print(chr(ord("A")+y), end="   ")
+            print(row_label(y), end="   ")
             for x in range(self.dimension):
-                print(self.board[(y, x)],end="   ")
+                print(self.cells[y*self.dimension + x],end="   ")
 
             print("\n")
 
     def make_marker(self, coordinate, player):
         if self.is_valid_coordinate(coordinate):
-            self.board[(coordinate[0], coordinate[1])] = player.color
+            self.put(coordinate, player.color)
             if self.double_three((coordinate[0],coordinate[1]), player):
                 print("플레이어 {}의 쌍삼입니다!".format(player.get_player()))
                 return [-1, -1]
@@ -80,7 +385,7 @@ class Board(object):
     
     def delete_marker(self, coordinate):
         if self.on(coordinate) != '.':
-            self.board[(coordinate[0], coordinate[1])] = '.'
+            self.put(coordinate, '.')
 
     def is_valid_coordinate(self, coordinate):
         # coordinate의 y좌표나 x좌표가 오목판 밖에 존재한다면 False를 반환합니다.
@@ -88,171 +393,159 @@ class Board(object):
             or  (coordinate[1]<0) or (coordinate[1]>=self.dimension) :
 
             return False
-        if self.board[(coordinate[0], coordinate[1])] == '.':
+        if self.cells[coordinate[0]*self.dimension + coordinate[1]] == '.':
             return True
         else:
             return False
 
     def all_possible_coordinate(self):
         coordinates = []
-        
-        for y in range(self.dimension):
-            for x in range(self.dimension):
-                temp = (y, x)
-                if self.is_valid_coordinate(temp):
-                    coordinates.append(temp)
+        dimension = self.dimension
+
+        for index, color in enumerate(self.cells):
+            if color == '.':
+                coordinates.append((index // dimension, index % dimension))
 
         return coordinates
 
     def find_current_closest(self, current, valid_actions):
-      distances = []
-      for i, action in enumerate(valid_actions):
-        dist = max(abs(current[0]-action[0]),abs(current[1]-action[1]))
-        distances.append(dist)
-      
-      count = 0
-      for i in range(len(distances)):
-          if distances[i]==min(distances):
-              count += 1
-      min_distance_index = random.randrange(count)
-      return valid_actions[min_distance_index]
-
-    # 쌍삼을 판별합니다.
-    # coordinate위의 돌을 기준으로, 돌의 수를 새어봅니다.
-    def double_three(self, coordinate, player, nested=False):
-        
-        self.board[(coordinate[0], coordinate[1])] = player.color
+        if len(valid_actions) == 0:
+            return None
+
+        candidates = set((action[0], action[1]) for action in valid_actions)
+        y, x = current[0], current[1]
+
+        # current에서 가까운 ring부터 조사하여, 처음으로 action이 있는 ring의 action들 중 하나를 선택합니다.
+        # ring 안의 좌표들은 항상 같은 순서이므로, 같은 rng 상태라면 같은 action을 선택합니다.
+        for ring in self.rings:
+            closest = []
+            for dy, dx in ring:
+                if (y+dy, x+dx) in candidates:
+                    closest.append((y+dy, x+dx))
+            if closest:
+                return self.rng.choice(closest)
+
+        # current가 오목판 밖에 있다면 ring으로 찾을 수 없으므로 모든 action의 거리를 비교합니다.
+        distance = min(max(abs(y-action[0]), abs(x-action[1])) for action in candidates)
+        closest = sorted(action for action in candidates if max(abs(y-action[0]), abs(x-action[1])) == distance)
+        return self.rng.choice(closest)
+
+    def longest_line(self, coordinate):
+        if self.on(coordinate) in ('.', "not on board"):
+            return 0
+        return self.line_length(coordinate[0]*self.dimension + coordinate[1])
+
+    # index 위의 돌을 지나는 4 방향의 연속된 같은 색 돌의 수 중 가장 큰 값을 반환합니다.
+    def line_length(self, index):
+        cells = self.cells
+        color = cells[index]
+        rays = self.rays[index]
+
+        longest = 0
+        # 가로 / 기울기 1 대각선 / 세로 / 기울기 -1 대각선
+        # 양의 방향(direction)과 음의 방향(direction+4)으로 같은 색의 돌을 셉니다.
+        for direction in range(4):
+            count = 1
+            for ray in (rays[direction], rays[direction+4]):
+                for cell in ray:
+                    if cells[cell] != color:
+                        break
+                    count += 1
+            longest = max(longest, count)
 
-        cur_color = self.on(coordinate)
-        y, x = coordinate
+        return longest
 
-        # 8 방향에 대한 연속된 돌의 정보를 저장합니다.
+    # index의 칸을 기준으로 4 방향에 대해 양 끝이 막히지 않은 3을 조사합니다.
+    # 찾은 3마다 (방향*10 + 유형)을 담은 리스트를 반환합니다.
+    #
+    # 돌의 분포 유형은 다음과 같습니다.
+    # (가로/기울기 1 대각선/세로/기울기 -1 대각선) : (음의 방향에 놓인 돌의 수 / 중앙의 돌 / 양의 방향에 놓인 돌의 수) : 연속여부
+    # 유형 1 -->  (2/1/0) : 연속
+    # 유형 2 -->  (2/1/0) : 불연속
+    # 유형 3 -->  (1/1/1) : 불연속
+    # 유형 4 -->  (1/1/1) : 불연속
+    # 유형 5 -->  (1/1/1) : 연속
+    # 유형 6 -->  (0/1/2) : 연속
+    # 유형 7 -->  (0/1/2) : 불연속
+    def open_threes(self, index, color):
+        cells = self.cells
+        rays = self.rays[index]
+
+        # 8 방향에 대해, 최대 거리 3만큼 떨어진 곳까지 존재하는 같은 색 돌의 수를 조사합니다.
+        # 다른 색의 돌이 있다면 카운팅을 멈추고, 돌이 존재하지 않는다면 카운팅을 멈추지 않습니다.
         continuous_marker = []
-
-        # (y,x)를 기준으로 8개의 방향에 대해 최대 돌의 개수를 조사합니다.
-        dy = [0,1,1,1,0,-1,-1,-1]
-        dx = [1,1,0,-1,-1,-1,0,1]  
-
-        # 현재 좌표(y,x)를 기준으로 8 방향에 대해 연속된 돌들을 탐색합니다.
-        # (y,x): (0, 1) / (1, 1) / (1, 0) / (1, -1) / (0, -1) / (-1, -1) / (-1, 0) / (-1, 1) 
         for direction in range(8):
             count_marker = 0
-            # 방향별로 최대 거리 3만큼 떨어진 곳까지 존재하는 돌을 조사합니다.
-            for continuous in range(1,4):
-                
-                y_check = y + continuous*dy[direction]
-                x_check = x + continuous*dx[direction]
-
-                # 돌을 카운팅 할 때, 오목판을 넘어가지 않도록 합니다.
-                if (y_check < 0) or (y_check >= self.dimension) \
-                     or (x_check < 0) or (x_check >= self.dimension ):
-                    break
-
-                # 시작점(y,x)의 돌의 색과 현재 위치의 돌의 색이 다르다면 카운팅을 멈춥니다.
-                # 돌이 존재하지 않는다면 카운팅을 멈추지 않습니다.
-                if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                    break
-                
-                # 시작점(y,x)의 돌의 색과 현재 위치의 돌의 색이 같다면 카운팅을 합니다.
-                if self.on((y_check, x_check)) == cur_color :
+            for cell in rays[direction][:3]:
+                if cells[cell] == color:
                     count_marker += 1
-            
-            # 방향별로 최대 거리 3만큼 떨어진 곳까지 존재하는 돌을 조사합니다.
+                elif cells[cell] != '.':
+                    break
             continuous_marker.append(count_marker)
-        
-        # 양 끝이 막히지 않았으며, 3개의 돌로 구성된 쌍을 조사합니다.
-        # 이와 같은 조건을 갖는 쌍의 수를 저장합니다.
-        count_three = 0
-
-        # 돌의 분포 유형을 조사합니다. 한 쌍의 구성은 다음과 같습니다.
-        # (가로/기울기 1 대각선/세로/기울기 -1 대각선) : (음의 방향에 놓인 돌의 수 / 중앙의 돌 / 양의 방향에 놓인 돌의 수) : 연속여부
-        # 유형 1 -->  (가로/기울기 1 대각선/세로/기울기 -1 대각선)  : (2/1/0) : 연속
-        # 유형 2 -->  (가로/기울기 1 대각선/세로/기울기 -1 대각선)  : (2/1/0) : 불연속
-        # 유형 3 -->  (가로/기울기 1 대각선/세로/기울기 -1 대각선)  : (1/1/1) : 불연속
-        # 유형 4 -->  (가로/기울기 1 대각선/세로/기울기 -1 대각선)  : (1/1/1) : 불연속
-        # 유형 5 -->  (가로/기울기 1 대각선/세로/기울기 -1 대각선)  : (1/1/1) : 연속
-        # 유형 6 -->  (가로/기울기 1 대각선/세로/기울기 -1 대각선)  : (0/1/2) : 연속
-        # 유형 7 -->  (가로/기울기 1 대각선/세로/기울기 -1 대각선)  : (0/1/2) : 불연속
-
-        # 유형을 저장하는 변수
-        three_direction = 0
 
+        threes = []
         for direction in range(4):
-
-            if continuous_marker[direction] == 0 and continuous_marker[direction+4]==2 :
-                y_check_side1 = y + dy[direction]
-                x_check_side1 = x + dx[direction]
-                y_check_side2 = y + 3*dy[direction+4]
-                x_check_side2 = x + 3*dx[direction+4]
-                y_check_side3 = y + 4*dy[direction+4]
-                x_check_side3 = x + 4*dx[direction+4]
-
-                if self.on((y_check_side1, x_check_side1)) == '.':
-                    if self.on((y_check_side2, x_check_side2)) == '.':
-                        #print("연속된 3으로 양 쪽이 뚤려있네요")
-                        count_three += 1
-                        three_direction = direction*10 + 1
-                    elif self.on((y_check_side3, x_check_side3)) == '.':
-                        #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                        count_three += 1
-                        three_direction = direction*10 + 2
-                       
-            elif continuous_marker[direction] == 1 and continuous_marker[direction+4]==1 :
-                y_check_side0 = y + 3*dy[direction]
-                x_check_side0 = x + 3*dx[direction]
-                y_check_side1 = y + 2*dy[direction]
-                x_check_side1 = x + 2*dx[direction]
-                y_check_side2 = y + 1*dy[direction]
-                x_check_side2 = x + 1*dx[direction]
-                y_check_side3 = y + 1*dy[direction+4]
-                x_check_side3 = x + 1*dx[direction+4]
-                y_check_side4 = y + 2*dy[direction+4]
-                x_check_side4 = x + 2*dx[direction+4]
-                y_check_side5 = y + 3*dy[direction+4]
-                x_check_side5 = x + 3*dx[direction+4]
-                if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                    flag = 0
-                elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                    if self.on((y_check_side3, x_check_side3)) == cur_color:
-                        #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                        count_three += 1
-                        three_direction = direction*10 + 3
-                    else :
-                        flag = 0
+            forward = rays[direction]
+            backward = rays[direction+4]
+
+            # ray의 dist번째 칸의 돌의 색입니다. 오목판 밖이라면 None입니다.
+            def side(ray, dist):
+                if dist <= len(ray):
+                    return cells[ray[dist-1]]
+                return None
+
+            if continuous_marker[direction] == 0 and continuous_marker[direction+4] == 2:
+                if side(forward, 1) == '.':
+                    if side(backward, 3) == '.':
+                        # 연속된 3으로 양 쪽이 뚫려있습니다.
+                        threes.append(direction*10 + 1)
+                    elif side(backward, 4) == '.':
+                        # 띄엄띄엄 3으로 양 쪽이 뚫려있습니다.
+                        threes.append(direction*10 + 2)
+
+            elif continuous_marker[direction] == 1 and continuous_marker[direction+4] == 1:
+                if side(forward, 3) == color or side(backward, 3) == color:
+                    # 3이 아닙니다.
+                    continue
+                elif side(forward, 2) == color:
+                    if side(backward, 1) == color:
+                        threes.append(direction*10 + 3)
+                elif side(backward, 2) == color:
+                    threes.append(direction*10 + 4)
                 else:
-                    if self.on((y_check_side4, x_check_side4)) == cur_color:
-                        #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                        count_three += 1
-                        three_direction = direction*10 +4
-                    else:
-                        #print("연속된 3으로 양 쪽이 뚤려있네요")
-                        count_three += 1
-                        three_direction = direction*10 +5
-                        
-                                 
-            elif continuous_marker[direction] == 2 and continuous_marker[direction+4]==0 :
-                y_check_side1 = y + dy[direction+4]
-                x_check_side1 = x + dx[direction+4]
-                y_check_side2 = y + 3*dy[direction]
-                x_check_side2 = x + 3*dx[direction]
-                y_check_side3 = y + 4*dy[direction]
-                x_check_side3 = x + 4*dx[direction]
-
-                if self.on((y_check_side1, x_check_side1)) == '.':
-                    if self.on((y_check_side2, x_check_side2)) == '.':
-                        #print("연속된 3으로 양 쪽이 뚤려있네요")
-                        count_three += 1
-                        three_direction = direction*10 +6
-                    elif self.on((y_check_side3, x_check_side3)) == '.':
-                        #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                        count_three += 1
-                        three_direction = direction*10+7
-                    
-                                                       
+                    threes.append(direction*10 + 5)
+
+            elif continuous_marker[direction] == 2 and continuous_marker[direction+4] == 0:
+                if side(backward, 1) == '.':
+                    if side(forward, 3) == '.':
+                        threes.append(direction*10 + 6)
+                    elif side(forward, 4) == '.':
+                        threes.append(direction*10 + 7)
+
+        return threes
+
+    # 쌍삼을 판별합니다.
+    # coordinate위의 돌을 기준으로, 돌의 수를 새어봅니다.
+    # 쌍삼이라면 돌을 치우고 True를, 아니라면 돌을 둔 채로 False를 반환합니다.
+    def double_three(self, coordinate, player, nested=False):
+        
+        self.put(coordinate, player.color)
+
+        if self.is_double_three(coordinate[0]*self.dimension + coordinate[1], player.color):
+            print("플레이어 {}의 쌍삼입니다!".format(player.get_player()))
+            self.put(coordinate, '.')
+            return True
+        return False
+
+    # index 위에 놓인 cur_color의 돌이 쌍삼을 만드는지 반환합니다.
+    def is_double_three(self, index, cur_color):
+
+        # 양 끝이 막히지 않았으며, 3개의 돌로 구성된 쌍을 조사합니다.
+        threes = self.open_threes(index, cur_color)
+        count_three = len(threes)
+
         # 양 끝이 막히지 않은 쌍이 2개 이상 존재한다면
         if count_three > 1 :
-            print("플레이어 {}의 쌍삼입니다!".format(player.get_player()))
-            self.board[(coordinate[0], coordinate[1])] = '.'
             return True
         # 양 끝이 막히지 않은 쌍이 존재하지 않는다면
         elif count_three == 0 :
@@ -263,979 +556,17 @@ class Board(object):
         # 확인과정은 위와 동일합니다.
 
         # 연속의 방향에 대한 변수 (0:가로 / 1: 기울기 1인 대각선 / 2: 세로 / 3:기울기 -1인 대각선)
-        direct = int(three_direction/10)
+        direct = threes[0] // 10
 
         # 유형 정보를 저장하는 변수
-        dist = three_direction%10
-        
-        # 유형 1을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.
-        if dist == 1:
-            for i in range(1,3):
-                continuous_marker_nested = []
-                y_check_side0_n = y + i*dy[direct+4]
-                x_check_side0_n = x + i*dx[direct+4]
-
-                for direction in range(8):
-                    count_marker = 0
-                    for continuous in range(1,4):
-                        
-                        y_check = y_check_side0_n + continuous*dy[direction]
-                        x_check = x_check_side0_n + continuous*dx[direction]
-
-                        if (y_check < 0) or (y_check >= self.dimension) \
-                            or (x_check < 0) or (x_check >= self.dimension ):
-                            break
-
-                        if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                            break
-
-                        if self.on((y_check, x_check)) == cur_color :
-                            count_marker += 1
-                    
-                    continuous_marker_nested.append(count_marker)
-                
-                for direction in range(4):
-
-                    if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                        y_check_side1 = y_check_side0_n + dy[direction]
-                        x_check_side1 = x_check_side0_n + dx[direction]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction+4]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction+4]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                        
-
-                            
-                    elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                        y_check_side0 = y_check_side0_n + 3*dy[direction]
-                        x_check_side0 = x_check_side0_n + 3*dx[direction]
-                        y_check_side1 = y_check_side0_n + 2*dy[direction]
-                        x_check_side1 = x_check_side0_n + 2*dx[direction]
-                        y_check_side2 = y_check_side0_n + 1*dy[direction]
-                        x_check_side2 = x_check_side0_n + 1*dx[direction]
-                        y_check_side3 = y_check_side0_n + 1*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 1*dx[direction+4]
-                        y_check_side4 = y_check_side0_n + 2*dy[direction+4]
-                        x_check_side4 = x_check_side0_n + 2*dx[direction+4]
-                        y_check_side5 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side5 = x_check_side0_n + 3*dx[direction+4]
-                        if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                            flag = 0
-                        elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                            if self.on((y_check_side3, x_check_side3)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else :
-                                flag = 0
-                        else:
-                            if self.on((y_check_side4, x_check_side4)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else:
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                                
-                
-
-                    elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                        y_check_side1 = y_check_side0_n + dy[direction+4]
-                        x_check_side1 = x_check_side0_n + dx[direction+4]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-
-        # 유형 2을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.
-        elif dist == 2:
-            for i in range(1,4):
-                continuous_marker_nested = []
-                y_check_side0_n = y + i*dy[direct+4]
-                x_check_side0_n = x + i*dx[direct+4]
-
-                for direction in range(8):
-                    count_marker = 0
-                    for continuous in range(1,4):
-                        
-                        y_check = y_check_side0_n + continuous*dy[direction]
-                        x_check = x_check_side0_n + continuous*dx[direction]
-
-                        if (y_check < 0) or (y_check >= self.dimension) \
-                            or (x_check < 0) or (x_check >= self.dimension ):
-                            break
-
-                        if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                            break
-
-                        if self.on((y_check, x_check)) == cur_color :
-                            count_marker += 1
-                    
-                    continuous_marker_nested.append(count_marker)
-                
-                for direction in range(4):
-
-                    if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                        y_check_side1 = y_check_side0_n + dy[direction]
-                        x_check_side1 = x_check_side0_n + dx[direction]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction+4]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction+4]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                        
-
-                            
-                    elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                        y_check_side0 = y_check_side0_n + 3*dy[direction]
-                        x_check_side0 = x_check_side0_n + 3*dx[direction]
-                        y_check_side1 = y_check_side0_n + 2*dy[direction]
-                        x_check_side1 = x_check_side0_n + 2*dx[direction]
-                        y_check_side2 = y_check_side0_n + 1*dy[direction]
-                        x_check_side2 = x_check_side0_n + 1*dx[direction]
-                        y_check_side3 = y_check_side0_n + 1*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 1*dx[direction+4]
-                        y_check_side4 = y_check_side0_n + 2*dy[direction+4]
-                        x_check_side4 = x_check_side0_n + 2*dx[direction+4]
-                        y_check_side5 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side5 = x_check_side0_n + 3*dx[direction+4]
-                        if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                            #print("삼이 아닙니다")
-                            flag = 0
-                        elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                            if self.on((y_check_side3, x_check_side3)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else :
-                                #print("삼이 아닙니다.")
-                                flag = 0
-                        else:
-                            if self.on((y_check_side4, x_check_side4)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else:
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                                
-                
-
-                    elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                        y_check_side1 = y_check_side0_n + dy[direction+4]
-                        x_check_side1 = x_check_side0_n + dx[direction+4]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-       
-        # 유형 3을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.
-        elif dist == 3:
-            continuous_marker_nested = []
-            y_check_side0_n = y + 2*dy[direct]
-            x_check_side0_n = x + 2*dx[direct]
-            for direction in range(8):
-                count_marker = 0
-                for continuous in range(1,4):
-                    
-                    y_check = y_check_side0_n + continuous*dy[direction]
-                    x_check = x_check_side0_n + continuous*dx[direction]
-
-                    if (y_check < 0) or (y_check >= self.dimension) \
-                        or (x_check < 0) or (x_check >= self.dimension ):
-                        break
-
-                    if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                        break
-
-                    if self.on((y_check, x_check)) == cur_color :
-                        count_marker += 1
-                
-                continuous_marker_nested.append(count_marker)
-
-            for direction in range(4):
-
-                if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                    y_check_side1 = y_check_side0_n + dy[direction]
-                    x_check_side1 = x_check_side0_n + dx[direction]
-                    y_check_side2 = y_check_side0_n + 3*dy[direction+4]
-                    x_check_side2 = x_check_side0_n + 3*dx[direction+4]
-                    y_check_side3 = y_check_side0_n + 4*dy[direction+4]
-                    x_check_side3 = x_check_side0_n + 4*dx[direction+4]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                    
-
-                        
-                elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                    y_check_side0 = y_check_side0_n + 3*dy[direction]
-                    x_check_side0 = x_check_side0_n + 3*dx[direction]
-                    y_check_side1 = y_check_side0_n + 2*dy[direction]
-                    x_check_side1 = x_check_side0_n + 2*dx[direction]
-                    y_check_side2 = y_check_side0_n + 1*dy[direction]
-                    x_check_side2 = x_check_side0_n + 1*dx[direction]
-                    y_check_side3 = y_check_side0_n + 1*dy[direction+4]
-                    x_check_side3 = x_check_side0_n + 1*dx[direction+4]
-                    y_check_side4 = y_check_side0_n + 2*dy[direction+4]
-                    x_check_side4 = x_check_side0_n + 2*dx[direction+4]
-                    y_check_side5 = y_check_side0_n + 3*dy[direction+4]
-                    x_check_side5 = x_check_side0_n + 3*dx[direction+4]
-                    if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                        #print("삼이 아닙니다")
-                        flag = 0
-                    elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                        if self.on((y_check_side3, x_check_side3)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else :
-                            #print("삼이 아닙니다.")
-                            flag = 0
-                    else:
-                        if self.on((y_check_side4, x_check_side4)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else:
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                            
-            
-
-                elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                    y_check_side1 = y_check_side0_n + dy[direction+4]
-                    x_check_side1 = x_check_side0_n + dx[direction+4]
-                    y_check_side2 = y_check_side0_n + 3*dy[direction]
-                    x_check_side2 = x_check_side0_n + 3*dx[direction]
-                    y_check_side3 = y_check_side0_n + 4*dy[direction]
-                    x_check_side3 = x_check_side0_n + 4*dx[direction]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-
-
-            continuous_marker_nested = []
-            y_check_side1_n = y + 1*dy[direct+4]
-            x_check_side1_n = x + 1*dx[direct+4]
-
-            for direction in range(8):
-                count_marker = 0
-                for continuous in range(1,4):
-                    
-                    y_check = y_check_side1_n + continuous*dy[direction]
-                    x_check = x_check_side1_n + continuous*dx[direction]
-
-                    if (y_check < 0) or (y_check >= self.dimension) \
-                        or (x_check < 0) or (x_check >= self.dimension ):
-                        break
-
-                    if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                        break
-
-                    if self.on((y_check, x_check)) == cur_color :
-                        count_marker += 1
-                
-                continuous_marker_nested.append(count_marker)
-            
-            for direction in range(4):
-
-                if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                    y_check_side1 = y_check_side1_n + dy[direction]
-                    x_check_side1 = x_check_side1_n + dx[direction]
-                    y_check_side2 = y_check_side1_n + 3*dy[direction+4]
-                    x_check_side2 = x_check_side1_n + 3*dx[direction+4]
-                    y_check_side3 = y_check_side1_n + 4*dy[direction+4]
-                    x_check_side3 = x_check_side1_n + 4*dx[direction+4]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                    
-
-                        
-                elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                    y_check_side0 = y_check_side1_n + 3*dy[direction]
-                    x_check_side0 = x_check_side1_n + 3*dx[direction]
-                    y_check_side1 = y_check_side1_n + 2*dy[direction]
-                    x_check_side1 = x_check_side1_n + 2*dx[direction]
-                    y_check_side2 = y_check_side1_n + 1*dy[direction]
-                    x_check_side2 = x_check_side1_n + 1*dx[direction]
-                    y_check_side3 = y_check_side1_n + 1*dy[direction+4]
-                    x_check_side3 = x_check_side1_n + 1*dx[direction+4]
-                    y_check_side4 = y_check_side1_n + 2*dy[direction+4]
-                    x_check_side4 = x_check_side1_n + 2*dx[direction+4]
-                    y_check_side5 = y_check_side1_n + 3*dy[direction+4]
-                    x_check_side5 = x_check_side1_n + 3*dx[direction+4]
-                    if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                        #print("삼이 아닙니다")
-                        flag = 0
-                    elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                        if self.on((y_check_side3, x_check_side3)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else :
-                            #print("삼이 아닙니다.")
-                            flag = 0
-                    else:
-                        if self.on((y_check_side4, x_check_side4)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else:
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                            
-            
-
-                elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                    y_check_side1 = y_check_side1_n + dy[direction+4]
-                    x_check_side1 = x_check_side1_n + dx[direction+4]
-                    y_check_side2 = y_check_side1_n + 3*dy[direction]
-                    x_check_side2 = x_check_side1_n + 3*dx[direction]
-                    y_check_side3 = y_check_side1_n + 4*dy[direction]
-                    x_check_side3 = x_check_side1_n + 4*dx[direction]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-
-        # 유형 4을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.
-        elif dist == 4:
-            continuous_marker_nested = []
-            y_check_side0_n = y + 1*dy[direct]
-            x_check_side0_n = x + 1*dx[direct]
-
-            for direction in range(8):
-                count_marker = 0
-                for continuous in range(1,4):
-                    
-                    y_check = y_check_side0_n + continuous*dy[direction]
-                    x_check = x_check_side0_n + continuous*dx[direction]
-
-                    if (y_check < 0) or (y_check >= self.dimension) \
-                        or (x_check < 0) or (x_check >= self.dimension ):
-                        break
+        dist = threes[0] % 10
 
-                    if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                        break
-
-                    if self.on((y_check, x_check)) == cur_color :
-                        count_marker += 1
-                
-
-                continuous_marker_nested.append(count_marker)
-
-
-            for direction in range(4):
-
-                if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                    y_check_side1 = y_check_side0_n + dy[direction]
-                    x_check_side1 = x_check_side0_n + dx[direction]
-                    y_check_side2 = y_check_side0_n + 3*dy[direction+4]
-                    x_check_side2 = x_check_side0_n + 3*dx[direction+4]
-                    y_check_side3 = y_check_side0_n + 4*dy[direction+4]
-                    x_check_side3 = x_check_side0_n + 4*dx[direction+4]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                    
-
-                        
-                elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                    y_check_side0 = y_check_side0_n + 3*dy[direction]
-                    x_check_side0 = x_check_side0_n + 3*dx[direction]
-                    y_check_side1 = y_check_side0_n + 2*dy[direction]
-                    x_check_side1 = x_check_side0_n + 2*dx[direction]
-                    y_check_side2 = y_check_side0_n + 1*dy[direction]
-                    x_check_side2 = x_check_side0_n + 1*dx[direction]
-                    y_check_side3 = y_check_side0_n + 1*dy[direction+4]
-                    x_check_side3 = x_check_side0_n + 1*dx[direction+4]
-                    y_check_side4 = y_check_side0_n + 2*dy[direction+4]
-                    x_check_side4 = x_check_side0_n + 2*dx[direction+4]
-                    y_check_side5 = y_check_side0_n + 3*dy[direction+4]
-                    x_check_side5 = x_check_side0_n + 3*dx[direction+4]
-                    if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                        #print("삼이 아닙니다")
-                        flag = 0
-                    elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                        if self.on((y_check_side3, x_check_side3)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else :
-                            #print("삼이 아닙니다.")
-                            flag = 0
-                    else:
-                        if self.on((y_check_side4, x_check_side4)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else:
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                            
-            
-
-                elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                    y_check_side1 = y_check_side0_n + dy[direction+4]
-                    x_check_side1 = x_check_side0_n + dx[direction+4]
-                    y_check_side2 = y_check_side0_n + 3*dy[direction]
-                    x_check_side2 = x_check_side0_n + 3*dx[direction]
-                    y_check_side3 = y_check_side0_n + 4*dy[direction]
-                    x_check_side3 = x_check_side0_n + 4*dx[direction]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-
-
-            continuous_marker_nested = []
-            y_check_side1_n = y + 2*dy[direct+4]
-            x_check_side1_n = x + 2*dx[direct+4]
-
-            for direction in range(8):
-                count_marker = 0
-                for continuous in range(1,4):
-                    
-                    y_check = y_check_side1_n + continuous*dy[direction]
-                    x_check = x_check_side1_n + continuous*dx[direction]
-
-                    if (y_check < 0) or (y_check >= self.dimension) \
-                        or (x_check < 0) or (x_check >= self.dimension ):
-                        break
-
-                    if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                        break
-
-                    if self.on((y_check, x_check)) == cur_color :
-                        count_marker += 1
-                
-                continuous_marker_nested.append(count_marker)
-            
-            for direction in range(4):
-
-                if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                    y_check_side1 = y_check_side1_n + dy[direction]
-                    x_check_side1 = x_check_side1_n + dx[direction]
-                    y_check_side2 = y_check_side1_n + 3*dy[direction+4]
-                    x_check_side2 = x_check_side1_n + 3*dx[direction+4]
-                    y_check_side3 = y_check_side1_n + 4*dy[direction+4]
-                    x_check_side3 = x_check_side1_n + 4*dx[direction+4]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                    
-
-                        
-                elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                    y_check_side0 = y_check_side1_n + 3*dy[direction]
-                    x_check_side0 = x_check_side1_n + 3*dx[direction]
-                    y_check_side1 = y_check_side1_n + 2*dy[direction]
-                    x_check_side1 = x_check_side1_n + 2*dx[direction]
-                    y_check_side2 = y_check_side1_n + 1*dy[direction]
-                    x_check_side2 = x_check_side1_n + 1*dx[direction]
-                    y_check_side3 = y_check_side1_n + 1*dy[direction+4]
-                    x_check_side3 = x_check_side1_n + 1*dx[direction+4]
-                    y_check_side4 = y_check_side1_n + 2*dy[direction+4]
-                    x_check_side4 = x_check_side1_n + 2*dx[direction+4]
-                    y_check_side5 = y_check_side1_n + 3*dy[direction+4]
-                    x_check_side5 = x_check_side1_n + 3*dx[direction+4]
-                    if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                        #print("삼이 아닙니다")
-                        flag = 0
-                    elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                        if self.on((y_check_side3, x_check_side3)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else :
-                            #print("삼이 아닙니다.")
-                            flag = 0
-                    else:
-                        if self.on((y_check_side4, x_check_side4)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else:
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                            
-            
-
-                elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                    y_check_side1 = y_check_side1_n + dy[direction+4]
-                    x_check_side1 = x_check_side1_n + dx[direction+4]
-                    y_check_side2 = y_check_side1_n + 3*dy[direction]
-                    x_check_side2 = x_check_side1_n + 3*dx[direction]
-                    y_check_side3 = y_check_side1_n + 4*dy[direction]
-                    x_check_side3 = x_check_side1_n + 4*dx[direction]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-
-        # 유형 5을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.
-        elif dist == 5:
-            continuous_marker_nested = []
-            y_check_side0_n = y + 1*dy[direct]
-            x_check_side0_n = x + 1*dx[direct]
+        # 유형을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.
+        rays = self.rays[index]
+        for side, distance in THREE_MEMBERS[dist]:
+            member = rays[direct + side][distance-1]
+            count_three += len(self.open_threes(member, cur_color))
 
-            for direction in range(8):
-                count_marker = 0
-                for continuous in range(1,4):
-                    
-                    y_check = y_check_side0_n + continuous*dy[direction]
-                    x_check = x_check_side0_n + continuous*dx[direction]
-
-                    if (y_check < 0) or (y_check >= self.dimension) \
-                        or (x_check < 0) or (x_check >= self.dimension ):
-                        break
-
-                    if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                        break
-
-                    if self.on((y_check, x_check)) == cur_color :
-                        count_marker += 1
-                
-                continuous_marker_nested.append(count_marker)
-
-            for direction in range(4):
-
-                if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                    y_check_side1 = y_check_side0_n + dy[direction]
-                    x_check_side1 = x_check_side0_n + dx[direction]
-                    y_check_side2 = y_check_side0_n + 3*dy[direction+4]
-                    x_check_side2 = x_check_side0_n + 3*dx[direction+4]
-                    y_check_side3 = y_check_side0_n + 4*dy[direction+4]
-                    x_check_side3 = x_check_side0_n + 4*dx[direction+4]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                    
-
-                        
-                elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                    y_check_side0 = y_check_side0_n + 3*dy[direction]
-                    x_check_side0 = x_check_side0_n + 3*dx[direction]
-                    y_check_side1 = y_check_side0_n + 2*dy[direction]
-                    x_check_side1 = x_check_side0_n + 2*dx[direction]
-                    y_check_side2 = y_check_side0_n + 1*dy[direction]
-                    x_check_side2 = x_check_side0_n + 1*dx[direction]
-                    y_check_side3 = y_check_side0_n + 1*dy[direction+4]
-                    x_check_side3 = x_check_side0_n + 1*dx[direction+4]
-                    y_check_side4 = y_check_side0_n + 2*dy[direction+4]
-                    x_check_side4 = x_check_side0_n + 2*dx[direction+4]
-                    y_check_side5 = y_check_side0_n + 3*dy[direction+4]
-                    x_check_side5 = x_check_side0_n + 3*dx[direction+4]
-                    if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                        #print("삼이 아닙니다")
-                        flag = 0
-                    elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                        if self.on((y_check_side3, x_check_side3)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else :
-                            #print("삼이 아닙니다.")
-                            flag = 0
-                    else:
-                        if self.on((y_check_side4, x_check_side4)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else:
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                            
-            
-
-                elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                    y_check_side1 = y_check_side0_n + dy[direction+4]
-                    x_check_side1 = x_check_side0_n + dx[direction+4]
-                    y_check_side2 = y_check_side0_n + 3*dy[direction]
-                    x_check_side2 = x_check_side0_n + 3*dx[direction]
-                    y_check_side3 = y_check_side0_n + 4*dy[direction]
-                    x_check_side3 = x_check_side0_n + 4*dx[direction]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-
-
-
-            continuous_marker_nested = []
-            y_check_side1_n = y + 1*dy[direct+4]
-            x_check_side1_n = x + 1*dx[direct+4]
-            for direction in range(8):
-                count_marker = 0
-                for continuous in range(1,4):
-                    
-                    y_check = y_check_side1_n + continuous*dy[direction]
-                    x_check = x_check_side1_n + continuous*dx[direction]
-
-                    if (y_check < 0) or (y_check >= self.dimension) \
-                        or (x_check < 0) or (x_check >= self.dimension ):
-                        break
-
-                    if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                        break
-
-                    if self.on((y_check, x_check)) == cur_color :
-                        count_marker += 1
-                
-                continuous_marker_nested.append(count_marker)
-            
-            for direction in range(4):
-
-                if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                    y_check_side1 = y_check_side1_n + dy[direction]
-                    x_check_side1 = x_check_side1_n + dx[direction]
-                    y_check_side2 = y_check_side1_n + 3*dy[direction+4]
-                    x_check_side2 = x_check_side1_n + 3*dx[direction+4]
-                    y_check_side3 = y_check_side1_n + 4*dy[direction+4]
-                    x_check_side3 = x_check_side1_n + 4*dx[direction+4]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                    
-
-                        
-                elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                    y_check_side0 = y_check_side1_n + 3*dy[direction]
-                    x_check_side0 = x_check_side1_n + 3*dx[direction]
-                    y_check_side1 = y_check_side1_n + 2*dy[direction]
-                    x_check_side1 = x_check_side1_n + 2*dx[direction]
-                    y_check_side2 = y_check_side1_n + 1*dy[direction]
-                    x_check_side2 = x_check_side1_n + 1*dx[direction]
-                    y_check_side3 = y_check_side1_n + 1*dy[direction+4]
-                    x_check_side3 = x_check_side1_n + 1*dx[direction+4]
-                    y_check_side4 = y_check_side1_n + 2*dy[direction+4]
-                    x_check_side4 = x_check_side1_n + 2*dx[direction+4]
-                    y_check_side5 = y_check_side1_n + 3*dy[direction+4]
-                    x_check_side5 = x_check_side1_n + 3*dx[direction+4]
-                    if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                        #print("삼이 아닙니다")
-                        flag = 0
-                    elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                        if self.on((y_check_side3, x_check_side3)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else :
-                            #print("삼이 아닙니다.")
-                            flag = 0
-                    else:
-                        if self.on((y_check_side4, x_check_side4)) == cur_color:
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        else:
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                            
-            
-
-                elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                    y_check_side1 = y_check_side1_n + dy[direction+4]
-                    x_check_side1 = x_check_side1_n + dx[direction+4]
-                    y_check_side2 = y_check_side1_n + 3*dy[direction]
-                    x_check_side2 = x_check_side1_n + 3*dx[direction]
-                    y_check_side3 = y_check_side1_n + 4*dy[direction]
-                    x_check_side3 = x_check_side1_n + 4*dx[direction]
-
-                    if self.on((y_check_side1, x_check_side1)) == '.':
-                        if self.on((y_check_side2, x_check_side2)) == '.':
-                            #print("연속된 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-                        elif self.on((y_check_side3, x_check_side3)) == '.':
-                            #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                            count_three += 1
-
-        # 유형 6을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.
-        elif dist == 6:
-            for i in range (1,3):
-                continuous_marker_nested = []
-                y_check_side0_n = y + i*dy[direct]
-                x_check_side0_n = x + i*dx[direct]
-
-                for direction in range(8):
-                    count_marker = 0
-                    for continuous in range(1,4):
-                        
-                        y_check = y_check_side0_n + continuous*dy[direction]
-                        x_check = x_check_side0_n + continuous*dx[direction]
-
-                        if (y_check < 0) or (y_check >= self.dimension) \
-                            or (x_check < 0) or (x_check >= self.dimension ):
-                            break
-
-                        if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                            break
-
-                        if self.on((y_check, x_check)) == cur_color :
-                            count_marker += 1
-                    
-                    continuous_marker_nested.append(count_marker)
-                
-
-                for direction in range(4):
-
-                    if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                        y_check_side1 = y_check_side0_n + dy[direction]
-                        x_check_side1 = x_check_side0_n + dx[direction]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction+4]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction+4]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                        
-
-                            
-                    elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                        y_check_side0 = y_check_side0_n + 3*dy[direction]
-                        x_check_side0 = x_check_side0_n + 3*dx[direction]
-                        y_check_side1 = y_check_side0_n + 2*dy[direction]
-                        x_check_side1 = x_check_side0_n + 2*dx[direction]
-                        y_check_side2 = y_check_side0_n + 1*dy[direction]
-                        x_check_side2 = x_check_side0_n + 1*dx[direction]
-                        y_check_side3 = y_check_side0_n + 1*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 1*dx[direction+4]
-                        y_check_side4 = y_check_side0_n + 2*dy[direction+4]
-                        x_check_side4 = x_check_side0_n + 2*dx[direction+4]
-                        y_check_side5 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side5 = x_check_side0_n + 3*dx[direction+4]
-                        if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                            #print("삼이 아닙니다")
-                            flag = 0
-                        elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                            if self.on((y_check_side3, x_check_side3)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else :
-                                #print("삼이 아닙니다.")
-                                flag = 0
-                        else:
-                            if self.on((y_check_side4, x_check_side4)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else:
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                                
-                
-
-                    elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                        y_check_side1 = y_check_side0_n + dy[direction+4]
-                        x_check_side1 = x_check_side0_n + dx[direction+4]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-
-        # 유형 7을 구성하는 돌들에 대해 다른 쌍이 존재하는지 확인합니다.   
-        elif dist == 7:
-            for i in range (1,4):
-                continuous_marker_nested = []
-                y_check_side0_n = y + i*dy[direct]
-                x_check_side0_n = x + i*dx[direct]
-
-                for direction in range(8):
-                    count_marker = 0
-                    for continuous in range(1,4):
-                        
-                        y_check = y_check_side0_n + continuous*dy[direction]
-                        x_check = x_check_side0_n + continuous*dx[direction]
-
-                        if (y_check < 0) or (y_check >= self.dimension) \
-                            or (x_check < 0) or (x_check >= self.dimension ):
-                            break
-
-                        if self.on((y_check, x_check)) != cur_color and self.on((y_check, x_check)) != '.':
-                            break
-
-                        if self.on((y_check, x_check)) == cur_color :
-                            count_marker += 1
-                    
-                    continuous_marker_nested.append(count_marker)
-                
-                for direction in range(4):
-
-                    if continuous_marker_nested[direction] == 0 and continuous_marker_nested[direction+4]==2 :
-                        y_check_side1 = y_check_side0_n + dy[direction]
-                        x_check_side1 = x_check_side0_n + dx[direction]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction+4]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction+4]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                        
-
-                            
-                    elif continuous_marker_nested[direction] == 1 and continuous_marker_nested[direction+4]==1 :
-                        y_check_side0 = y_check_side0_n + 3*dy[direction]
-                        x_check_side0 = x_check_side0_n + 3*dx[direction]
-                        y_check_side1 = y_check_side0_n + 2*dy[direction]
-                        x_check_side1 = x_check_side0_n + 2*dx[direction]
-                        y_check_side2 = y_check_side0_n + 1*dy[direction]
-                        x_check_side2 = x_check_side0_n + 1*dx[direction]
-                        y_check_side3 = y_check_side0_n + 1*dy[direction+4]
-                        x_check_side3 = x_check_side0_n + 1*dx[direction+4]
-                        y_check_side4 = y_check_side0_n + 2*dy[direction+4]
-                        x_check_side4 = x_check_side0_n + 2*dx[direction+4]
-                        y_check_side5 = y_check_side0_n + 3*dy[direction+4]
-                        x_check_side5 = x_check_side0_n + 3*dx[direction+4]
-                        if self.on((y_check_side0, x_check_side0)) == cur_color or self.on((y_check_side5, x_check_side5)) == cur_color:
-                            #print("삼이 아닙니다")
-                            flag = 0
-                        elif self.on((y_check_side1, x_check_side1)) == cur_color:
-                            if self.on((y_check_side3, x_check_side3)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else :
-                                #print("삼이 아닙니다.")
-                                flag = 0
-                        else:
-                            if self.on((y_check_side4, x_check_side4)) == cur_color:
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            else:
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                                
-                
-
-                    elif continuous_marker_nested[direction] == 2 and continuous_marker_nested[direction+4]==0 :
-                        y_check_side1 = y_check_side0_n + dy[direction+4]
-                        x_check_side1 = x_check_side0_n + dx[direction+4]
-                        y_check_side2 = y_check_side0_n + 3*dy[direction]
-                        x_check_side2 = x_check_side0_n + 3*dx[direction]
-                        y_check_side3 = y_check_side0_n + 4*dy[direction]
-                        x_check_side3 = x_check_side0_n + 4*dx[direction]
-
-                        if self.on((y_check_side1, x_check_side1)) == '.':
-                            if self.on((y_check_side2, x_check_side2)) == '.':
-                                #print("연속된 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-                            elif self.on((y_check_side3, x_check_side3)) == '.':
-                                #print("띄엄띄엄 3으로 양 쪽이 뚤려있네요")
-                                count_three += 1
-        
         # 한 쌍을 구성하는 모든 돌에 대해 조사한 결과이므로, direct 방향에 대해 중복된 수가 있습니다.
         # 따라서 count_three는 한 쌍을 구성하는 돌의 수인 3보다 커야 쌍삼의 조건이 성립합니다.
-        if count_three > 3 :
-            print("플레이어 {}의 쌍삼입니다!".format(player.get_player()))
-            self.board[(coordinate[0], coordinate[1])] = '.'
-            return True
-        else:
-            return False
-
-
-
-
-  
-
-    
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+        return count_three > 3
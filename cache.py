@@ -0,0 +1,294 @@
+from collections import OrderedDict
+import os
+import sys
+
+
+class EvaluationCache(object):
+
+    #####################################################################
+    #
+    #   Evaluation Cache
+    #   - init(max_bytes, path)
+    #       heuristic evaluation 결과를 저장하는 LRU 캐시를 생성합니다.
+    #       key : (position의 Zobrist 해시, 플레이어의 돌 색)
+    #       max_bytes : 캐시가 사용할 수 있는 최대 메모리 (단위 : byte)
+    #       path : 캐시를 저장하고 불러올 파일의 경로 (None이면 저장하지 않습니다)
+    #
+    #   - get(key)
+    #       key에 해당하는 evaluation 결과를 반환합니다. 없다면 None을 반환합니다.
+    #
+    #   - put(key, value)
+    #       evaluation 결과를 저장합니다.
+    #       메모리 제한을 넘으면 가장 오래 사용되지 않은 결과부터 지웁니다.
+    #
+    #   - load() / save()
+    #       path의 파일에서 캐시를 불러오거나, 파일에 캐시를 저장합니다.
+    #       프로세스가 다시 시작되어도 이전 게임의 evaluation 결과를 사용할 수 있습니다.
+    #       signature(evaluation의 가중치 등)가 다른 파일은 불러오지 않습니다.
+    #
+    #   - resize(max_bytes)
+    #       메모리 제한을 바꾸고, 제한을 넘는 항목들을 지웁니다.
+    #
+    #   - usage()
+    #       캐시의 항목 수, 사용 중인 메모리, 메모리 제한, hit/miss 수를 반환합니다.
+    #
+    #####################################################################
+
+    # 캐시 파일의 형식이 바뀌거나 evaluation 방식이 바뀌면 값을 올립니다.
+    # 버전이 다른 파일은 불러오지 않습니다.
+    VERSION = 1
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None):
+        super(EvaluationCache, self).__init__()
+        self.max_bytes = max_bytes
+        self.path = path
+        self.entries = OrderedDict()
+        self.size = 0
+
+        # evaluation 결과에 영향을 주는 설정입니다. 캐시 파일에 함께 저장됩니다.
+        self.signature = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # 항목 하나가 차지하는 메모리를 어림합니다.
+    # OrderedDict의 노드 크기(약 100 byte)를 포함합니다.
+    def entry_size(self, key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value) + 100
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self.entries:
+            self.size -= self.entry_size(key, self.entries.pop(key))
+        self.entries[key] = value
+        self.size += self.entry_size(key, value)
+        self.evict()
+
+    # 메모리 제한을 넘으면 가장 오래된 항목부터 지웁니다.
+    def evict(self):
+        while self.size > self.max_bytes and self.entries:
+            old_key, old_value = self.entries.popitem(last=False)
+            self.size -= self.entry_size(old_key, old_value)
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def usage(self):
+        return {"entries": len(self.entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return False
+        # pickle은 캐시 파일을 사용할 때만 필요하므로 여기서 import합니다.
+        import pickle
+        try:
+            with open(self.path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+
+        if snapshot.get("version") != self.VERSION or snapshot.get("signature") != self.signature:
+            return False
+
+        # 파일에 저장된 순서(오래된 것부터)대로 넣어서 LRU 순서를 유지합니다.
+        for key, value in snapshot["entries"]:
+            self.put(key, value)
+        return True
+
+    def save(self):
+        if self.path is None:
+            return False
+        import pickle
+
+        # 저장 도중 프로세스가 종료되어도 기존 파일이 깨지지 않도록
+        # 임시 파일에 먼저 저장한 뒤 교체합니다.
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump({"version": self.VERSION, "signature": self.signature, "entries": list(self.entries.items())},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+        return True
+
+
+# Transposition table에 저장되는 값의 종류입니다.
+# EXACT : search가 끝까지 진행된 정확한 utility
+# LOWER : beta cut-off가 발생하여 utility가 이 값 이상임
+# UPPER : alpha를 넘는 child가 없어 utility가 이 값 이하임
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class TranspositionTable(object):
+
+    #####################################################################
+    #
+    #   Transposition Table
+    #   - init(max_bytes)
+    #       alpha-beta search의 결과를 저장하는 표를 생성합니다.
+    #       턴이 바뀌어도 초기화하지 않으므로, 상대가 실제로 둔 수 아래의
+    #       subtree에 대한 search 결과를 다음 턴에 그대로 사용할 수 있습니다.
+    #       max_bytes : 표가 사용할 수 있는 최대 메모리 (단위 : byte)
+    #
+    #   - get(key)
+    #       key에 해당하는 (depth, flag, value, best_action)을 반환합니다.
+    #       없다면 None을 반환합니다.
+    #
+    #   - put(key, depth, flag, value, best_action)
+    #       search 결과를 저장합니다.
+    #       같은 key에 더 깊은 EXACT 결과가 있다면 덮어쓰지 않습니다.
+    #       메모리 제한을 넘으면 가장 먼저 저장된 결과부터 지웁니다.
+    #
+    #   - best_action(key)
+    #       key의 position에서 가장 좋았던 action을 반환합니다. (move ordering에 사용)
+    #
+    #   - signature
+    #       저장된 결과를 만든 search의 설정(평가 방식, quiescence 설정, 가중치)입니다.
+    #       engine은 설정이 바뀌면 표를 비웁니다.
+    #
+    #   - resize(max_bytes) / usage()
+    #       EvaluationCache와 같습니다.
+    #
+    #####################################################################
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        super(TranspositionTable, self).__init__()
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.size = 0
+
+        # 결과에 영향을 주는 search의 설정입니다. (Gomoku.alpha_beta_search 참고)
+        self.signature = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # 항목 하나가 차지하는 메모리를 어림합니다.
+    # dict의 slot과 key, value에 담긴 int들의 크기(약 100 byte)를 포함합니다.
+    def entry_size(self, key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value) + 100
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, depth, flag, value, best_action):
+        old = self.entries.get(key)
+        if old is not None:
+            if old[0] > depth and old[1] == EXACT:
+                return
+            del self.entries[key]
+            self.size -= self.entry_size(key, old)
+        entry = (depth, flag, value, best_action)
+        self.entries[key] = entry
+        self.size += self.entry_size(key, entry)
+        self.evict()
+
+    # dict는 저장된 순서를 유지하므로, 가장 앞의 결과가 가장 오래된 결과입니다.
+    def evict(self):
+        while self.size > self.max_bytes and self.entries:
+            old_key = next(iter(self.entries))
+            self.size -= self.entry_size(old_key, self.entries.pop(old_key))
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def usage(self):
+        return {"entries": len(self.entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+    def best_action(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return entry[3]
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+class MemoryBudget(object):
+
+    #####################################################################
+    #
+    #   Memory Budget
+    #   - init(total_bytes, weights)
+    #       engine 하나가 캐시들에 사용할 수 있는 전체 메모리를 정합니다.
+    #       전체 메모리는 등록된 캐시들에게 weights의 비율로 나누어집니다.
+    #       weights에 없는 캐시의 비율은 1입니다.
+    #
+    #   - register(name, cache)
+    #       캐시를 등록하고, 모든 캐시의 메모리 제한을 다시 나눕니다.
+    #       캐시는 resize(max_bytes)와 usage()를 가져야 합니다.
+    #       같은 캐시를 여러 engine이 공유한다면 같은 MemoryBudget을 사용해야 합니다.
+    #
+    #   - set_total(total_bytes)
+    #       전체 메모리를 바꾸고, 모든 캐시의 메모리 제한을 다시 나눕니다.
+    #
+    #   - allotment(name)
+    #       name 캐시에 나누어진 메모리를 반환합니다.
+    #
+    #   - usage()
+    #       캐시마다의 사용량과 전체 사용량을 반환합니다.
+    #
+    #####################################################################
+
+    DEFAULT_BYTES = 128 * 1024 * 1024
+    WEIGHTS = {"evaluation": 1, "transposition": 1}
+
+    def __init__(self, total_bytes=DEFAULT_BYTES, weights=None):
+        super(MemoryBudget, self).__init__()
+        self.total_bytes = total_bytes
+        self.weights = dict(self.WEIGHTS if weights is None else weights)
+        self.caches = {}
+
+    def register(self, name, cache):
+        self.caches[name] = cache
+        self.rebalance()
+        return cache
+
+    def set_total(self, total_bytes):
+        self.total_bytes = total_bytes
+        self.rebalance()
+
+    def allotment(self, name):
+        total_weight = sum(self.weights.get(other, 1) for other in self.caches)
+        if name not in self.caches or total_weight == 0:
+            return 0
+        return int(self.total_bytes * self.weights.get(name, 1) / total_weight)
+
+    def rebalance(self):
+        for name, cache in self.caches.items():
+            cache.resize(self.allotment(name))
+
+    def usage(self):
+        usage = {name: cache.usage() for name, cache in self.caches.items()}
+        usage["total"] = {"bytes": sum(cache["bytes"] for cache in usage.values()),
+                          "max_bytes": self.total_bytes}
+        return usage
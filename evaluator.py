@@ -0,0 +1,82 @@
+from array import array
+
+from state import PATTERN_TABLE, scan_both
+import weights
+
+#####################################################################
+#
+#   Pattern Evaluator
+#   heuristic_evaluation("max" 방식)은 오목판 전체에서 가장 큰 패턴 하나의 값만 사용하므로
+#   서로 다른 많은 position이 같은 값을 갖습니다.
+#   이 evaluator는 빈 칸과 방향(4 방향)마다의 패턴 가중치를 모두 더한 값을 색마다 유지하고,
+#   (자신의 합 - 상대의 합)으로 평가합니다. ("sum" 방식)
+#
+#   칸 하나의 패턴은 그 칸에서 8 방향으로 RAY_LENGTH칸 안의 돌들로만 정해지므로,
+#   돌이 놓이거나 치워지면 그 칸과 그 칸의 ray 위의 칸들만 다시 계산합니다.
+#   search는 수를 둘 때와 되돌릴 때마다 update를 호출하여 합을 오목판과 맞춥니다.
+#
+#   - init(scores)
+#       weights.PATTERNS 순서의 가중치로 evaluator를 생성합니다.
+#
+#   - reset(board)
+#       오목판 전체를 조사하여 칸마다의 값과 색마다의 합을 다시 계산합니다.
+#
+#   - update(board, index)
+#       index의 칸이 바뀐 뒤에 호출합니다. 영향을 받는 칸들만 다시 계산합니다.
+#
+#   - value(color)
+#       color(0 : 흑 / 1 : 백)의 관점에서 (자신의 합 - 상대의 합)을 반환합니다.
+#
+#####################################################################
+
+# "sum" 방식의 값의 한계입니다. 승리한 state의 utility(gomoku.WIN_UTILITY)보다 항상 작아야 합니다.
+VALUE_LIMIT = 900
+
+
+# 빈 칸 하나의 (흑의 값, 백의 값)을 한 번의 ray 조사로 구합니다.
+def cell_values(cells, cell_rays, scores):
+    black_keys, white_keys = scan_both(cells, cell_rays)
+    black = 0
+    white = 0
+    for direction in range(4):
+        black += scores[PATTERN_TABLE[black_keys[direction]][1]]
+        white += scores[PATTERN_TABLE[white_keys[direction]][1]]
+    return black, white
+
+
+class PatternEvaluator(object):
+
+    def __init__(self, scores=None):
+        super(PatternEvaluator, self).__init__()
+        self.scores = scores if scores is not None else weights.active
+        self.values = [array('l'), array('l')]
+        self.totals = [0, 0]
+
+    def reset(self, board):
+        size = len(board.cells)
+        self.values = [array('l', bytes(array('l').itemsize * size)) for _ in range(2)]
+        self.totals = [0, 0]
+        for index in range(size):
+            self.refresh(board, index)
+
+    # index 칸의 값을 다시 계산하여 합에 반영합니다. 돌이 있는 칸의 값은 0입니다.
+    def refresh(self, board, index):
+        if board.cells[index] == '.':
+            black, white = cell_values(board.cells, board.rays[index], self.scores)
+        else:
+            black, white = 0, 0
+        values = self.values
+        self.totals[0] += black - values[0][index]
+        self.totals[1] += white - values[1][index]
+        values[0][index] = black
+        values[1][index] = white
+
+    def update(self, board, index):
+        self.refresh(board, index)
+        for ray in board.rays[index]:
+            for cell in ray:
+                self.refresh(board, cell)
+
+    def value(self, color):
+        value = self.totals[color] - self.totals[1 - color]
+        return max(-VALUE_LIMIT, min(VALUE_LIMIT, value))
@@ -1,5 +1,13 @@
-from player import Player
-from state import State
+from player import Player, COLORS
+from state import State, PATTERN_TABLE, scan_both
+from board import DEFAULT_DIMENSION, check_dimension, row_label, parse_row
+from cache import EvaluationCache, TranspositionTable, MemoryBudget, EXACT, LOWER, UPPER
+from ponder import Ponder
+from record import GameRecord
+from evaluator import PatternEvaluator
+import weights
+from weights import FOUR, THREE, OPEN_TWO, NONE
+from array import array
 import random
 import signal
 import time
@@ -9,13 +17,86 @@ import copy
 def signal_handler(signum, frame):
     raise Exception("제한 시간을 초과했습니다.")
 
+# 5개의 돌을 연속으로 놓아 승리한 state의 utility입니다.
+# heuristic으로 얻을 수 있는 어떤 utility보다 큽니다.
+WIN_UTILITY = 1000
+
+# leaf의 평가 방식입니다.
+# max : 양쪽 플레이어의 가장 큰 패턴 하나의 값의 차이 (heuristic_evaluation)
+# sum : 양쪽 플레이어의 모든 패턴의 가중치 합의 차이 (evaluator.PatternEvaluator, 수마다 갱신)
+EVALUATION_MODES = ("max", "sum")
+
+# 다른 thread가 search의 중단을 요청했을 때 발생하는 예외입니다.
+class SearchStopped(Exception):
+    pass
+
+# root에서 둘 수 있는 수가 없을 때(빈 칸이 없거나 모두 쌍삼) alpha_beta_search가 발생시키는 예외입니다.
+class NoLegalMove(Exception):
+    pass
+
+class TimeOutRecord(object):
+
+    #####################################################################
+    #
+    #   Time Out Record
+    #   - init(size)
+    #       제한 시간을 초과했을 때 사용할 search 정보를 기록합니다.
+    #       size는 오목판의 칸 수입니다.
+    #       기록은 (지금까지의 최대 utility, 칸마다 그 utility로 선택된 횟수)뿐이므로,
+    #       search가 얼마나 오래 진행되어도 사용하는 메모리는 변하지 않습니다.
+    #
+    #   - reset()
+    #       턴이 시작될 때 기록을 지웁니다.
+    #
+    #   - add(move, utility)
+    #       root 플레이어의 노드에서 move가 utility로 선택되었음을 기록합니다.
+    #       utility가 지금까지의 최대 utility보다 크다면 이전의 선택 횟수들은 지웁니다.
+    #
+    #   - votes(board)
+    #       최대 utility로 선택된 action들의 (좌표, 선택 횟수) 리스트를 반환합니다.
+    #
+    #####################################################################
+
+    def __init__(self, size):
+        super(TimeOutRecord, self).__init__()
+        self.size = size
+        self.best_utility = None
+        self.counts = array('I', bytes(4 * size))
+        self.zeros = array('I', bytes(4 * size))
+
+    def reset(self, size=None):
+        # 오목판의 크기가 바뀌었다면 새로 할당합니다.
+        if size is not None and size != self.size:
+            self.__init__(size)
+            return
+        self.best_utility = None
+        self.counts[:] = self.zeros
+
+    def add(self, move, utility):
+        if self.best_utility is None or utility > self.best_utility:
+            self.best_utility = utility
+            self.counts[:] = self.zeros
+            self.counts[move] = 1
+        elif utility == self.best_utility:
+            self.counts[move] += 1
+
+    def votes(self, board):
+        if self.best_utility is None:
+            return []
+        return [(board.coordinate(move), count) for move, count in enumerate(self.counts) if count > 0]
+
 class Gomoku(object):
 
     #####################################################################
     #
     #   오목
-    #   - init()
-    #       오목 게임을 생성합니다.       
+    #   - init(evaluation_cache, seed, dimension, transposition_table, memory_budget, scores)
+    #       (dimension x dimension) 크기의 오목판 위에서 진행되는 오목 게임을 생성합니다.
+    #       캐시들은 memory_budget을 나누어 사용하므로, 게임이 길어져도 memory_budget을 넘지 않습니다.
+    #       transposition_table과 memory_budget이 주어지면 다른 engine과 공유합니다.
+    #       evaluation_cache가 주어지면 여러 게임이 heuristic evaluation 결과를 공유합니다.
+    #       seed가 주어지면 첫 수와 가까운 좌표의 선택 등 랜덤한 선택들을 재현할 수 있습니다.
+    #       scores는 heuristic evaluation의 패턴 가중치이며, 주어지지 않으면 weights.active입니다.
     #
     #   - start()
     #       오목 게임을 시작하고, 게임의 결과를 반환합니다.
@@ -37,42 +118,158 @@ class Gomoku(object):
     #       게임은 두 플레이어 중 한 플레이어가 승리할 시 종료됩니다.
     #       오목판에 돌을 새로 둘 곳이 더이상 없다면 게임을 종료합니다.
     #
-    #   - alpha_beta_search(player, max_depth)
+    #   - record_move(coordinate, stats) / save_record(winner)
+    #       둔 수와 search 정보를 기보에 추가하고, 게임이 끝나면 record_writer에 기보를 씁니다.
+    #
+    #   - think(player, seconds, max_depth, state, max_nodes)
+    #       입력과 출력 없이 player의 다음 수를 결정하여 (action, 완료된 depth)를 반환합니다.
+    #       seconds 동안(또는 max_nodes개의 노드를 방문할 때까지) Iterative Deepening Alpha-Beta Search를 진행합니다.
+    #       server나 worker process처럼 USER의 입력이 없는 곳에서 사용합니다.
+    #
+    #   - alpha_beta_search(player, max_depth, state)
     #       Alpha-Beta search를 활용하여 플레이어의 최적의 전략을 찾습니다.
+    #       state가 주어지지 않으면 현재 게임의 state를 root로 합니다.
+    #       search 결과는 transposition table에 저장되어 다음 depth와 다음 턴에 재사용됩니다.
+    #
+    #   - search_root(state, moves, count, color, alpha, beta, max_depth)
+    #       root의 children을 aspiration window 안에서 탐색합니다.
+    #
+    #   - find_principal_variation(color, best_action, max_depth, state)
+    #       transposition table의 best action을 따라 예상되는 수순을 반환합니다.
     #
-    #   - max_value(state, player, alpha, beta, depth)
-    #       Max 플레이어의 최적의 전략을 찾습니다.
-    #       
-    #   - min_value(state, player, alpha, beta, depth)
-    #       Min 플레이어는 Max 플레이어의 utility가 최소가 되도록 action을 선택합니다. 
+    #   - place_move(board, move, stone) / remove_move(board, move)
+    #       search에서 수를 두고 되돌립니다. evaluation_mode가 "sum"이라면 evaluator도 갱신합니다.
+    #
+    #   - memory_usage()
+    #       캐시마다의 메모리 사용량과 전체 사용량을 반환합니다.
+    #
+    #   - negamax(state, color, alpha, beta, depth, last, ply)
+    #       color 플레이어가 둘 차례인 state를 탐색하여 (utility, best move)을 반환합니다.
+    #       search 안에서 수는 칸의 index(y*dimension + x)이며, ply마다 미리 준비한
+    #       array('H') buffer에 수 목록을 담습니다. 좌표 tuple은 search의 결과에만 사용합니다.
+    #       utility는 color 플레이어의 관점이며, 상대 플레이어의 utility는 부호가 반대입니다.
+    #
+    #   - quiescence(state, color, alpha, beta, last, ply, remaining)
+    #       depth 0인 state에서 forcing move들만 remaining 수 앞까지 더 탐색하여 utility를 반환합니다.
+    #       수평선 너머의 4나 4의 방어를 보지 못해 생기는 실수(horizon effect)를 줄입니다.
+    #
+    #   - forcing_moves(board, color, moves)
+    #       color 플레이어의 forcing move들을 moves buffer에 담고 (수의 수, 반드시 둬야 하는지)를 반환합니다.
     #
     #
     #####################################################################
     
-    def __init__(self):
+    def __init__(self, evaluation_cache=None, seed=None, dimension=DEFAULT_DIMENSION,
+                 transposition_table=None, memory_budget=None, scores=None):
         super(Gomoku, self).__init__()
+
+        # 게임과 search의 랜덤한 선택에 사용하는 난수 생성기입니다.
+        self.rng = random.Random(seed) if seed is not None else random
+
         self.player_b = Player('B')
         self.player_w = Player('W')
 
+        # 색 번호로 플레이어를 찾습니다. (0 : 흑 / 1 : 백)
+        self.players = [self.player_b, self.player_w]
+        self.root_color = 0
+
         # 턴에는 제한시간이 있습니다.
         self.timer = 10
 
         # 오목판의 크기를 결정합니다.
-        self.dimension = 19
+        self.dimension = check_dimension(dimension)
 
         # 초기 state입니다.
         self.state = State(self.dimension)
+        self.state.board.rng = self.rng
 
         # Alpha-Beta search가 끝나지 않았을때 time out이 발생한다면
         # 현재까지 진행된 search 정보만을 가지고 최적의 전략을 찾습니다.
-        # Iterative Deepening Search의 각 Depth의 transition 정보를 담습니다.
-        # Depth마다 초기화 되는 리스트입니다.
-        self.time_out_continuity = []                                   
-        self.time_out_transition = [] 
+        # 턴 동안 root 플레이어의 노드들이 고른 action 중, 가장 큰 utility를 갖는 action들과
+        # 그 선택 횟수만을 기록합니다. 턴마다 초기화됩니다.
+        self.time_out_record = TimeOutRecord(self.dimension * self.dimension)
 
         # 가장 최근의 action 정보를 저장하는 변수입니다.                                  
         self.current_action = (-1,-1)                                   
 
+        # 캐시들이 나누어 사용하는 메모리입니다.
+        # 캐시의 메모리 제한은 등록될 때 이 budget에 맞게 바뀝니다.
+        if memory_budget is None:
+            memory_budget = MemoryBudget()
+        self.memory_budget = memory_budget
+
+        # heuristic evaluation이 패턴마다 주는 가중치입니다. (weights.PATTERNS 순서)
+        # 주어지지 않으면 시작할 때 불러온 가중치 파일(weights.active)을 사용합니다.
+        self.scores = weights.check(scores) if scores is not None else weights.active
+
+        # heuristic evaluation 결과를 저장하는 캐시입니다.
+        # 턴이 바뀌어도 초기화하지 않으므로, 이전 턴에 평가한 position을 다시 평가하지 않습니다.
+        # 캐시의 결과는 가중치에 따라 다르므로, 다른 가중치로 저장된 캐시 파일은 불러오지 않습니다.
+        if evaluation_cache is None:
+            evaluation_cache = EvaluationCache()
+        evaluation_cache.signature = list(self.scores)
+        self.evaluation_cache = memory_budget.register("evaluation", evaluation_cache)
+
+        # alpha-beta search의 결과(utility와 best action)를 저장하는 표입니다.
+        # 이 표도 턴이 바뀌어도 초기화하지 않습니다.
+        # 상대가 둔 수가 이전 search의 principal variation과 같다면
+        # 그 아래의 subtree는 이미 탐색되어 있으므로 다음 search의 얕은 depth는 바로 끝납니다.
+        if transposition_table is None:
+            transposition_table = TranspositionTable()
+        self.transposition_table = memory_budget.register("transposition", transposition_table)
+        self.principal_variation = []
+
+        # 진행 중인 depth의 search_root가 지금까지 평가한 root의 수들의 utility입니다. (칸의 index : utility)
+        # search가 중단되어 완료된 depth가 없을 때 think가 사용합니다.
+        self.root_utilities = {}
+
+        # search의 ply마다 수 목록을 담는 array('H') buffer들입니다.
+        self.move_buffers = []
+
+        # root의 aspiration window 크기입니다. (heuristic 값의 한 단계)
+        # None이라면 항상 (-infinity, infinity) window로 search합니다.
+        self.aspiration_window = 10
+
+        # leaf의 평가 방식입니다. (EVALUATION_MODES)
+        # "sum" 방식은 search 중 수를 두고 되돌릴 때마다 evaluator를 갱신합니다.
+        self.evaluation_mode = "max"
+        self.evaluator = PatternEvaluator(self.scores)
+
+        # depth 0에서 forcing move(5, 4의 방어, 4)만으로 더 탐색할 수 있는 수의 수입니다.
+        # 0이라면 depth 0의 state를 바로 평가합니다.
+        # quiescence_threes가 True라면 열린 3을 만드는 수도 forcing move로 봅니다.
+        self.quiescence_depth = 0
+        self.quiescence_threes = False
+
+        # search가 방문한 노드의 수와 depth 0에서 평가한 state의 수입니다.
+        # 성능 측정에 사용됩니다.
+        self.nodes = 0
+        self.evaluations = 0
+
+        # search 중 각 노드의 정보를 출력할지 결정합니다.
+        self.verbose = True
+
+        # 이 event가 set되면 진행 중인 search가 SearchStopped 예외로 중단됩니다.
+        # signal은 main thread에서만 사용할 수 있으므로, 다른 thread의 search는 이 event로 멈춥니다.
+        self.stop_event = None
+
+        # think()와 게임 모드의 AI 턴의 제한 시각(time.monotonic() 기준)입니다.
+        # signal 없이 노드 사이에서만 search를 멈추므로, 오목판이 항상 원래대로 돌아가고
+        # worker process나 server에서도 사용할 수 있습니다.
+        self.deadline = None
+
+        # think()가 방문할 수 있는 노드 수의 한계입니다. (self.nodes 기준)
+        # 시간과 달리 실행 환경에 관계없이 같은 search를 하므로 분석에 사용합니다.
+        self.node_limit = None
+
+        # USER의 차례에 AI가 미리 search할지 결정합니다.
+        self.pondering = True
+
+        # 진행 중인 게임의 기보와, 끝난 게임의 기보를 쓸 RecordWriter입니다.
+        # record_writer가 None이라면 기보를 저장하지 않습니다.
+        self.record = None
+        self.record_writer = None
+
     def start(self):
         
         # 빈 오목판으로 초기화합니다.
@@ -86,6 +283,8 @@ class Gomoku(object):
             print("게임을 종료합니다.") 
             return ""
 
+        self.record = GameRecord(self.dimension, metadata={"mode": mode, "timer": self.timer})
+
         winner = ""
         if mode == 1:
             winner = self.mode_user()
@@ -107,13 +306,37 @@ class Gomoku(object):
         else:
             print("{} 승리!!!".format(winner))
 
+        self.save_record(winner)
         return winner
 
+    # 둔 수를 기보에 추가합니다. stats는 search_stats()의 결과 또는 None입니다.
+    def record_move(self, coordinate, stats=None):
+        if self.record is not None:
+            self.record.add(coordinate, stats)
+
+    # 이번 턴의 search 정보를 STATS_FIELDS 순서로 반환합니다.
+    def search_stats(self, depth, started, nodes, evaluations):
+        return [depth, self.nodes - nodes, self.evaluations - evaluations,
+                int((time.monotonic() - started) * 1000)]
+
+    def save_record(self, winner):
+        if self.record is None or self.record_writer is None:
+            return
+        if winner == "비겼습니다.":
+            self.record.result = "draw"
+        elif winner in ("B", "W", ""):
+            self.record.result = winner
+        else:
+            # USER VS AI 모드는 승자를 "USER" / "AI"로 반환합니다.
+            self.record.result = self.player_b.color if self.player_b.get_player() == winner else self.player_w.color
+        self.record_writer.write(self.record)
+
     def user_input(self, now_playing):
         try:
             while(True):
-                y_temp , x = input("y좌표(A-S), x좌표(0-18)를 순서대로 입력하세요 ").split()
-                y = ord(y_temp)-ord("A")
+                y_temp , x = input("y좌표(A-{}), x좌표(0-{})를 순서대로 입력하세요 ".format(
+                    row_label(self.dimension-1), self.dimension-1)).split()
+                y = parse_row(y_temp)
                 x = int(x)
 
                 # 선택된 좌표에 돌이 있거나, 돌을 둠으로써 쌍삼이라면 돌을 둘 수 없습니다.
@@ -159,6 +382,7 @@ class Gomoku(object):
                 return now_playing.color
 
             self.state.board.make_marker((y,x),now_playing)
+            self.record_move((y,x))
             
             # 다음 턴을 위해 플레이어를 전환합니다.
             if now_playing==self.player_b :
@@ -169,7 +393,7 @@ class Gomoku(object):
             # 현재 state의 오목판을 출력합니다.
             self.state.board.print_board()
 
-            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.color,chr(ord("A")+y),x))
+            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.color,row_label(y),x))
 
             # 게임의 종료 여부를 판단합니다.
             is_winner = self.finished()
@@ -187,9 +411,10 @@ class Gomoku(object):
         time.sleep(1)
 
         # 첫 흑돌은 오목판의 중앙부에 랜덤으로 돌을 올려놓습니다.
-        init_coordinate = [random.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) ) for i in range(2)]
+        init_coordinate = tuple(self.rng.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) ) for i in range(2))
         self.state.board.make_marker(init_coordinate, now_playing)
-        print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.color,chr(ord("A")+init_coordinate[0]),init_coordinate[1]))
+        self.record_move(init_coordinate)
+        print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.color,row_label(init_coordinate[0]),init_coordinate[1]))
         self.state.board.print_board()
         self.state.set_current_coordinate(init_coordinate)
         self.current_action = init_coordinate
@@ -204,12 +429,17 @@ class Gomoku(object):
             print("플레이어 {}를 기다립니다....".format(now_playing.color))
 
             # 현재 턴의 시간 제한이 시작됩니다.
-            signal.signal(signal.SIGALRM, signal_handler)
-            signal.alarm(self.timer)
+            # search는 게임의 오목판에 돌을 두고 되돌리므로, 아무 곳에서나 발생하는 signal의 예외 대신
+            # 노드 사이에서만 search를 멈추는 deadline을 사용합니다. (SearchStopped)
+            signal.alarm(0)
+            self.deadline = time.monotonic() + self.timer
 
             # Optimal strategy 정보를 저장할 변수들입니다.
             heuristic_best_actions = {}
             continuity = 0
+            self.time_out_record.reset(self.dimension * self.dimension)
+            started, nodes, evaluations = time.monotonic(), self.nodes, self.evaluations
+            completed_depth = -1
 
             # 제한 시간동안 Iterative Deepening Alpha-Beta Search를 진행합니다.
             try:
@@ -218,6 +448,7 @@ class Gomoku(object):
                 while(1):
 
                     heuristic_best_action, continuity = self.alpha_beta_search(now_playing,max_depth)
+                    completed_depth = max_depth
 
                     # alpha-beta search가 완료됐다면 best action은 한 개 입니다.
                     heuristic_best_actions[heuristic_best_action] = 1
@@ -231,29 +462,22 @@ class Gomoku(object):
                         max_depth += 1
                         heuristic_best_actions = {}
 
-            except Exception:
+            except SearchStopped:
                 print("제한 시간을 초과했습니다.")
 
-                # 제한 시간을 초과한 경우, 현재까지 탐색한 transition들에 대한 utility를 탐색하여 max utility를 갖는 action을 선택합니다.
-                # time_out_transition에는 max lev의 transition 정보들이 저장돼있습니다.
-                # 현재까지 transition 정보들 중 가장 큰 utility 값을 갖는 transition의 action 정보를 저장합니다.
-                # max_value search 결과, 동일한 action이 선택되는 경우가 있습니다.
+                # 제한 시간을 초과한 경우, 현재까지 탐색한 노드들이 고른 action 중 max utility를 갖는 action을 선택합니다.
+                # 동일한 action이 여러 노드에서 선택되는 경우가 있습니다.
                 # 이 때 중복되는 action 수를 세어, 결과에 반영합니다.
-
-                # 현재 탐색 중이던 depth에서 search가 끝난 node들의 정보로 action를 선택합니다.
-                # 가장 큰 utility를 갖는 transition의 action을 찾습니다.
-                # action과 utility가 중복된다면 그 중복횟수를 카운팅합니다.
-                max_time_out = max(self.time_out_transition,key=lambda x:x["utility"])["utility"]
-                for transition in self.time_out_transition:
-                    if max_time_out == transition["utility"]:
-                        if transition["action"] in heuristic_best_actions.keys():
-                            heuristic_best_actions[transition["action"]] += 1
-                        else:
-                            heuristic_best_actions[transition["action"]] = 1
-            
-                # 다음 턴을 위해 변수를 초기화합니다.
-                self.time_out_transition = []
-                self.time_out_continuity = []
+                for action, count in self.time_out_record.votes(self.state.board):
+                    if action in heuristic_best_actions.keys():
+                        heuristic_best_actions[action] += count
+                    else:
+                        heuristic_best_actions[action] = count
+            except NoLegalMove:
+                # root에서 둘 수 있는 수가 없습니다.
+                pass
+            finally:
+                self.deadline = None
 
             # alpha-beta search의 결과가 없다면, 현재 비어있는 좌표 정보를 저장합니다.
             if heuristic_best_actions == {}:
@@ -266,14 +490,15 @@ class Gomoku(object):
             else:
                 multiple = max(heuristic_best_actions.items(), key=lambda x:x[1])
                 if multiple[1] > 1:
-                        print("{}번 선택된 action  ---> ( {} , {} )".format(multiple[1], chr(ord("A")+multiple[0][0]),multiple[0][1]))
+                        print("{}번 선택된 action  ---> ( {} , {} )".format(multiple[1], row_label(multiple[0][0]),multiple[0][1]))
                         heuristic_value = multiple[0]
                 else:
                     heuristic_value = self.state.board.find_current_closest(self.current_action, list(heuristic_best_actions.keys()))
-                    print("가장 가까운 action ---> ( {} , {} )".format(chr(ord("A")+heuristic_value[0]),heuristic_value[1]))
+                    print("가장 가까운 action ---> ( {} , {} )".format(row_label(heuristic_value[0]),heuristic_value[1]))
 
             # 선택된 좌표위에 돌을 올려둡니다.
             self.state.board.make_marker(heuristic_value, now_playing)
+            self.record_move(heuristic_value, self.search_stats(completed_depth, started, nodes, evaluations))
 
             # 현재 action정보를 저장합니다.
             self.state.set_current_coordinate(heuristic_value)
@@ -282,7 +507,7 @@ class Gomoku(object):
             # 현재 state의 오목판을 출력합니다.
             self.state.board.print_board()
 
-            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.color,chr(ord("A")+heuristic_value[0]),heuristic_value[1]))
+            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.color,row_label(heuristic_value[0]),heuristic_value[1]))
             print('\n')
 
             # 게임의 종료 여부를 판단합니다.
@@ -313,6 +538,12 @@ class Gomoku(object):
             print("돌이 선택되지 않았습니다.")
             return ""
         
+        # USER가 생각하는 동안 AI가 미리 search할 worker입니다.
+        ponder = None
+        if self.pondering:
+            ponder = Ponder(self)
+        ai_color = self.player_b.color if self.player_b.get_player() == "AI" else self.player_w.color
+
         print("흑돌이 먼저 돌을 둡니다.")
         now_playing = copy.deepcopy(self.player_b)
 
@@ -324,9 +555,10 @@ class Gomoku(object):
             time.sleep(1)
 
             # 첫 흑돌은 오목판의 중앙부에 랜덤으로 돌을 올려놓습니다.
-            init_coordinate = [random.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) ) for i in range(2)]
+            init_coordinate = tuple(self.rng.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) ) for i in range(2))
             self.state.board.make_marker(init_coordinate, now_playing)
-            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.player,chr(ord("A")+init_coordinate[0]),init_coordinate[1]))
+            self.record_move(init_coordinate)
+            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.player,row_label(init_coordinate[0]),init_coordinate[1]))
             self.state.board.print_board()
             self.state.set_current_coordinate(init_coordinate)
             self.current_action = init_coordinate
@@ -341,17 +573,18 @@ class Gomoku(object):
                 flag_too_much_auto += 1
                 print("좌표를 랜덤으로 선택합니다..")
                 random_choice = self.state.board.all_possible_coordinate()
-                y = random.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) ) 
-                x = random.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) )
+                y = self.rng.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) ) 
+                x = self.rng.randrange( -1 + int(self.dimension/2), 1 + int(self.dimension/2) )
 
             self.state.board.make_marker((y,x),now_playing)
+            self.record_move((y,x))
 
             # 현재 state의 오목판을 출력합니다.
             self.state.board.print_board()
             self.state.set_current_coordinate((y,x))
             self.current_action = (y,x)
 
-            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.player,chr(ord("A")+y),x))
+            print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.player,row_label(y),x))
 
 
 
@@ -370,12 +603,23 @@ class Gomoku(object):
                 now_playing = copy.deepcopy(self.player_b)
 
             if now_playing.get_player() == "USER":
+                # USER가 생각하는 동안 AI는 USER가 둘 것으로 예상되는 수 이후의 state를 미리 search합니다.
+                # 이전 search의 principal variation에 있는 USER의 수를 가장 먼저 예상합니다.
+                if ponder is not None:
+                    predicted_replies = []
+                    if len(self.principal_variation) > 1 and tuple(self.principal_variation[0]) == tuple(self.current_action):
+                        predicted_replies.append(self.principal_variation[1])
+                    ponder.start(self.state, ai_color, predicted_replies)
+
                 # 현재 턴의 시간 제한이 시작됩니다.
                 signal.signal(signal.SIGALRM, signal_handler)
                 signal.alarm(self.timer)
 
                 # 플레이어 유저는 돌을 올릴 좌표를 입력합니다.
                 y, x = self.user_input(now_playing)
+
+                if ponder is not None:
+                    ponder.stop()
                 
                 if (y,x) ==(-1,-1):
                     flag_too_much_auto += 1
@@ -384,13 +628,14 @@ class Gomoku(object):
                     y , x = self.state.board.find_current_closest(self.current_action, random_choice)
 
                 self.state.board.make_marker((y,x),now_playing)
+                self.record_move((y,x))
 
                 # 현재 state의 오목판을 출력합니다.
                 self.state.board.print_board()
                 self.state.set_current_coordinate((y,x))
                 self.current_action = (y,x)
 
-                print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.get_player(),chr(ord("A")+y),x))
+                print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.get_player(),row_label(y),x))
 
                 # 게임의 종료 여부를 판단합니다.
                 is_winner = self.finished()
@@ -407,21 +652,39 @@ class Gomoku(object):
                 print("플레이어 {}를 기다립니다....".format(now_playing.get_player()))
 
                 # 현재 턴의 시간 제한이 시작됩니다.
-                signal.signal(signal.SIGALRM, signal_handler)
-                signal.alarm(self.timer)
+                # USER의 턴에 설정한 alarm은 취소하고, search는 deadline으로 멈춥니다. (mode_AI 참고)
+                signal.alarm(0)
+                self.deadline = time.monotonic() + self.timer
 
                 # Optimal strategy 정보를 저장할 변수들입니다.
                 heuristic_best_actions = {}
                 continuity = 0
+                self.time_out_record.reset(self.dimension * self.dimension)
+                started, nodes, evaluations = time.monotonic(), self.nodes, self.evaluations
+                completed_depth = -1
+
+                # depth limit의 시작 값입니다.
+                max_depth = 0
+
+                # USER가 예상대로 두었다면 pondering으로 완료된 depth의 결과를 사용하고,
+                # 그 다음 depth부터 search합니다.
+                pondered = None
+                if ponder is not None:
+                    pondered = ponder.result(self.state)
+                if pondered is not None:
+                    print("예상한 수입니다. Pondering Depth ----> {}".format(pondered[1]))
+                    heuristic_best_actions[pondered[0]] = 1
+                    completed_depth = pondered[1]
+                    max_depth = pondered[1] + 1
 
                 # 제한 시간동안 Iterative Deepening Alpha-Beta Search를 진행합니다.
                 try:
                     # depth limit를 증가시키며 alpha-beta search를 합니다.
-                    max_depth = 0
                     while(1):
 
                         heuristic_best_action, continuity = self.alpha_beta_search(now_playing,max_depth)
-                        heuristic_best_actions[heuristic_best_action[0]] = 1
+                        completed_depth = max_depth
+                        heuristic_best_actions[heuristic_best_action] = 1
 
                         # 현재 state에 대한 goal test를 진행합니다.
                         if continuity == 5 :
@@ -432,29 +695,22 @@ class Gomoku(object):
                             max_depth += 1
                             heuristic_best_actions = {}
 
-                except Exception:
+                except SearchStopped:
                     print("제한 시간을 초과했습니다.")
 
-                    # 제한 시간을 초과한 경우, 현재까지 탐색한 transition들에 대한 utility를 탐색하여 max utility를 갖는 action을 선택합니다.
-                    # time_out_transition에는 max lev의 transition 정보들이 저장돼있습니다.
-                    # 현재까지 transition 정보들 중 가장 큰 utility 값을 갖는 transition의 action 정보를 저장합니다.
-                    # max_value search 결과, 동일한 action이 선택되는 경우가 있습니다.
+                    # 제한 시간을 초과한 경우, 현재까지 탐색한 노드들이 고른 action 중 max utility를 갖는 action을 선택합니다.
+                    # 동일한 action이 여러 노드에서 선택되는 경우가 있습니다.
                     # 이 때 중복되는 action 수를 세어, 결과에 반영합니다.
-
-                    # 현재 탐색 중이던 depth에서 search가 끝난 node들의 정보로 action를 선택합니다.
-                    # 가장 큰 utility를 갖는 transition의 action을 찾습니다.
-                    # action과 utility가 중복된다면 그 중복횟수를 카운팅합니다.
-                    max_time_out = max(self.time_out_transition,key=lambda x:x["utility"])["utility"]
-                    for transition in self.time_out_transition:
-                        if max_time_out == transition["utility"]:
-                            if transition["action"] in heuristic_best_actions.keys():
-                                heuristic_best_actions[transition["action"]] += 1
-                            else:
-                                heuristic_best_actions[transition["action"]] = 1
-                
-                    # 다음 턴을 위해 변수를 초기화합니다.
-                    self.time_out_transition = []
-                    self.time_out_continuity = []
+                    for action, count in self.time_out_record.votes(self.state.board):
+                        if action in heuristic_best_actions.keys():
+                            heuristic_best_actions[action] += count
+                        else:
+                            heuristic_best_actions[action] = count
+                except NoLegalMove:
+                    # root에서 둘 수 있는 수가 없습니다.
+                    pass
+                finally:
+                    self.deadline = None
 
                 # alpha-beta search의 결과가 없다면, 현재 비어있는 좌표 정보를 저장합니다.
                 if heuristic_best_actions == {}:
@@ -467,11 +723,11 @@ class Gomoku(object):
                 else:
                     multiple = max(heuristic_best_actions.items(), key=lambda x:x[1])
                     if multiple[1] > 1:
-                        print("{}번 선택된 action  ---> ( {} , {} )".format(multiple[1], chr(ord("A")+multiple[0][0]),multiple[0][1]))
+                        print("{}번 선택된 action  ---> ( {} , {} )".format(multiple[1], row_label(multiple[0][0]),multiple[0][1]))
                         heuristic_value = multiple[0]
                     else:
                         heuristic_value = self.state.board.find_current_closest(self.current_action, list(heuristic_best_actions.keys()))
-                        print("가장 가까운 action ---> ( {} , {} )".format(chr(ord("A")+heuristic_value[0]),heuristic_value[1]))
+                        print("가장 가까운 action ---> ( {} , {} )".format(row_label(heuristic_value[0]),heuristic_value[1]))
                 
                 
                 if self.state.board.double_three(heuristic_value, now_playing):
@@ -488,6 +744,8 @@ class Gomoku(object):
                     return now_playing.get_player()
 
 
+                self.record_move(heuristic_value, self.search_stats(completed_depth, started, nodes, evaluations))
+
                 # 현재 action정보를 저장합니다.
                 self.state.set_current_coordinate(heuristic_value)
                 self.current_action = heuristic_value
@@ -495,7 +753,7 @@ class Gomoku(object):
                 # 현재 state의 오목판을 출력합니다.
                 self.state.board.print_board()
 
-                print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.player,chr(ord("A")+heuristic_value[0]),heuristic_value[1]))
+                print("플레이어 {}가 ( {} , {} )위에 돌을 두었습니다.".format(now_playing.player,row_label(heuristic_value[0]),heuristic_value[1]))
                 print('\n')
 
 
@@ -512,143 +770,500 @@ class Gomoku(object):
     def finished(self):
         winner = ""
         count = 0
+        cells = self.state.board.cells
+        rays = self.state.board.rays
         # 오목판을 탐색합니다.
-        for y in range(self.dimension):
-            for x in range(self.dimension):
-                cur_color = self.state.on_board((y,x))
-                if cur_color == '.':
+        for index, cur_color in enumerate(cells):
+            if cur_color == '.':
+                continue
+            count += 1
+            for ray in rays[index]:
+                # ray가 4칸보다 짧다면 그 방향으로는 5개의 돌을 놓을 수 없습니다.
+                if len(ray) < 4:
                     continue
-                count += 1
-                dy = [0,1,1,1,0,-1,-1,-1]
-                dx = [1,1,0,-1,-1,-1,0,1]
-                for direction in range(8):
-                    continuous = 0
-                    for continuous in range(6):
-                        
-                        y_check = y + continuous*dy[direction]
-                        x_check = x + continuous*dx[direction]
-                        if (y_check < 0) or (y_check >= self.dimension) or (x_check < 0) or (x_check >= self.dimension ):
-                            break
-                        
-                        
-                        if self.state.on_board((y_check, x_check)) != cur_color :
-                            break
 
-                    # 연속된 돌의 개수가 5개라면, 그 돌들의 색깔로 승자를 결정합니다.
-                    if continuous == 5:
-                        winner = cur_color
-                        break
+                # 연속된 돌의 개수가 5개라면, 그 돌들의 색깔로 승자를 결정합니다.
+                if cells[ray[0]] == cur_color and cells[ray[1]] == cur_color \
+                    and cells[ray[2]] == cur_color and cells[ray[3]] == cur_color:
+                    winner = cur_color
+                    break
 
         if count == (self.dimension*self.dimension):            
             return "비겼습니다."
         
         return winner
 
+    # seconds 동안 depth limit를 증가시키며 alpha-beta search를 합니다.
+    # max_nodes가 주어지면 그만큼의 노드를 방문한 뒤에도 search를 멈춥니다.
+    # 마지막으로 완료된 depth의 best action을 선택합니다.
+    # 완료된 depth가 없다면 진행 중이던 depth에서 이미 평가한 root의 수들 중 가장 좋은 수를,
+    # 평가한 수도 없다면 모드들과 같이 가장 큰 utility로 가장 많이 선택된 action을 선택하고
+    # 그마저 없다면 최근의 action과 가장 가까운 좌표를 선택합니다. 쌍삼인 수는 선택하지 않습니다.
+    # 둘 곳이 없다면 (None, 완료된 depth)를 반환합니다.
+    def think(self, player, seconds=None, max_depth=None, state=None, max_nodes=None):
+        if state is None:
+            state = self.state
+        board = state.board
+        current = state.get_current_coordinate()
+
+        # 첫 수는 오목판의 중앙에 둡니다.
+        if current is None and all(cell == '.' for cell in board.cells):
+            return (state.dimension // 2, state.dimension // 2), -1
+
+        self.time_out_record.reset(len(board.cells))
+        self.root_utilities = {}
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+        self.node_limit = self.nodes + max_nodes if max_nodes is not None else None
+
+        best_action = None
+        completed = -1
+        depth = 0
+        try:
+            while max_depth is None or depth <= max_depth:
+                best_action, continuity = self.alpha_beta_search(player, depth, state)
+                completed = depth
+                if continuity == 5:
+                    break
+                depth += 1
+        except (SearchStopped, NoLegalMove):
+            pass
+        finally:
+            self.deadline = None
+            self.node_limit = None
+
+        if best_action is not None:
+            return best_action, completed
+
+        # 끝나지 않은 depth의 search가 이미 평가한 root의 수들 중 가장 좋은 수를 선택합니다.
+        # 이 수들은 search에서 실제로 둘 수 있었던 수입니다.
+        if self.root_utilities:
+            move = max(self.root_utilities.items(), key=lambda u:u[1])[0]
+            return board.coordinate(move), completed
+
+        # 평가한 수가 없다면 기록된 수들과 비어있는 칸들 중 쌍삼이 아닌 수만 사용합니다.
+        stone = COLORS[player.number]
+        votes = [(action, count) for action, count in self.time_out_record.votes(board) if board.is_legal(action, stone)]
+        if votes:
+            action, count = max(votes, key=lambda vote: vote[1])
+            if count > 1:
+                return action, completed
+            candidates = [action for action, count in votes]
+        else:
+            candidates = [action for action in board.all_possible_coordinate() if board.is_legal(action, stone)]
+        if current is None:
+            current = (state.dimension // 2, state.dimension // 2)
+        return board.find_current_closest(current, candidates), completed
+
     # 현재 state를 root로 하는 alpha-beta search를 진행합니다.
-    def alpha_beta_search(self, player, max_depth):
+    # search 안에서 수는 칸의 index 하나(y*dimension + x)로 다루고,
+    # 반환하는 best action은 (y, x) 좌표입니다.
+    def alpha_beta_search(self, player, max_depth, state=None):
+        # root가 주어지지 않으면 현재 게임의 state에서 search합니다.
+        if state is None:
+            state = self.state
+        board = state.board
+
+        # 현재 턴의 플레이어의 색 번호입니다.
+        color = player.number
+        self.root_color = color
+
         # 알파 = - infinity / 베타 = infinity 로 초기화 합니다.
         alpha = float("-inf")
         beta = float("inf")
-	
-        valid_transitions = self.state.get_valid_transitions(player, sort="sorting")
-        utilities = {}
-        
-        # 현재 state에 대해 utility의 max value를 탐색합니다.
-        for action, new_state in valid_transitions:
-            continuity, utility = self.max_value(new_state, player, alpha, beta, max_depth)
-            utilities[action] = (continuity, utility)
-
-        # 현재 state에서 가능한 action들로 얻은 children의 utility 중
-        # 가장 큰 utility를 갖는 child를 선택하여
-        # 그때의 action과 그 state에서 가장 긴 돌의 쌍에 포함된 돌의 수를 저장합니다.
-        best_action = max(utilities.items(), key=lambda u:u[1][1])[0]
-        max_continuity = max(utilities.items(), key=lambda u:u[1][1])[1][1]
 
-        # 이때 돌의 수를 반환하는 것은 게임의 종료여부를 판단하기 위함입니다.
-        return best_action, max_continuity
-
-    # 플레이어 Max의 utility값을 탐색합니다.
-    def max_value(self, state, player, alpha, beta, depth):
-        if depth == 0 :
-
-            markers , utility = state.heuristic_evaluation(player, "max")
-            action = state.get_current_coordinate()
-
-            return (markers, utility)
-
-        utility = float("-inf")
+        # 각 ply의 수 목록을 담을 buffer들을 미리 준비합니다.
+        # quiescence search는 depth 0 아래로 quiescence_depth 수까지 buffer를 사용합니다.
+        self.prepare_move_buffers(len(board.cells), max_depth + 1 + self.quiescence_depth)
+
+        # "sum" 방식이라면 root의 오목판으로 evaluator의 합을 계산합니다.
+        if self.evaluation_mode == "sum":
+            self.evaluator.reset(board)
+
+        # 최근에 돌을 둔 위치와 가까운 순으로 root의 수들을 생성합니다.
+        current = state.get_current_coordinate()
+        moves = self.move_buffers[0]
+        count = board.generate_moves(board.index(current) if current is not None else None, moves)
+
+        # 저장된 utility는 평가 방식과 quiescence 설정, 가중치에 따라 다르므로
+        # 설정이 바뀌었다면 transposition table을 비웁니다.
+        signature = (self.evaluation_mode, self.quiescence_depth, self.quiescence_threes, tuple(self.scores))
+        if self.transposition_table.signature != signature:
+            self.transposition_table.clear()
+            self.transposition_table.signature = signature
+
+        # 이전 depth 또는 이전 턴에서 가장 좋았던 action을 먼저 탐색합니다.
+        root_key = (board.hash, color)
+        previous = self.transposition_table.get(root_key)
+        if previous is not None:
+            self.order_moves(moves, count, previous[3])
+
+            # Aspiration window
+            # 이전 depth의 utility 근처에서만 search하여 더 많은 cut-off를 얻습니다.
+            if self.aspiration_window is not None:
+                alpha = previous[2] - self.aspiration_window
+                beta = previous[2] + self.aspiration_window
+
+        # utility가 window 밖에 있다면(fail low / fail high) window를 넓혀 다시 search합니다.
+        while(1):
+            utilities = self.search_root(state, moves, count, color, alpha, beta, max_depth)
+            if not utilities:
+                raise NoLegalMove()
+            best_utility = max(utilities.values())
+
+            if best_utility <= alpha and alpha != float("-inf"):
+                alpha = float("-inf")
+            elif best_utility >= beta and beta != float("inf"):
+                beta = float("inf")
+            else:
+                break
 
-        # 현재 노드의 children을 현재 노드와의 거리를 기준으로 정렬합니다.
-        # 현재 노드와 child 노드의 거리가 가까울수록 먼저 탐색됩니다.
-        transitions = state.get_valid_transitions(player, "sorting")
+        # 현재 state에서 가능한 action들로 얻은 children의 utility 중
+        # 가장 큰 utility를 갖는 child의 action을 선택합니다.
+        best_move = max(utilities.items(), key=lambda u:u[1])[0]
+
+        # 다음 depth와 다음 턴의 search가 사용할 수 있도록 결과를 저장합니다.
+        # root에서는 max_depth + 1 수 앞까지 탐색합니다.
+        self.transposition_table.put(root_key, max_depth + 1, EXACT, utilities[best_move], best_move)
+        self.principal_variation = self.find_principal_variation(color, best_move, max_depth, state)
+
+        # best action으로 만들어지는 가장 긴 돌의 쌍에 포함된 돌의 수를 반환합니다.
+        # 5라면 best action으로 게임이 끝납니다.
+        board.set_cell(best_move, COLORS[color])
+        continuity = min(board.line_length(best_move), 5)
+        board.remove(best_move)
+
+        return board.coordinate(best_move), continuity
+
+    # ply마다 수 목록을 담을 array('H') buffer를 준비합니다.
+    # buffer는 search가 끝나도 재사용되며, 오목판의 칸 수만큼의 수를 담을 수 있습니다.
+    def prepare_move_buffers(self, size, plies):
+        if self.move_buffers and len(self.move_buffers[0]) != size:
+            self.move_buffers = []
+        while len(self.move_buffers) < plies:
+            self.move_buffers.append(array('H', bytes(2 * size)))
+
+    # root의 children을 (alpha, beta) window 안에서 탐색합니다.
+    # 첫 번째 child 이후에는 null window로 alpha보다 좋은지만 확인하고 (Principal Variation Search),
+    # 더 좋다면 window를 넓혀 다시 탐색합니다.
+    def search_root(self, state, moves, count, color, alpha, beta, max_depth):
+        utilities = self.root_utilities = {}
+        board = state.board
+        
+        for i in range(count):
+            self.check_stop()
 
-        transition_info = []
-        markers_info = []
+            # search가 중단되어도 오목판이 원래대로 돌아가도록 합니다.
+            # 돌을 두는 도중에 중단되었을 수도 있으므로, 칸에 돌이 남아있는지로 되돌릴지 정합니다.
+            move = moves[i]
+            try:
+                # 쌍삼이라 돌을 둘 수 없는 action입니다.
+                if not self.place_move(board, move, COLORS[color]):
+                    continue
+                utility = self.child_value(state, move, color, alpha, beta, max_depth, utilities == {}, 1)
+            finally:
+                if board.cells[move] != '.':
+                    self.remove_move(board, move)
+            utilities[move] = utility
 
-        # 현재 노드의 children을 탐색합니다.
-        for action, s in transitions:
-            # 자식노드의 heuristic을 평가합니다.
-            markers, utility = s.heuristic_evaluation(player, "max")
-            markers_info.append(markers)
-            transition_info.append({"action":action,"state":s,"markers":markers,"utility":utility})
-
-            utility = max(utility, self.min_value(s,player,alpha, beta, depth-1)[1])
-
-            if utility >= beta:
-                self.time_out_transition.append({"action":action,"state":state,"markers":markers,"utility":utility})
-                print("action ( {} , {} ) markers {}  utility {}".format(chr(ord("A")+action[0]),action[1],markers,utility))
-                return (markers, utility)
             alpha = max(alpha, utility)
-        
-        max_markers = max(markers_info)
-        valid_actions = [action[0] for action in transitions]
-        action = state.board.find_current_closest(state.get_current_coordinate(), valid_actions)
-        print("action ( {} , {} ) markers {}  utility {}".format(chr(ord("A")+action[0]),action[1],markers,utility))
-        self.time_out_transition.append({"action":action,"state":state,"markers":markers,"utility":utility})
-        return (max_markers, utility)
-
-    # 플레이어 Min의 utility 값을 탐색합니다.
-    def min_value(self, state, player, alpha, beta, depth):
-        # 상대 플레이어의 관점에서 evaluation을 진행합니다.
-        player_min = player
-
-        if player == self.player_b:
-            player_min = self.player_w
-        else:
-            player_min = self.player_b
-
+            if alpha >= beta:
+                break
+
+        return utilities
+
+    # state에 color 플레이어가 move를 둔 child의 utility를 color의 관점에서 반환합니다.
+    # 첫 번째 child가 아니라면 null window로 먼저 탐색합니다. (Principal Variation Search)
+    def child_value(self, state, move, color, alpha, beta, depth, first, ply):
+        # move로 5개의 돌이 연속되었다면 승리입니다.
+        # 더 빨리 승리하는 action이 더 큰 utility를 갖습니다.
+        if state.board.line_length(move) >= 5:
+            return WIN_UTILITY + depth
+
+        if first:
+            return -self.negamax(state, 1 - color, -beta, -alpha, depth, move, ply)[0]
+
+        utility = -self.negamax(state, 1 - color, -alpha - 1, -alpha, depth, move, ply)[0]
+        if alpha < utility < beta:
+            utility = -self.negamax(state, 1 - color, -beta, -alpha, depth, move, ply)[0]
+        return utility
+
+    # search에서 수를 두고 되돌립니다. "sum" 방식이라면 evaluator의 합도 함께 갱신합니다.
+    def place_move(self, board, move, stone):
+        if not board.place(move, stone):
+            return False
+        if self.evaluation_mode == "sum":
+            self.evaluator.update(board, move)
+        return True
+
+    def remove_move(self, board, move):
+        board.remove(move)
+        if self.evaluation_mode == "sum":
+            self.evaluator.update(board, move)
+
+    # buffer의 앞 count개의 수 중 hint를 가장 앞으로 옮깁니다.
+    # 나머지 수들의 순서는 유지합니다.
+    def order_moves(self, moves, count, hint):
+        if hint is None:
+            return
+        for i in range(count):
+            if moves[i] == hint:
+                moves[1:i+1] = moves[0:i]
+                moves[0] = hint
+                return
+
+    # transposition table에 저장된 best action을 따라가며 principal variation을 구합니다.
+    # root에서 best_move를 둔 뒤에는 두 플레이어가 번갈아 돌을 둡니다.
+    # principal variation은 (y, x) 좌표들의 리스트입니다.
+    def find_principal_variation(self, color, best_move, max_depth, state=None):
+        if state is None:
+            state = self.state
+        board = copy.deepcopy(state.board)
+        variation = [board.coordinate(best_move)]
+        board.set_cell(best_move, COLORS[color])
+
+        for depth in range(max_depth):
+            color = 1 - color
+            move = self.transposition_table.best_action((board.hash, color))
+            if move is None or board.cells[move] != '.':
+                break
+            variation.append(board.coordinate(move))
+            board.set_cell(move, COLORS[color])
+
+        return variation
+
+    def memory_usage(self):
+        return self.memory_budget.usage()
+
+    # transposition table에 저장된 결과로 search를 생략할 수 있는지 확인합니다.
+    # 생략할 수 있다면 저장된 (utility, best action)을, 없다면 None을 반환합니다.
+    def probe_transposition(self, entry, alpha, beta, depth):
+        if entry is None or entry[0] < depth:
+            return None
+        stored_depth, flag, utility, best_action = entry
+        if flag == EXACT:
+            return (utility, best_action)
+        if flag == LOWER and utility >= beta:
+            return (utility, best_action)
+        if flag == UPPER and utility <= alpha:
+            return (utility, best_action)
+        return None
+
+    # depth 0인 state의 utility를 color의 관점에서 평가합니다.
+    # "max" 방식은 자신의 가장 좋은 패턴과 상대의 가장 좋은 패턴의 차이이고,
+    # "sum" 방식은 자신의 모든 패턴의 가중치 합과 상대의 합의 차이입니다.
+    # bests는 이미 구한 "max" 방식의 (흑의 값, 백의 값)이며, 주어지면 오목판을 다시 조사하지 않습니다.
+    def evaluate(self, state, color, bests=None):
+        self.evaluations += 1
+        if self.evaluation_mode == "sum":
+            return self.evaluator.value(color)
+        if bests is None:
+            # 양쪽 플레이어의 패턴을 오목판을 한 번만 조사하여 함께 구합니다.
+            try:
+                black, white = state.heuristic_evaluation_both(self.evaluation_cache, self.scores)
+            except ValueError:
+                # 마지막 빈 칸에 돌을 두어 오목판이 가득 찼다면 비긴 것입니다.
+                return 0
+            bests = (black[1], white[1])
+        return bests[color] - bests[1 - color]
+
+    # 다른 thread에서 search의 중단을 요청했거나, 제한 시간이나 노드 수를 넘었다면 search를 멈춥니다.
+    # search는 노드 사이에서만 멈추므로, 오목판은 돌을 두고 되돌리는 도중의 상태로 남지 않습니다.
+    def check_stop(self):
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchStopped()
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SearchStopped()
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchStopped()
+
+    # color 플레이어가 둘 차례인 state를 탐색합니다. (Negamax)
+    # utility는 항상 color 플레이어의 관점이며, 상대의 utility는 부호를 바꿔 사용합니다.
+    # last는 직전에 둔 수, ply는 root로부터의 거리입니다.
+    # children은 state의 오목판에 수를 두고 되돌리며 탐색하므로, state를 복사하지 않습니다.
+    # (utility, best move)을 반환합니다.
+    def negamax(self, state, color, alpha, beta, depth, last=None, ply=1):
+        self.nodes += 1
+
+        # leaf의 evaluation도 오목판 전체를 조사하므로, leaf를 포함한 모든 노드에서 확인합니다.
+        # depth 1인 노드의 children을 모두 평가하는 동안 제한 시간을 크게 넘지 않습니다.
+        self.check_stop()
         if depth == 0 :
+            if self.quiescence_depth > 0:
+                return (self.quiescence(state, color, alpha, beta, last, ply, self.quiescence_depth), None)
+            return (self.evaluate(state, color), None)
 
-            markers, utility = state.heuristic_evaluation(player_min, "min")
-            action = state.get_current_coordinate()
-
-            return (markers, utility)
+        board = state.board
 
-        utility = float('inf')
+        # 이전 search에서 같은 position을 충분히 깊게 탐색했다면 그 결과를 사용합니다.
+        key = (board.hash, color)
+        entry = self.transposition_table.get(key)
+        stored = self.probe_transposition(entry, alpha, beta, depth)
+        if stored is not None:
+            return stored
+        alpha_origin = alpha
 
         # 현재 노드의 children을 현재 노드와의 거리를 기준으로 정렬합니다.
         # 현재 노드와 child 노드의 거리가 가까울수록 먼저 탐색됩니다.
-        transitions = state.get_valid_transitions(player_min, "sorting")
+        # 이전 search에서 가장 좋았던 action은 가장 먼저 탐색됩니다.
+        moves = self.move_buffers[ply]
+        count = board.generate_moves(last, moves)
+        if entry is not None:
+            self.order_moves(moves, count, entry[3])
 
-        transition_info = []
-        markers_info = []
+        best_move = None
+        best_utility = float("-inf")
+        stone = COLORS[color]
 
         # 현재 노드의 children을 탐색합니다.
-        for action, s in transitions:
-            # 자식노드의 heuristic을 평가합니다.
-            markers, utility = s.heuristic_evaluation(player_min, "min")
-            markers_info.append(markers)
-            transition_info.append({"action":action,"state":s,"markers":markers,"utility":utility})
-
-            utility = min(utility,
-                            self.max_value(s, player,
-                                        alpha, beta, depth-1)[1])
-
-            if utility <= alpha:
-                return (action, markers, utility)
-            beta = min(beta, utility)
-
-        max_markers = min(markers_info)
+        for i in range(count):
+            move = moves[i]
+            try:
+                # 쌍삼이라 돌을 둘 수 없는 action입니다.
+                if not self.place_move(board, move, stone):
+                    continue
+                utility = self.child_value(state, move, color, alpha, beta, depth-1, best_move is None, ply+1)
+            finally:
+                if board.cells[move] != '.':
+                    self.remove_move(board, move)
+            if utility > best_utility:
+                best_move = move
+                best_utility = utility
 
-        return (max_markers, utility)
+            alpha = max(alpha, utility)
+            if alpha >= beta:
+                break
+
+        # 돌을 둘 곳이 없다면 비긴 것입니다.
+        if best_move is None:
+            return (0, None)
+
+        if color == self.root_color:
+            if self.verbose:
+                y, x = board.coordinate(best_move)
+                print("action ( {} , {} ) utility {}".format(row_label(y),x,best_utility))
+            self.time_out_record.add(best_move, best_utility)
+
+        if best_utility <= alpha_origin:
+            flag = UPPER
+        elif best_utility >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.transposition_table.put(key, depth, flag, best_utility, best_move)
+        return (best_utility, best_move)
+
+    # depth 0인 state에서 forcing move들만 탐색합니다. (Quiescence Search)
+    # 상대가 5를 만들 수 있다면 막는 수만 탐색하고, 그렇지 않다면 지금 평가한 값(stand pat)과
+    # 4(와 열린 3)를 만드는 수들의 utility 중 더 좋은 값을 사용합니다.
+    # forcing move가 없거나 remaining이 0이라면 state를 바로 평가합니다.
+    def quiescence(self, state, color, alpha, beta, last, ply, remaining):
+        if remaining == 0:
+            return self.evaluate(state, color)
+
+        self.check_stop()
+
+        board = state.board
+        moves = self.move_buffers[ply]
+        count, forced, bests = self.forcing_moves(board, color, moves)
+        if count == 0:
+            return self.evaluate(state, color, bests)
+
+        best_utility = float("-inf")
+        if not forced:
+            stand_pat = self.evaluate(state, color, bests)
+            if stand_pat >= beta:
+                return stand_pat
+            best_utility = stand_pat
+            alpha = max(alpha, stand_pat)
+
+        stone = COLORS[color]
+        for i in range(count):
+            move = moves[i]
+            try:
+                if not self.place_move(board, move, stone):
+                    continue
+                if board.line_length(move) >= 5:
+                    utility = WIN_UTILITY
+                else:
+                    self.nodes += 1
+                    utility = -self.quiescence(state, 1 - color, -beta, -alpha, move, ply + 1, remaining - 1)
+            finally:
+                if board.cells[move] != '.':
+                    self.remove_move(board, move)
+            best_utility = max(best_utility, utility)
 
+            alpha = max(alpha, utility)
+            if alpha >= beta:
+                break
+
+        # 막아야 하는 수를 모두 둘 수 없다면(쌍삼) state를 그대로 평가합니다.
+        if best_utility == float("-inf"):
+            return self.evaluate(state, color, bests)
+        return best_utility
+
+    # 빈 칸마다 돌을 놓았을 때 만들어지는 패턴으로 color 플레이어의 forcing move들을 찾습니다.
+    # 빈 칸의 패턴은 그 칸에 돌을 놓으면 연결되는 돌들로 정해집니다. (state.heuristic_evaluation 참고)
+    #   4 (OPEN_FOUR / FOUR)      : 그 칸에 두면 5가 됩니다.
+    #   3 (OPEN_THREE / THREE)    : 그 칸에 두면 4가 됩니다.
+    #   열린 2 (OPEN_TWO)          : 그 칸에 두면 열린 3이 됩니다.
+    # 자신의 5 > 상대의 5를 막는 수 > 4 > 열린 3 순서로 고르며,
+    # 5나 5를 막는 수라면 반드시 둬야 하는 수이므로 forced가 True입니다.
+    # 반환값 : (수의 수, forced, "max" 방식의 (흑의 값, 백의 값) 또는 빈 칸이 없다면 None)
+    def forcing_moves(self, board, color, moves):
+        cells = board.cells
+        rays = board.rays
+        scores = self.scores
+
+        # 돌과 이웃하지 않은 빈 칸은 모든 방향의 패턴이 NONE이므로, 돌과 이웃한 빈 칸만 조사합니다.
+        near = set()
+        for index, cell in enumerate(cells):
+            if cell == '.':
+                continue
+            for ray in rays[index]:
+                if ray and cells[ray[0]] == '.':
+                    near.add(ray[0])
+
+        # stand pat의 평가("max" 방식)에 필요한 양쪽의 가장 큰 값도 같은 조사로 구합니다.
+        # 조사하지 않은 빈 칸이 있다면 그 칸들의 값은 scores[NONE]입니다.
+        if cells.count('.') > len(near):
+            bests = [scores[NONE], scores[NONE]]
+        else:
+            bests = [None, None]
+
+        wins = []
+        blocks = []
+        fours = []
+        threes = []
+        for index in sorted(near):
+            keys = scan_both(cells, rays[index])
+            for side in (0, 1):
+                for key in keys[side]:
+                    value = scores[PATTERN_TABLE[key][1]]
+                    if bests[side] is None or value > bests[side]:
+                        bests[side] = value
+
+            own = keys[color]
+            opponent = keys[1 - color]
+            own_best = NONE
+            opponent_best = NONE
+            for direction in range(4):
+                own_best = min(own_best, PATTERN_TABLE[own[direction]][1])
+                opponent_best = min(opponent_best, PATTERN_TABLE[opponent[direction]][1])
+            if own_best <= FOUR:
+                wins.append(index)
+            elif opponent_best <= FOUR:
+                blocks.append(index)
+            elif own_best <= THREE:
+                fours.append(index)
+            elif own_best == OPEN_TWO and self.quiescence_threes:
+                threes.append(index)
+
+        if wins:
+            selected, forced = wins, True
+        elif blocks:
+            selected, forced = blocks, True
+        else:
+            selected, forced = fours + threes, False
+        for i, move in enumerate(selected):
+            moves[i] = move
+        return len(selected), forced, (bests if bests[0] is not None else None)
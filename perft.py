@@ -0,0 +1,160 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+from benchmark import POSITIONS, load_position
+from cache import EvaluationCache
+from gomoku import Gomoku
+
+#####################################################################
+#
+#   Perft
+#   고정된 depth의 search 결과가 바뀌지 않았는지 확인합니다.
+#   position마다 best action, utility, 방문한 노드의 수, 평가한 leaf의 수를 기록하고
+#   저장된 golden 값과 비교합니다.
+#
+#   - best action이나 utility가 다르다면 search의 결과가 바뀐 것이므로 실패합니다.
+#   - 노드의 수가 다르다면 pruning이나 move ordering이 바뀐 것입니다.
+#     --strict가 주어지면 이 경우에도 실패합니다.
+#
+#   golden 파일은 depth마다의 값을 저장합니다. depth 1은 root의 children만 비교하므로,
+#   수를 두고 되돌리는 과정(make/unmake)이나 수 생성의 오류는 depth 2 이상에서 드러납니다.
+#
+#   사용법
+#   python perft.py                 golden 파일의 모든 depth를 비교합니다.
+#   python perft.py --depth 1       depth 1만 비교합니다. (빠른 확인)
+#   python perft.py --update        golden 값을 새로 저장합니다. (--depth가 없다면 golden 파일의 모든 depth)
+#
+#####################################################################
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perft_golden.json")
+
+# 무작위 선택이 있는 함수들의 결과를 고정하기 위한 seed입니다.
+SEED = 0
+
+# golden 파일이 없을 때 저장하는 depth들입니다.
+DEFAULT_DEPTHS = (1, 2)
+
+
+# position을 고정된 depth로 search하고 결과를 반환합니다.
+# 매번 비어있는 캐시로 시작하므로 이전 search의 영향을 받지 않습니다.
+def search_position(moves, depth, seed=SEED):
+    state, player = load_position(moves)
+
+    game = Gomoku(EvaluationCache(), seed)
+    game.dimension = state.dimension
+    game.state = state
+    game.state.board.rng = game.rng
+    game.verbose = False
+
+    start = time.perf_counter()
+    best_action, continuity = game.alpha_beta_search(player, depth)
+    elapsed = time.perf_counter() - start
+
+    entry = game.transposition_table.get((state.board.hash, player.number))
+    return {
+        "best_action": list(best_action),
+        "utility": entry[2],
+        "nodes": game.nodes,
+        "evaluations": game.evaluations,
+        "seconds": elapsed,
+    }
+
+
+def run(depth, positions=None):
+    results = {}
+    for name, moves in POSITIONS.items():
+        if positions is not None and name not in positions:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = search_position(moves, depth)
+    return results
+
+
+# golden 값과 비교하여 (실패 여부, 메시지들)을 반환합니다.
+def check(golden, results, strict):
+    failed = False
+    messages = []
+    for name, result in results.items():
+        expected = golden.get(name)
+        if expected is None:
+            messages.append("{:<8} golden 값이 없습니다.".format(name))
+            continue
+
+        if result["best_action"] != expected["best_action"] or result["utility"] != expected["utility"]:
+            failed = True
+            messages.append("{:<8} FAIL  best action {} utility {} (expected {} / {})".format(
+                name, result["best_action"], result["utility"], expected["best_action"], expected["utility"]))
+            continue
+
+        if result["nodes"] != expected["nodes"] or result["evaluations"] != expected["evaluations"]:
+            if strict:
+                failed = True
+            messages.append("{:<8} TREE  nodes {} -> {} / evaluations {} -> {}  ({:.2f}s -> {:.2f}s)".format(
+                name, expected["nodes"], result["nodes"], expected["evaluations"], result["evaluations"],
+                expected["seconds"], result["seconds"]))
+        else:
+            messages.append("{:<8} OK    nodes {} / evaluations {}  ({:.2f}s -> {:.2f}s)".format(
+                name, result["nodes"], result["evaluations"], expected["seconds"], result["seconds"]))
+
+    return failed, messages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gomoku fixed-depth search regression")
+    parser.add_argument("--depth", type=int, help="search depth (기본값은 golden 파일의 모든 depth)")
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="golden 값 JSON 파일")
+    parser.add_argument("--update", action="store_true", help="golden 값을 새로 저장합니다")
+    parser.add_argument("--strict", action="store_true", help="노드의 수가 달라도 실패합니다")
+    parser.add_argument("--positions", nargs="*", choices=list(POSITIONS), help="search할 position")
+    args = parser.parse_args(argv)
+
+    golden = None
+    if os.path.exists(args.golden):
+        with open(args.golden) as f:
+            golden = json.load(f)
+
+    if args.depth is not None:
+        depths = [args.depth]
+    elif golden is not None:
+        depths = sorted(int(depth) for depth in golden["depths"])
+    else:
+        depths = list(DEFAULT_DEPTHS)
+
+    if args.update:
+        if golden is None:
+            golden = {"seed": SEED, "depths": {}}
+        for depth in depths:
+            results = run(depth, args.positions)
+            golden["depths"].setdefault(str(depth), {}).update(results)
+            for name, result in results.items():
+                print("depth {} {:<8} best action {} utility {} nodes {} evaluations {}".format(
+                    depth, name, result["best_action"], result["utility"], result["nodes"], result["evaluations"]))
+        with open(args.golden, "w") as f:
+            json.dump(golden, f, indent=2)
+        return 0
+
+    if golden is None:
+        print("golden 값이 없습니다. --update로 먼저 저장하세요.")
+        return 1
+
+    failed = False
+    for depth in depths:
+        expected = golden["depths"].get(str(depth))
+        if expected is None:
+            print("depth {}의 golden 값이 없습니다.".format(depth))
+            failed = True
+            continue
+        depth_failed, messages = check(expected, run(depth, args.positions), args.strict)
+        failed = failed or depth_failed
+        for message in messages:
+            print("depth {} {}".format(depth, message))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,9 @@
+# search에서 사용하는 돌의 색 번호입니다.
+# 상대의 색 번호는 (1 - 색 번호)로 구할 수 있습니다.
+BLACK = 0
+WHITE = 1
+COLORS = ['B', 'W']
+
 class Player(object):
 
     #####################################################################
@@ -6,6 +12,7 @@ class Player(object):
     #   - init(color)
     #       color를 가진 돌을 사용하는 플레이어를 생성합니다.
     #       player : USER / AI
+    #       number : 돌의 색 번호 (BLACK / WHITE)
     #
     #   - set_player(player)
     #       플레이어를 세팅합니다.
@@ -15,8 +22,12 @@ class Player(object):
     #
     #####################################################################
     
+    # 인스턴스마다 __dict__를 만들지 않습니다.
+    __slots__ = ('color', 'number', 'player')
+
     def __init__(self, color):
         self.color = color
+        self.number = COLORS.index(color)
         self.player = None
     
     def set_player(self, player):
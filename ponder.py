@@ -0,0 +1,151 @@
+from array import array
+import copy
+import threading
+
+
+class Ponder(object):
+
+    #####################################################################
+    #
+    #   Pondering
+    #   - init(game)
+    #       USER가 생각하는 동안 AI가 미리 search하는 worker를 생성합니다.
+    #       worker는 game과 evaluation cache, transposition table을 공유하므로
+    #       worker가 search한 결과는 AI의 다음 search에서 그대로 사용됩니다.
+    #
+    #   - start(state, ai_color, predicted_replies)
+    #       USER가 predicted_replies 중 하나를 둔다고 가정하고,
+    #       그 뒤의 state에서 AI의 search를 background thread로 시작합니다.
+    #       predicted_replies가 width개보다 적다면 USER의 관점에서 heuristic이 가장 높은
+    #       수들을 예상되는 수로 추가합니다.
+    #
+    #   - predict_replies(state, user_player)
+    #       USER가 둘 것으로 예상되는 수들을 반환합니다.
+    #       search와 같이 state의 오목판에 돌을 두고 되돌리며 평가하므로, 출력이 없고 state를 새로 만들지 않습니다.
+    #
+    #   - stop()
+    #       pondering을 멈추고, thread가 끝날 때까지 기다립니다.
+    #
+    #   - result(state)
+    #       state에 대한 pondering 결과 (best action, 완료된 depth)를 반환합니다.
+    #       USER가 예상과 다른 수를 두었다면 None을 반환합니다.
+    #
+    #####################################################################
+
+    def __init__(self, game, width=3):
+        super(Ponder, self).__init__()
+
+        # 순환 import를 피하기 위해 여기서 import합니다.
+        from gomoku import Gomoku
+
+        # pondering 전용 engine입니다. search 결과를 저장하는 표들과 메모리 budget은 game과 공유합니다.
+        self.engine = Gomoku(game.evaluation_cache, dimension=game.dimension,
+                             transposition_table=game.transposition_table, memory_budget=game.memory_budget,
+                             scores=game.scores)
+        self.engine.verbose = False
+        self.engine.evaluation_mode = game.evaluation_mode
+        self.engine.quiescence_depth = game.quiescence_depth
+        self.engine.quiescence_threes = game.quiescence_threes
+        self.engine.stop_event = threading.Event()
+
+        self.thread = None
+
+        # 예상되는 수를 몇 개까지 search할지 결정합니다.
+        self.width = width
+
+        # position의 해시 -> (best action, 완료된 depth)
+        self.results = {}
+
+    def start(self, state, ai_color, predicted_replies=None):
+        self.stop()
+        self.results = {}
+        self.engine.stop_event.clear()
+
+        ai_player = self.engine.player_b if ai_color == self.engine.player_b.color else self.engine.player_w
+        user_player = self.engine.player_w if ai_player is self.engine.player_b else self.engine.player_b
+
+        # USER의 입력이 state를 바꿀 수 있으므로 복사한 state에서 search합니다.
+        state = copy.deepcopy(state)
+
+        self.thread = threading.Thread(target=self.run, args=(state, ai_player, user_player, predicted_replies))
+        self.thread.daemon = True
+        self.thread.start()
+        return True
+
+    def predict_replies(self, state, user_player):
+        # 최근에 둔 돌과 가까운 수부터 USER의 관점에서 평가합니다.
+        # heuristic이 같다면 가까운 수가 먼저 선택됩니다.
+        board = state.board
+        current = state.get_current_coordinate()
+        moves = array('H', bytes(2 * len(board.cells)))
+        count = board.generate_moves(board.index(current) if current is not None else None, moves)
+
+        # 마지막 빈 칸이라면 평가할 오목판이 남지 않으므로 그 칸을 그대로 예상합니다.
+        if count == 1:
+            return [board.coordinate(moves[0])]
+
+        scored = []
+        for order in range(count):
+            if self.engine.stop_event.is_set():
+                break
+
+            # 쌍삼이라 USER가 둘 수 없는 수입니다.
+            move = moves[order]
+            if not board.place(move, user_player.color):
+                continue
+            try:
+                markers, utility = state.heuristic_evaluation(user_player, "min", self.engine.evaluation_cache, self.engine.scores)
+            finally:
+                board.remove(move)
+            scored.append((-utility, order, board.coordinate(move)))
+        scored.sort()
+        return [action for _, _, action in scored[:self.width]]
+
+    def run(self, state, ai_player, user_player, predicted_replies):
+        # 순환 import를 피하기 위해 여기서 import합니다.
+        from gomoku import SearchStopped
+
+        try:
+            replies = list(predicted_replies or [])
+            if len(replies) < self.width:
+                for reply in self.predict_replies(state, user_player):
+                    if len(replies) >= self.width:
+                        break
+                    if reply not in replies:
+                        replies.append(reply)
+
+            # 돌이 있는 칸이나 쌍삼인 수, 둔 뒤에 빈 칸이 남지 않는 수는 search하지 않습니다.
+            roots = []
+            for reply in replies:
+                if state.on_board(reply) != '.':
+                    continue
+                root = state.copy()
+                if not root.board.place(root.board.index(reply), user_player.color):
+                    continue
+                if '.' not in root.board.cells:
+                    continue
+                root.set_current_coordinate(reply)
+                roots.append(root)
+            if roots == []:
+                return
+
+            # 예상되는 수가 여러 개라면, depth를 하나씩 늘려가며 모든 수를 번갈아 search합니다.
+            max_depth = 0
+            while not self.engine.stop_event.is_set():
+                for root in roots:
+                    best_action, continuity = self.engine.alpha_beta_search(ai_player, max_depth, root)
+                    self.results[root.board.hash] = (best_action, max_depth)
+                max_depth += 1
+        except SearchStopped:
+            # stop()에 의해 중단되었습니다.
+            return
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.engine.stop_event.set()
+        self.thread.join()
+        self.thread = None
+
+    def result(self, state):
+        return self.results.get(state.board.hash)
@@ -0,0 +1,133 @@
+from board import Board, DEFAULT_DIMENSION, check_dimension
+from player import COLORS
+from state import State
+
+#####################################################################
+#
+#   Position Setup
+#   수를 하나씩 두지 않고, 수 목록이나 오목판 문자열로 한 번에 position을 만듭니다.
+#   make_marker와 달리 수마다 쌍삼을 검사하거나 오목판을 출력하지 않으며,
+#   Zobrist 해시는 모든 돌을 놓은 뒤 한 번만 계산합니다. (Board.set_position)
+#
+#   오목판 문자열은 위의 행부터 '/'로 구분한 행들이며, 칸은 '.' / 'B' / 'W'입니다.
+#   연속된 빈 칸은 그 수로 줄여 씁니다. 예) 9x9 오목판의 중앙에 흑 하나
+#       "9/9/9/9/4B4/9/9/9/9"
+#
+#   - board_from_moves(moves, dimension) / state_from_moves(moves, dimension)
+#       흑부터 번갈아 둔 (y, x) 좌표들로 오목판(또는 state)을 만듭니다.
+#       state의 최근 좌표는 마지막 수입니다.
+#
+#   - board_from_string(text) / state_from_string(text, last)
+#       오목판 문자열로 오목판(또는 state)을 만듭니다. 오목판의 크기는 행의 수입니다.
+#       문자열에는 수의 순서가 없으므로 state의 최근 좌표는 last입니다.
+#
+#   - board_to_string(board)
+#       오목판을 오목판 문자열로 바꿉니다.
+#
+#   - side_to_move(board)
+#       돌의 수로 다음에 둘 플레이어의 색 번호를 반환합니다. (0 : 흑 / 1 : 백)
+#
+#   - summary(board)
+#       position에서 다시 계산되는 정보들(해시, 돌의 수, 후보 칸, 쌍삼 칸)을 한 번에 반환합니다.
+#
+#####################################################################
+
+
+def board_from_moves(moves, dimension=DEFAULT_DIMENSION):
+    check_dimension(dimension)
+    cells = ['.'] * (dimension * dimension)
+    for i, (y, x) in enumerate(moves):
+        if not (0 <= y < dimension and 0 <= x < dimension):
+            raise ValueError("오목판 밖의 수입니다. : ({}, {})".format(y, x))
+        index = y * dimension + x
+        if cells[index] != '.':
+            raise ValueError("이미 돌이 있는 곳에 둔 수입니다. : ({}, {})".format(y, x))
+        cells[index] = COLORS[i % 2]
+
+    board = Board(dimension)
+    board.set_position(cells)
+    return board
+
+
+def state_from_moves(moves, dimension=DEFAULT_DIMENSION):
+    moves = [tuple(move) for move in moves]
+    state = State(dimension)
+    state.board = board_from_moves(moves, dimension)
+    if moves:
+        state.set_current_coordinate(moves[-1])
+    return state
+
+
+def board_from_string(text):
+    rows = text.strip().split("/")
+    dimension = check_dimension(len(rows))
+    cells = []
+    for y, row in enumerate(rows):
+        width = 0
+        run = ""
+        for char in row.strip():
+            if char.isdigit():
+                run += char
+                continue
+            if run:
+                cells.extend('.' * int(run))
+                width += int(run)
+                run = ""
+            if char not in ".BW":
+                raise ValueError("알 수 없는 칸입니다. : {}".format(char))
+            cells.append(char)
+            width += 1
+        if run:
+            cells.extend('.' * int(run))
+            width += int(run)
+        if width != dimension:
+            raise ValueError("{}번째 행의 칸 수가 {}이 아닙니다. : {}".format(y, dimension, width))
+
+    board = Board(dimension)
+    board.set_position(cells)
+    return board
+
+
+def state_from_string(text, last=None):
+    board = board_from_string(text)
+    state = State(board.dimension)
+    state.board = board
+    if last is not None:
+        state.set_current_coordinate(tuple(last))
+    return state
+
+
+def board_to_string(board):
+    rows = []
+    dimension = board.dimension
+    for y in range(dimension):
+        row = ""
+        run = 0
+        for color in board.cells[y * dimension:(y + 1) * dimension]:
+            if color == '.':
+                run += 1
+                continue
+            if run:
+                row += str(run)
+                run = 0
+            row += color
+        if run:
+            row += str(run)
+        rows.append(row)
+    return "/".join(rows)
+
+
+def side_to_move(board):
+    counts = board.stone_counts()
+    return 0 if counts['B'] == counts['W'] else 1
+
+
+def summary(board, distance=2):
+    color = side_to_move(board)
+    return {
+        "hash": board.hash,
+        "stones": board.stone_counts(),
+        "to_move": COLORS[color],
+        "candidates": board.candidates(distance),
+        "forbidden": board.forbidden_points(COLORS[color]),
+    }
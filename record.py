@@ -0,0 +1,184 @@
+import json
+
+from board import DEFAULT_DIMENSION, check_dimension
+
+#####################################################################
+#
+#   Game Record
+#   게임의 기보(수 목록과 metadata, 수마다의 search 정보)를 저장하고 읽습니다.
+#
+#   파일은 한 줄에 게임 하나인 JSON lines 형식입니다.
+#   {"v": 1, "dimension": 19, "result": "B", "moves": [180, 200, ...],
+#    "meta": {...}, "stats": [null, [3, 1520, 410, 980], ...]}
+#   - moves : 흑부터 번갈아 둔 칸의 index(y*dimension + x)입니다.
+#   - stats : 수마다 STATS_FIELDS 순서의 값이며, search 없이 둔 수(USER 등)는 null입니다.
+#   - result : 'B' / 'W' / 'draw' / "" (승자 없음)
+#
+#   writer는 게임 하나를 쓸 때마다 한 줄을 추가하고, reader는 generator로 한 게임씩 읽으므로
+#   self-play로 만든 많은 게임도 메모리에 모두 올리지 않고 쓰고 읽을 수 있습니다.
+#   파일 이름이 .gz로 끝나면 gzip으로 압축합니다.
+#
+#   - read_records(path)
+#       파일의 게임들을 GameRecord로 하나씩 yield합니다.
+#
+#   - to_notation(record) / from_notation(text, dimension)
+#       기보를 "h8 i9 j10 ..."과 같은 text 표기로 바꾸거나, 표기에서 기보를 만듭니다.
+#       글자는 열(x, a부터), 숫자는 행(y, 1부터)이며 renju 프로그램들이 사용하는 표기입니다.
+#
+#####################################################################
+
+RECORD_VERSION = 1
+
+# 수마다의 search 정보입니다.
+# depth : 완료된 depth / nodes : 방문한 노드의 수 / evaluations : 평가한 state의 수 / ms : 걸린 시간
+STATS_FIELDS = ("depth", "nodes", "evaluations", "ms")
+
+NOTATION_COLUMNS = "abcdefghijklmnopqrstuvwxyzABCDEF"
+
+
+def open_record_file(path, mode):
+    if path.endswith(".gz"):
+        # 압축된 파일을 사용할 때만 필요하므로 여기서 import합니다.
+        import gzip
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class GameRecord(object):
+
+    #####################################################################
+    #
+    #   Game Record
+    #   - init(dimension, moves, result, metadata, stats)
+    #       게임 하나의 기보입니다. moves는 흑부터 번갈아 둔 (y, x) 좌표들입니다.
+    #
+    #   - add(coordinate, stats)
+    #       수를 추가합니다. stats는 STATS_FIELDS 순서의 값 또는 None입니다.
+    #
+    #   - stat(ply)
+    #       ply번째 수의 search 정보를 dict로 반환합니다. 없다면 None입니다.
+    #
+    #   - to_json() / from_json(line)
+    #       파일의 한 줄로 바꾸거나, 한 줄에서 기보를 만듭니다.
+    #
+    #####################################################################
+
+    __slots__ = ('dimension', 'moves', 'result', 'metadata', 'stats')
+
+    def __init__(self, dimension=DEFAULT_DIMENSION, moves=None, result="", metadata=None, stats=None):
+        super(GameRecord, self).__init__()
+        self.dimension = check_dimension(dimension)
+        self.moves = [tuple(move) for move in moves] if moves else []
+        self.result = result
+        self.metadata = dict(metadata) if metadata else {}
+        self.stats = list(stats) if stats else [None] * len(self.moves)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def add(self, coordinate, stats=None):
+        self.moves.append(tuple(coordinate))
+        self.stats.append(list(stats) if stats is not None else None)
+
+    def stat(self, ply):
+        values = self.stats[ply]
+        if values is None:
+            return None
+        return dict(zip(STATS_FIELDS, values))
+
+    def to_json(self):
+        snapshot = {
+            "v": RECORD_VERSION,
+            "dimension": self.dimension,
+            "result": self.result,
+            "moves": [y * self.dimension + x for y, x in self.moves],
+        }
+        if self.metadata:
+            snapshot["meta"] = self.metadata
+        if any(values is not None for values in self.stats):
+            snapshot["stats"] = self.stats
+        return json.dumps(snapshot, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line):
+        snapshot = json.loads(line)
+        if snapshot.get("v") != RECORD_VERSION:
+            raise ValueError("지원하지 않는 기보 버전입니다. : {}".format(snapshot.get("v")))
+        dimension = snapshot["dimension"]
+        cells = dimension * dimension
+        moves = []
+        for index in snapshot["moves"]:
+            if not 0 <= index < cells:
+                raise ValueError("오목판 밖의 수입니다. : {}".format(index))
+            moves.append(divmod(index, dimension))
+        stats = snapshot.get("stats")
+        if stats is not None and len(stats) != len(moves):
+            raise ValueError("search 정보의 수가 수의 수와 다릅니다.")
+        return cls(dimension, moves, snapshot.get("result", ""), snapshot.get("meta"), stats)
+
+
+class RecordWriter(object):
+
+    #####################################################################
+    #
+    #   Record Writer
+    #   - init(path, append)
+    #       path에 기보를 씁니다. append가 True라면 기존 파일의 뒤에 추가합니다.
+    #       with 문으로 사용할 수 있습니다.
+    #
+    #   - write(record)
+    #       기보 한 줄을 쓰고 바로 flush하므로, 중간에 프로그램이 종료되어도 쓴 게임은 남습니다.
+    #
+    #####################################################################
+
+    def __init__(self, path, append=True):
+        super(RecordWriter, self).__init__()
+        self.path = path
+        self.file = open_record_file(path, "a" if append else "w")
+        self.count = 0
+
+    def write(self, record):
+        self.file.write(record.to_json() + "\n")
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_records(path):
+    with open_record_file(path, "r") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield GameRecord.from_json(line)
+            except (ValueError, KeyError, TypeError) as error:
+                raise ValueError("{}:{} 기보를 읽을 수 없습니다. ({})".format(path, number, error))
+
+
+def to_notation(record):
+    return " ".join("{}{}".format(NOTATION_COLUMNS[x], y + 1) for y, x in record.moves)
+
+
+def from_notation(text, dimension=DEFAULT_DIMENSION):
+    record = GameRecord(dimension)
+    for move in text.replace(",", " ").split():
+        column = NOTATION_COLUMNS.find(move[0])
+        try:
+            row = int(move[1:]) - 1
+        except ValueError:
+            row = -1
+        if not (0 <= column < dimension and 0 <= row < dimension):
+            raise ValueError("잘못된 수입니다. : {}".format(move))
+        record.add((row, column))
+    return record
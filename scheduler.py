@@ -0,0 +1,304 @@
+import concurrent.futures
+import heapq
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+
+from position import state_from_moves
+
+#####################################################################
+#
+#   Engine Scheduler
+#   AI의 수를 계산하는 worker process들을 미리 띄워두고, 요청들을 deadline 순으로 나누어줍니다.
+#   worker는 계속 살아있으므로 engine의 캐시(evaluation cache, transposition table)가 유지됩니다.
+#
+#   - 요청은 deadline(답이 필요한 시각)이 빠른 순서로 처리됩니다.
+#     남은 시간이 적은 게임의 요청이 먼저 계산됩니다.
+#   - 요청이 worker에서 계산을 시작할 때까지 기다린 시간만큼 search 시간이 줄어듭니다.
+#   - 같은 affinity(예: 게임의 session id)의 요청은 가능하면 이전에 그 요청을 계산한 worker에 보내서
+#     transposition table에 남아있는 이전 턴의 search 결과를 사용합니다.
+#   - preemptible한 요청(분석 등 오래 걸리는 작업)이 계산 중일 때 모든 worker가 바쁘고
+#     그보다 deadline이 빠른 요청이 들어오면, 분석을 중단시키고 급한 요청을 먼저 계산합니다.
+#     중단된 분석은 다시 queue에 들어가며, worker의 캐시 덕분에 이어서 계산할 때 빠르게 진행됩니다.
+#     중단 요청은 job id로 보내므로 다른 job에 잘못 전달되지 않으며,
+#     중단 요청이 도착하기 전에 끝난 search의 결과는 그대로 사용합니다.
+#
+#####################################################################
+
+# worker process마다 오목판의 크기별로 engine을 하나씩 유지합니다.
+_engines = {}
+
+
+def worker_engine(dimension, stop_event=None):
+    # worker process에서만 필요하므로 여기서 import합니다.
+    from gomoku import Gomoku
+
+    engine = _engines.get(dimension)
+    if engine is None:
+        engine = Gomoku(dimension=dimension)
+        engine.verbose = False
+        engine.pondering = False
+        _engines[dimension] = engine
+    engine.stop_event = stop_event
+    return engine
+
+
+# worker에서 engine.stop_event로 사용하는 job 하나의 중단 요청입니다.
+# dispatcher는 worker마다 공유된 값(multiprocessing.Value)에 중단할 job의 id를 씁니다.
+# 다른 job의 id라면 이 job의 중단 요청이 아니므로, 늦게 도착한 중단 요청이 다음 job을 멈추지 않습니다.
+# triggered는 search가 이 중단 요청으로 실제로 멈췄는지를 기록합니다.
+class JobStop(object):
+
+    __slots__ = ('target', 'job_id', 'triggered')
+
+    def __init__(self, target, job_id):
+        self.target = target
+        self.job_id = job_id
+        self.triggered = False
+
+    def is_set(self):
+        if self.target.value == self.job_id:
+            self.triggered = True
+        return self.triggered
+
+
+# 흑부터 번갈아 둔 수의 목록으로 position을 만들고, 다음 플레이어의 수를 계산합니다.
+# 반환값 : ([y, x] 또는 None, 완료된 depth)
+def think_job(dimension, moves, seconds, stop_event=None):
+    engine = worker_engine(dimension, stop_event)
+    state = state_from_moves(moves, dimension)
+
+    action, depth = engine.think(engine.players[len(moves) % 2], seconds, state=state)
+    return (list(action) if action is not None else None), depth
+
+
+# worker process의 main loop입니다.
+# jobs에서 (job id, dimension, moves, seconds)를 받아 계산하고,
+# results에 (worker id, job id, 결과, 중단 여부)를 보냅니다. None을 받으면 종료합니다.
+# 중단 여부는 search가 중단 요청으로 실제로 멈췄는지입니다. 중단 요청 전에 끝났다면 False입니다.
+def worker_main(worker_id, jobs, results, stop_target):
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, dimension, moves, seconds = job
+
+        stop = JobStop(stop_target, job_id)
+        try:
+            result = think_job(dimension, moves, seconds, stop)
+        except Exception as error:
+            result = error
+        results.put((worker_id, job_id, result, stop.triggered))
+
+
+class Job(object):
+
+    # 요청 하나입니다. deadline이 빠를수록 먼저 계산됩니다.
+    __slots__ = ('id', 'dimension', 'moves', 'seconds', 'deadline', 'preemptible', 'affinity', 'future')
+
+    def __init__(self, job_id, dimension, moves, seconds, deadline, preemptible, affinity):
+        self.id = job_id
+        self.dimension = dimension
+        self.moves = moves
+        self.seconds = seconds
+        self.deadline = deadline
+        self.preemptible = preemptible
+        self.affinity = affinity
+        self.future = concurrent.futures.Future()
+
+
+class EngineScheduler(object):
+
+    #####################################################################
+    #
+    #   Engine Scheduler
+    #   - init(workers)
+    #       workers개의 worker process를 시작합니다.
+    #
+    #   - submit(dimension, moves, seconds, deadline, preemptible, affinity)
+    #       흑부터 번갈아 둔 moves 다음의 수를 계산하는 요청을 queue에 넣고 Future를 반환합니다.
+    #       Future의 결과는 ([y, x] 또는 None, 완료된 depth)입니다.
+    #       seconds : search에 사용할 최대 시간
+    #       deadline : 답이 필요한 시각 (time.monotonic() 기준, 기본값은 지금 + seconds)
+    #       preemptible : 더 급한 요청을 위해 중단될 수 있는 요청인지 여부
+    #       affinity : 같은 값의 요청은 가능하면 같은 worker에서 계산합니다.
+    #       asyncio에서는 asyncio.wrap_future(future)로 기다립니다.
+    #
+    #   - pending()
+    #       queue에서 기다리거나 계산 중인 요청의 수를 반환합니다.
+    #
+    #   - close()
+    #       worker process들을 종료합니다.
+    #
+    #####################################################################
+
+    # 요청을 worker에 보내고 결과를 받는 데 걸리는 시간을 어림한 여유입니다. (단위 : 초)
+    MARGIN = 0.05
+
+    def __init__(self, workers=None):
+        super(EngineScheduler, self).__init__()
+        self.workers = workers or multiprocessing.cpu_count() or 1
+
+        self.results = multiprocessing.Queue()
+        self.job_queues = []
+        self.stop_targets = []
+        self.processes = []
+        for worker_id in range(self.workers):
+            jobs = multiprocessing.Queue()
+            # worker마다 중단할 job의 id입니다. (JobStop 참고) -1이라면 중단할 job이 없습니다.
+            stop_target = multiprocessing.Value('q', -1)
+            process = multiprocessing.Process(target=worker_main, args=(worker_id, jobs, self.results, stop_target))
+            process.daemon = True
+            process.start()
+            self.job_queues.append(jobs)
+            self.stop_targets.append(stop_target)
+            self.processes.append(process)
+
+        # dispatcher thread만 아래의 상태를 바꿉니다.
+        self.waiting = []                               # (deadline, 순서, job)의 heap
+        self.running = [None] * self.workers            # worker마다 계산 중인 job
+        self.last_affinity = [None] * self.workers      # worker마다 마지막으로 계산한 job의 affinity
+        self.job_ids = itertools.count()
+
+        # 기다리거나 계산 중인 요청의 수입니다. submit을 호출하는 thread와 dispatcher thread가 함께 바꿉니다.
+        self.count = 0
+        self.lock = threading.Lock()
+
+        # submit과 worker의 결과는 모두 events를 통해 dispatcher thread로 전달됩니다.
+        self.events = queue.Queue()
+        self.closed = False
+        self.dispatcher = threading.Thread(target=self.dispatch_loop, daemon=True)
+        self.dispatcher.start()
+        self.collector = threading.Thread(target=self.collect_loop, daemon=True)
+        self.collector.start()
+
+    def submit(self, dimension, moves, seconds, deadline=None, preemptible=False, affinity=None):
+        if self.closed:
+            raise RuntimeError("scheduler가 종료되었습니다.")
+        if deadline is None:
+            deadline = time.monotonic() + seconds
+        job = Job(next(self.job_ids), dimension, [tuple(move) for move in moves], seconds,
+                  deadline, preemptible, affinity)
+        with self.lock:
+            self.count += 1
+        self.events.put(("submit", job))
+        return job.future
+
+    def pending(self):
+        return self.count
+
+    def collect_loop(self):
+        while True:
+            try:
+                message = self.results.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            self.events.put(("result",) + message)
+
+    def dispatch_loop(self):
+        while True:
+            event = self.events.get()
+            if event[0] == "close":
+                break
+            if event[0] == "submit":
+                job = event[1]
+                heapq.heappush(self.waiting, (job.deadline, job.id, job))
+            elif event[0] == "result":
+                self.finish(*event[1:])
+            self.schedule()
+
+        # 종료 전에 기다리던 요청들을 취소합니다.
+        for _, _, job in self.waiting:
+            job.future.cancel()
+        for job in self.running:
+            if job is not None:
+                job.future.cancel()
+
+    def finish(self, worker_id, job_id, result, preempted):
+        job = self.running[worker_id]
+        self.running[worker_id] = None
+        if job is None or job.id != job_id:
+            return
+
+        # 중단되어 search를 끝내지 못한 preemptible 요청만 다시 queue에 넣습니다.
+        # 중단 요청이 도착하기 전에 search가 끝났다면 preempted가 False이므로 그 결과를 그대로 사용합니다.
+        if preempted and job.preemptible and not isinstance(result, Exception):
+            heapq.heappush(self.waiting, (job.deadline, job.id, job))
+            return
+
+        with self.lock:
+            self.count -= 1
+        if isinstance(result, Exception):
+            job.future.set_exception(result)
+        else:
+            job.future.set_result(result)
+
+    def schedule(self):
+        while self.waiting:
+            deadline, _, job = self.waiting[0]
+            worker_id = self.idle_worker(job)
+            if worker_id is None:
+                self.preempt_for(job)
+                return
+            heapq.heappop(self.waiting)
+            self.start(worker_id, job)
+
+    def idle_worker(self, job):
+        idle = [worker_id for worker_id in range(self.workers) if self.running[worker_id] is None]
+        if not idle:
+            return None
+        for worker_id in idle:
+            if job.affinity is not None and self.last_affinity[worker_id] == job.affinity:
+                return worker_id
+        return idle[0]
+
+    # job보다 deadline이 늦은 preemptible 요청 중 가장 늦은 요청을 중단시킵니다.
+    # 중단된 요청의 결과가 도착하면 worker가 비므로, 그 때 job이 시작됩니다.
+    def preempt_for(self, job):
+        victim = None
+        for worker_id, running in enumerate(self.running):
+            if running is None or not running.preemptible or running.deadline <= job.deadline:
+                continue
+            if self.stop_targets[worker_id].value == running.id:
+                # 이미 중단 중인 worker가 있다면 그 worker를 기다립니다.
+                return
+            if victim is None or running.deadline > self.running[victim].deadline:
+                victim = worker_id
+        if victim is not None:
+            self.stop_targets[victim].value = self.running[victim].id
+
+    def start(self, worker_id, job):
+        # queue에서 기다린 시간만큼 search 시간을 줄입니다.
+        seconds = min(job.seconds, job.deadline - time.monotonic() - self.MARGIN)
+        seconds = max(seconds, 0.01)
+        self.running[worker_id] = job
+        self.last_affinity[worker_id] = job.affinity
+
+        # job을 보내기 전에 중단 요청을 지웁니다. 다시 queue에 들어간 job은 같은 id를 가지므로,
+        # 이전에 그 job에 보낸 중단 요청이 남아있다면 시작하자마자 멈추게 됩니다.
+        # worker가 job을 꺼내기 전에 보낸 중단 요청은 지워지지 않으므로 그대로 전달됩니다.
+        self.stop_targets[worker_id].value = -1
+        self.job_queues[worker_id].put((job.id, job.dimension, job.moves, seconds))
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.events.put(("close",))
+        self.dispatcher.join()
+        # dispatcher가 끝났으므로 running을 읽어도 됩니다. 계산 중인 job들을 모두 중단시킵니다.
+        for worker_id, job in enumerate(self.running):
+            if job is not None:
+                self.stop_targets[worker_id].value = job.id
+        for jobs in self.job_queues:
+            jobs.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.results.put(None)
+        self.collector.join(timeout=5)
@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+
+from board import DEFAULT_DIMENSION, MIN_DIMENSION, MAX_DIMENSION
+from player import Player, COLORS
+from scheduler import EngineScheduler
+from state import State
+
+#####################################################################
+#
+#   Game Server
+#   한 프로세스에서 여러 USER VS AI 게임을 동시에 진행합니다.
+#   TCP 또는 Unix socket으로 한 줄에 JSON 하나씩 주고받습니다.
+#   AI의 수는 EngineScheduler의 worker process에서 계산하므로 event loop는 멈추지 않습니다.
+#   남은 시간이 적은 게임의 수가 먼저 계산되며, 같은 게임의 수는 가능하면 같은 worker에서 계산됩니다.
+#
+#   요청 (한 줄에 하나)
+#   {"cmd": "new", "dimension": 15, "color": "B", "move_time": 5, "match_time": 300, "user_time": 60}
+#       새 게임을 시작합니다. color는 USER의 돌 색입니다. 흑이 먼저 둡니다.
+#       move_time : AI가 한 수에 사용할 수 있는 최대 시간 (초)
+#       match_time : AI가 게임 전체에 사용할 수 있는 시간 (초, 생략하면 제한 없음)
+#       user_time : USER가 한 수에 사용할 수 있는 시간 (초, 생략하면 제한 없음)
+#   {"cmd": "move", "session": 1, "move": [7, 7]}
+#       USER가 돌을 둡니다. 응답에는 AI의 수가 포함됩니다.
+#   {"cmd": "board", "session": 1}
+#       오목판과 게임의 상태를 반환합니다.
+#   {"cmd": "resign", "session": 1} / {"cmd": "close", "session": 1}
+#       게임을 포기하거나 종료합니다.
+#   {"cmd": "status"}
+#       진행 중인 게임의 수와 worker들의 상태를 반환합니다.
+#
+#   응답은 {"ok": true, ...} 또는 {"ok": false, "error": ...} 입니다.
+#   AI의 수를 계산하는 요청이 max_pending개를 넘으면 "busy" 오류로 거절하며,
+#   이 때 USER의 수는 반영되지 않으므로 같은 요청을 다시 보내면 됩니다.
+#
+#   사용법
+#   python server.py --port 9019 --workers 4
+#   python server.py --unix /tmp/gomoku.sock
+#
+#####################################################################
+
+DEFAULT_PORT = 9019
+DEFAULT_MOVE_TIME = 5
+
+
+class Session(object):
+
+    #####################################################################
+    #
+    #   Session
+    #   - init(session_id, dimension, user_color, move_time, match_time, user_time)
+    #       서버에서 진행되는 USER VS AI 게임 하나입니다.
+    #
+    #   - play(move, color)
+    #       color의 돌을 둡니다. 둘 수 없다면 오류 메시지를 반환합니다.
+    #
+    #   - ai_seconds()
+    #       AI가 이번 수에 사용할 수 있는 시간을 반환합니다.
+    #
+    #   - summary()
+    #       게임의 상태를 dict로 반환합니다.
+    #
+    #####################################################################
+
+    def __init__(self, session_id, dimension, user_color, move_time, match_time=None, user_time=None):
+        super(Session, self).__init__()
+        self.id = session_id
+        self.dimension = dimension
+        self.state = State(dimension)
+        self.user = Player(user_color)
+        self.ai = Player(COLORS[1 - self.user.number])
+        self.moves = []
+        self.winner = None
+
+        # 시간 제한입니다. match_time은 AI가 수를 둘 때마다 줄어듭니다.
+        self.move_time = move_time
+        self.ai_clock = match_time
+        self.user_time = user_time
+        self.user_deadline = None
+
+        # AI의 수를 계산 중이라면 True입니다. 이 동안에는 USER의 수를 받지 않습니다.
+        self.thinking = False
+
+    def to_move(self):
+        return COLORS[len(self.moves) % 2]
+
+    def play(self, move, color):
+        board = self.state.board
+        if self.winner is not None:
+            return "게임이 끝났습니다."
+        if color != self.to_move():
+            return "차례가 아닙니다."
+        if not board.is_valid_coordinate(move):
+            return "돌을 둘 수 없는 좌표입니다."
+
+        index = board.index(move)
+        if not board.place(index, color):
+            return "쌍삼입니다."
+
+        self.moves.append(tuple(move))
+        self.state.set_current_coordinate(tuple(move))
+        if board.line_length(index) >= 5:
+            self.winner = color
+        elif len(self.moves) == len(board.cells):
+            self.winner = "draw"
+        return None
+
+    def ai_seconds(self):
+        if self.ai_clock is None:
+            return self.move_time
+        # 남은 시간을 앞으로 둘 수의 수(최소 10수)로 나누어 사용합니다.
+        moves_left = max(10, (len(self.state.board.cells) - len(self.moves)) // 2)
+        return max(0.05, min(self.move_time, self.ai_clock / moves_left))
+
+    def summary(self):
+        board = self.state.board
+        return {
+            "session": self.id,
+            "dimension": self.dimension,
+            "user": self.user.color,
+            "to_move": self.to_move(),
+            "moves": [list(move) for move in self.moves],
+            "board": ["".join(board.cells[y*self.dimension:(y+1)*self.dimension]) for y in range(self.dimension)],
+            "winner": self.winner,
+            "ai_clock": self.ai_clock,
+        }
+
+
+class GameServer(object):
+
+    #####################################################################
+    #
+    #   Game Server
+    #   - init(workers, max_pending, move_time)
+    #       AI의 수를 계산할 EngineScheduler를 생성합니다.
+    #       max_pending : 동시에 계산하거나 기다릴 수 있는 AI의 수의 최대 개수
+    #
+    #   - serve_tcp(host, port) / serve_unix(path)
+    #       연결을 받아 요청을 처리합니다.
+    #
+    #   - handle(request, owned)
+    #       요청 하나를 처리하고 응답을 반환합니다.
+    #       owned는 연결이 만든 session id들로, 연결이 끊어지면 함께 종료됩니다.
+    #
+    #   - close()
+    #       EngineScheduler를 종료합니다.
+    #
+    #####################################################################
+
+    def __init__(self, workers=None, max_pending=None, move_time=DEFAULT_MOVE_TIME):
+        super(GameServer, self).__init__()
+        self.scheduler = EngineScheduler(workers)
+        self.workers = self.scheduler.workers
+        self.max_pending = max_pending if max_pending is not None else 2 * self.workers
+        self.move_time = move_time
+
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+
+    async def serve_tcp(self, host, port):
+        server = await asyncio.start_server(self.connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path):
+        server = await asyncio.start_unix_server(self.connection, path)
+        async with server:
+            await server.serve_forever()
+
+    async def connection(self, reader, writer):
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("요청은 JSON object여야 합니다.")
+                    response = await self.handle(request, owned)
+                except (ValueError, TypeError, KeyError) as error:
+                    response = {"ok": False, "error": str(error)}
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode())
+
+                # 클라이언트가 응답을 읽지 않는다면 더 이상 요청을 읽지 않습니다.
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    def session(self, request, owned):
+        session_id = request.get("session")
+        if session_id not in owned:
+            raise KeyError("알 수 없는 session입니다. : {}".format(session_id))
+        return self.sessions[session_id]
+
+    async def handle(self, request, owned):
+        command = request.get("cmd")
+
+        if command == "new":
+            dimension = int(request.get("dimension", DEFAULT_DIMENSION))
+            if dimension < MIN_DIMENSION or dimension > MAX_DIMENSION:
+                raise ValueError("오목판의 크기는 {}부터 {}까지입니다.".format(MIN_DIMENSION, MAX_DIMENSION))
+            color = request.get("color", "B")
+            if color not in COLORS:
+                raise ValueError("color는 B 또는 W입니다.")
+            session = Session(next(self.session_ids), dimension, color,
+                              float(request.get("move_time", self.move_time)),
+                              request.get("match_time"), request.get("user_time"))
+            self.sessions[session.id] = session
+            owned.add(session.id)
+
+            response = {"ok": True, "session": session.id}
+            if session.ai.color == 'B':
+                return await self.ai_turn(session, response)
+            session.user_deadline = self.user_deadline(session)
+            return response
+
+        if command == "move":
+            session = self.session(request, owned)
+            if session.thinking:
+                return {"ok": False, "error": "AI가 수를 계산 중입니다."}
+
+            # USER의 시간이 초과되었다면 AI의 승리입니다.
+            if session.user_deadline is not None and time.monotonic() > session.user_deadline and session.winner is None:
+                session.winner = session.ai.color
+                return {"ok": False, "error": "제한 시간을 초과했습니다.", "winner": session.winner}
+
+            # worker들이 가득 찼다면 USER의 수를 반영하지 않고 거절합니다.
+            if self.scheduler.pending() >= self.max_pending:
+                return {"ok": False, "error": "busy", "pending": self.scheduler.pending()}
+
+            move = request["move"]
+            error = session.play((int(move[0]), int(move[1])), session.user.color)
+            if error is not None:
+                return {"ok": False, "error": error}
+
+            response = {"ok": True, "session": session.id}
+            if session.winner is not None:
+                response["winner"] = session.winner
+                return response
+            return await self.ai_turn(session, response)
+
+        if command == "board":
+            response = self.session(request, owned).summary()
+            response["ok"] = True
+            return response
+
+        if command == "resign":
+            session = self.session(request, owned)
+            if session.winner is None:
+                session.winner = session.ai.color
+            return {"ok": True, "session": session.id, "winner": session.winner}
+
+        if command == "close":
+            session = self.session(request, owned)
+            owned.discard(session.id)
+            self.sessions.pop(session.id, None)
+            return {"ok": True, "session": session.id}
+
+        if command == "status":
+            return {"ok": True, "sessions": len(self.sessions), "workers": self.workers,
+                    "pending": self.scheduler.pending(), "max_pending": self.max_pending}
+
+        raise ValueError("알 수 없는 요청입니다. : {}".format(command))
+
+    def user_deadline(self, session):
+        if session.user_time is None:
+            return None
+        return time.monotonic() + float(session.user_time)
+
+    # AI의 수를 worker에서 계산하여 두고, 응답에 추가합니다.
+    async def ai_turn(self, session, response):
+        seconds = session.ai_seconds()
+
+        session.thinking = True
+        start = time.monotonic()
+        try:
+            future = self.scheduler.submit(session.dimension, session.moves, seconds, affinity=session.id)
+            action, depth = await asyncio.wrap_future(future)
+        finally:
+            session.thinking = False
+
+        if session.ai_clock is not None:
+            session.ai_clock = max(0.0, session.ai_clock - (time.monotonic() - start))
+
+        # connection이 끊어져 session이 종료되었다면 결과를 버립니다.
+        if self.sessions.get(session.id) is not session:
+            return response
+
+        if action is None or session.play(tuple(action), session.ai.color) is not None:
+            # AI가 둘 곳을 찾지 못했습니다.
+            session.winner = session.user.color if action is not None else "draw"
+        else:
+            response["ai_move"] = action
+            response["depth"] = depth
+
+        if session.winner is not None:
+            response["winner"] = session.winner
+        else:
+            session.user_deadline = self.user_deadline(session)
+        return response
+
+    def close(self):
+        self.scheduler.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gomoku game server")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP 주소 (기본값 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port (기본값 {})".format(DEFAULT_PORT))
+    parser.add_argument("--unix", help="TCP 대신 사용할 Unix socket 경로")
+    parser.add_argument("--workers", type=int, help="AI의 수를 계산할 process의 수 (기본값 CPU 수)")
+    parser.add_argument("--max-pending", type=int, help="동시에 기다릴 수 있는 AI의 수의 최대 개수 (기본값 workers x 2)")
+    parser.add_argument("--move-time", type=float, default=DEFAULT_MOVE_TIME,
+                        help="AI가 한 수에 사용할 수 있는 기본 시간 (초, 기본값 {})".format(DEFAULT_MOVE_TIME))
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.workers, args.max_pending, args.move_time)
+    try:
+        if args.unix:
+            asyncio.run(server.serve_unix(args.unix))
+        else:
+            asyncio.run(server.serve_tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,293 @@
-from board import Board
-import copy
+from board import Board, RAY_LENGTH
+from weights import OPEN_FOUR, FOUR, OPEN_THREE, THREE, OPEN_TWO, TWO, ONE, NONE
+import weights
 import operator
 
+
+# 빈 칸에서 한 방향(과 그 반대 방향)의 패턴을 분류합니다.
+# count / opposite : direction 방향 / 반대 방향으로 연속된 player의 돌의 수
+# stucked / opposite_stucked : 그 돌들이 상대 플레이어의 돌에 막혔는지 여부
+# (marker, 패턴 번호)를 반환합니다. 패턴 번호는 weights.PATTERNS의 순서입니다.
+def classify_direction(count, opposite, stucked, opposite_stucked):
+    now = None
+    if count > 3 or opposite > 3:
+        now = (count,OPEN_FOUR)
+
+    elif count == 3 or opposite == 3:
+
+        if count == 3:
+
+            if stucked == False:
+                marker = count + opposite
+                if marker == 3:
+                    if opposite_stucked == False:
+                        now = (marker,OPEN_THREE)
+                    else:
+                        now = (marker,THREE)
+                elif marker == 4:
+                    now = (marker,FOUR)
+                elif marker >= 5:
+                    now = (marker,FOUR)
+            else:
+                marker = count + opposite
+                if marker == 3:
+                    if opposite_stucked == False:
+                        now = (marker,THREE)
+                    else:
+                        now = (marker,NONE)
+                elif marker == 4:
+                    now = (marker,FOUR)
+                elif marker >= 5:
+                    now = (marker,FOUR)
+
+        elif opposite == 3:
+
+            if opposite_stucked == False:
+                marker = opposite + count
+                if marker == 3:
+                    if stucked == False:
+                        now = (marker,OPEN_THREE)
+                    else:
+                        now = (marker,THREE)
+                elif marker == 4:
+                    now = (marker,FOUR)
+                elif marker >= 5:
+                    now = (marker,FOUR)
+            else:
+                marker = opposite + count
+                if marker == 3:
+                    if stucked == False:
+                        now = (marker,THREE)
+                    else:
+                        now = (marker,NONE)
+                elif marker == 4:
+                    now = (marker,FOUR)
+                elif marker >= 5:
+                    now = (marker,FOUR)
+
+    elif count == 2 or opposite == 2:
+
+        if count == 2:
+
+            if stucked == False:
+                marker = count + opposite
+                if marker == 2:
+                    if opposite_stucked == False:
+                        now = (marker,OPEN_TWO)
+                    else:
+                        now = (marker,TWO)
+                elif marker == 3:
+                    if opposite_stucked == False:
+                        now = (marker,OPEN_THREE)
+                    else:
+                        now = (marker,THREE)
+                elif marker >= 4:
+                    now = (marker,FOUR)
+
+            else:
+                marker = count + opposite
+                if marker == 2:
+                    if opposite_stucked == False:
+                        now = (marker,TWO)
+                    else:
+                        now = (marker,NONE)
+                elif marker == 3:
+                    if opposite_stucked == False:
+                        now = (marker,THREE)
+                    else:
+                        now = (marker,NONE)
+                elif marker >= 4:
+                    now = (marker,FOUR)
+        else :
+
+            if opposite_stucked == False:
+                marker = count + opposite
+                if marker == 2:
+                    if stucked == False:
+                        now = (marker,OPEN_TWO)
+                    else:
+                        now = (marker,TWO)
+                elif marker == 3:
+                    if stucked == False:
+                        now = (marker,OPEN_THREE)
+                    else:
+                        now = (marker,THREE)
+                elif marker >= 4:
+                    now = (marker,FOUR)
+
+            else:
+                marker = count + opposite
+                if marker == 2:
+                    if stucked == False:
+                        now = (marker,TWO)
+                    else:
+                        now = (marker,NONE)
+                elif marker == 3:
+                    if stucked == False:
+                        now = (marker,THREE)
+                    else:
+                        now = (marker,NONE)
+                elif marker >= 4:
+                    now = (marker,FOUR)
+
+    elif count == 1 or opposite == 1:
+
+        if count == 1:
+
+            if stucked == False:
+                marker = count + opposite
+                if marker == 1:
+                    now = (marker,ONE)
+
+                elif marker == 2:
+                    if opposite_stucked == False:
+                        now = (marker,OPEN_TWO)
+                    else:
+                        now = (marker,TWO)
+
+            else:
+                marker = count + opposite
+                if marker == 1:
+                    if opposite_stucked == False:
+                       now = (marker,ONE)
+                    else:
+                        now = (marker,NONE)
+                elif marker == 2:
+                    if opposite_stucked == False:
+                        now = (marker,TWO)
+                    else:
+                        now = (marker,NONE)
+
+        else :
+
+            if opposite_stucked == False:
+                marker = count + opposite
+                if marker == 1:
+                    now = (marker,ONE)
+
+                elif marker == 2:
+                    if stucked == False:
+                        now = (marker,OPEN_TWO)
+                    else:
+                        now = (marker,TWO)
+
+
+            else:
+                marker = count + opposite
+                if marker == 1:
+                    if stucked == False:
+                        now = (marker,ONE)
+                    else:
+                        now = (marker,NONE)
+                elif marker == 2:
+                    if stucked == False:
+                        now = (marker,TWO)
+                    else:
+                        now = (marker,NONE)
+
+    elif count == 0 or opposite == 0:
+
+        if count == 0:
+
+            if stucked == False:
+                marker = count + opposite
+                if marker == 0:
+                    now = (marker,NONE)
+
+                elif marker == 1:
+                    if opposite_stucked == False:
+                        now = (marker,ONE)
+                    else:
+                        now = (marker,NONE)
+
+            else:
+                marker = count + opposite
+                if marker == 0:
+                    now = (marker,NONE)
+
+                elif marker == 1:
+                    if opposite_stucked == False:
+                        now = (marker,ONE)
+                    else:
+                        now = (marker,NONE)
+
+        else :
+
+            if opposite_stucked == False:
+                marker = count + opposite
+                if marker == 0:
+                    now = (marker,NONE)
+
+                elif marker == 1:
+                    if stucked == False:
+                        now = (marker,ONE)
+                    else:
+                        now = (marker,NONE)
+
+
+            else:
+                marker = count + opposite
+                if marker == 0:
+                    now = (marker,NONE)
+
+                elif marker == 1:
+                    if stucked == False:
+                        now = (marker,ONE)
+                    else:
+                        now = (marker,NONE)
+
+    return now
+
+# 한 방향으로 연속된 돌의 수는 0부터 RAY_LENGTH까지입니다.
+RAY_SIDES = RAY_LENGTH + 1
+
+# 모든 (count, opposite, stucked, opposite_stucked)의 분류 결과 표입니다.
+# PATTERN_TABLE[((count*RAY_SIDES + opposite)*2 + stucked)*2 + opposite_stucked]
+PATTERN_TABLE = tuple(classify_direction(count, opposite, stucked, opposite_stucked)
+                      for count in range(RAY_SIDES)
+                      for opposite in range(RAY_SIDES)
+                      for stucked in (False, True)
+                      for opposite_stucked in (False, True))
+
+
+# 빈 칸에서 8 방향의 ray를 한 번씩만 조사하여, 흑과 백 모두의 4 방향 PATTERN_TABLE index를 구합니다.
+# ray의 첫 돌의 색만 연속된 돌을 가질 수 있고, 다른 색은 그 돌에 막힌 것이 됩니다.
+# 반환값 : (흑의 index 4개, 백의 index 4개)
+def scan_both(cells, cell_rays):
+    black_counts = [0] * 8
+    black_stucked = [False] * 8
+    white_counts = [0] * 8
+    white_stucked = [False] * 8
+    for direction, ray in enumerate(cell_rays):
+        if not ray:
+            continue
+        first = cells[ray[0]]
+        if first == '.':
+            continue
+        count = 0
+        stucked = False
+        for cell in ray:
+            if cells[cell] != first:
+                if cells[cell] != '.':
+                    stucked = True
+                break
+            count += 1
+        if first == 'B':
+            black_counts[direction] = count
+            black_stucked[direction] = stucked
+            white_stucked[direction] = True
+        else:
+            white_counts[direction] = count
+            white_stucked[direction] = stucked
+            black_stucked[direction] = True
+
+    black = [((black_counts[direction]*RAY_SIDES + black_counts[direction+4])*2
+              + black_stucked[direction])*2 + black_stucked[direction+4] for direction in range(4)]
+    white = [((white_counts[direction]*RAY_SIDES + white_counts[direction+4])*2
+              + white_stucked[direction])*2 + white_stucked[direction+4] for direction in range(4)]
+    return black, white
+
+
 class State(object):
     
     #####################################################################
@@ -30,12 +316,26 @@ class State(object):
     #   - new_state(new_marker, player)
     #       새로운 state을 생성합니다.
     #
-    #   - heuristic_evaluation(player, phase)
+    #   - copy()
+    #       오목판의 칸들만 복사한 state을 반환합니다.
+    #
+    #   - heuristic_evaluation(player, phase, cache, scores)
     #       현재 state의 heuristic을 평가합니다.
+    #       cache가 주어지면 같은 position과 플레이어에 대한 이전 평가 결과를 재사용합니다.
+    #       scores는 패턴마다의 가중치이며, 주어지지 않으면 weights.active를 사용합니다.
+    #
+    #   - heuristic_evaluation_both(cache, scores)
+    #       흑과 백의 heuristic_evaluation 결과를 오목판을 한 번만 조사하여 함께 반환합니다.
+    #
+    #   - pattern_counts(player)
+    #       빈 칸과 방향마다의 패턴 수를 weights.PATTERNS 순서로 반환합니다.
     #
     #
     ######################################################################
     
+    # State는 search의 노드마다 생성되므로, 인스턴스마다 __dict__를 만들지 않습니다.
+    __slots__ = ('dimension', 'board', 'current_coordinate')
+
     def __init__(self, dimension):
         super(State, self).__init__()
         self.dimension = dimension
@@ -82,11 +382,20 @@ class State(object):
         return transitions
     
 
-    def new_state(self, new_marker, player):
-        new_state = State(self.dimension)
+    def copy(self):
+        # 새 오목판을 만들지 않고, 현재 오목판의 칸들만 복사합니다.
+        new_state = State.__new__(State)
+        new_state.dimension = self.dimension
+        new_state.board = self.board.copy()
+        new_state.current_coordinate = self.current_coordinate
+        return new_state
 
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def new_state(self, new_marker, player):
         # 현재 state의 오목판을 복사합니다.
-        new_state.board = copy.deepcopy(self.board)      
+        new_state = self.copy()
 
         # 현재 state의 오목판 위에 새로운 돌을 올려놓습니다.                  
         new_state.board.make_marker(new_marker,player)    
@@ -99,7 +408,8 @@ class State(object):
 
     # 현재 state의 heuristic을 평가합니다.
     # 돌이 놓인 패턴으로 state의 heuristic 값을 도출합니다.
-    # 함수값은 0부터 100까지 10단위 입니다.
+    # 패턴마다의 값은 scores(weights.PATTERNS 순서의 가중치)이며, 주어지지 않으면 weights.active입니다.
+    # 아래는 기본 가중치(weights.DEFAULT_WEIGHTS)로, 함수값은 0부터 100까지 10단위 입니다.
     # 100 : 연속된 돌이 5개인 경우 
     #       ex) BBBBB
     #  80 : 연속된 돌이 4개이며 양 끝이 막히지 않은 경우 
@@ -116,294 +426,163 @@ class State(object):
     #       ex) .BBW / .B.BW
     #  10 : 돌이 1개이거나 2개이며 다음 턴에 막힐 수 있는 경우
     #   0 : 양 끝이 막힌 경우
-    def heuristic_evaluation(self, player, phase):
- 
-        board_info = {}
-
-        for y in range(self.dimension):
-            for x in range(self.dimension):
-                cur_color = self.board.on((y,x))
-                
-                if (cur_color != '.'):
-                    continue
-
-                # 현재 좌표(y,x)를 기준으로 8 방향에 대해 돌들을 탐색합니다.
-                # (y,x): (0, 1) / (1, 1) / (1, 0) / (1, -1) / (0, -1) / (-1, -1) / (-1, 0) / (-1, 1)
-             
-                # 8 방향에 대한 연속된 돌의 정보를 저장합니다.
-                markers = []
-
-                dy = [0,1,1,1,0,-1,-1,-1]
-                dx = [1,1,0,-1,-1,-1,0,1]  
-                
-                for direction in range(8):
-                    count_player = 0
-                    stucked = False
-                    for dist in range(1,6):
-                        
-                        y_check = y + dist*dy[direction]
-                        x_check = x + dist*dx[direction]
-
-                        # 돌을 카운팅 할 때, 오목판을 넘어가지 않도록 합니다.
-                        if (y_check < 0) or (y_check >= self.dimension) or (x_check < 0) or (x_check >= self.dimension ):
-                            break
-
-                        # 시작점(y,x)의 돌의 direction의 방향으로 상대 플레이어에의해 돌의 막혔으면 멈춥니다.
-                        if self.board.on((y_check,x_check)) != player.color:
-                            if self.board.on((y_check,x_check)) != '.':
-                                stucked = True
-                            break
-                        count_player +=1
-
-                    info = {"count_player":count_player, "stucked":stucked}
-
-                    # 방향별로 돌의 갯수를 저장합니다.
-                    markers.append(info)
-
-
-                # 4 방향에 대해 돌을 조사합니다.
-                board_info_direction = []
-                for direction in range(4):
-                    now = None
-
-                    if markers[direction]["count_player"] > 3 or markers[direction+4]["count_player"] > 3:
-                        now  = (markers[direction]["count_player"],80)
-
-                    elif markers[direction]["count_player"] == 3 or markers[direction+4]["count_player"] == 3:
-
-                        if markers[direction]["count_player"] == 3:
-
-                            if markers[direction]["stucked"] == False:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 3:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now  = (marker,60)
-                                    else:
-                                        now  = (marker,50)
-                                elif marker == 4:
-                                    now  = (marker,70)                 
-                                elif marker >= 5:
-                                    now  = (marker,70)
-                            else:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 3:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now  = (marker,50)
-                                    else:
-                                        now  = (marker,0)
-                                elif marker == 4:
-                                    now  = (marker,70)   
-                                elif marker >= 5:
-                                    now  = (marker,70)
-
-                        elif markers[direction+4]["count_player"] == 3:
-
-                            if markers[direction+4]["stucked"] == False:
-                                marker = markers[direction+4]["count_player"] + markers[direction]["count_player"]
-                                if marker == 3:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,60)
-                                    else:
-                                        now  = (marker,50)
-                                elif marker == 4:
-                                    now  = (marker,70)                 
-                                elif marker >= 5:
-                                    now  = (marker,70)
-                            else:
-                                marker = markers[direction+4]["count_player"] + markers[direction]["count_player"]
-                                if marker == 3:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,50)
-                                    else:
-                                        now = (marker,0)
-                                elif marker == 4:
-                                    now = (marker,70)   
-                                elif marker >= 5:
-                                    now = (marker,70)
-
-                    elif markers[direction]["count_player"] == 2 or markers[direction+4]["count_player"] == 2:
-
-                        if markers[direction]["count_player"] == 2:
-
-                            if markers[direction]["stucked"] == False:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 2:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now  = (marker,40)
-                                    else:
-                                        now  = (marker,30)
-                                elif marker == 3:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now  = (marker,60)
-                                    else:
-                                        now  = (marker,50)
-                                elif marker >= 4:
-                                    now  = (marker,70)
-                                    
-                            else:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 2:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now  = (marker,30)
-                                    else:
-                                        now = (marker,0)
-                                elif marker == 3:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now  = (marker,50)
-                                    else:
-                                        now = (marker,0)
-                                elif marker >= 4:
-                                    now  = (marker,70)
-                        else :
-
-                            if markers[direction+4]["stucked"] == False:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 2:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,40)
-                                    else:
-                                        now  = (marker,30)
-                                elif marker == 3:
-                                    if markers[direction]["stucked"] == False:
-                                        now = (marker,60)
-                                    else:
-                                        now = (marker,50)
-                                elif marker >= 4:
-                                    now = (marker,70)
-                                    
-                            else:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 2:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,30)
-                                    else:
-                                        now = (marker,0)
-                                elif marker == 3:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,50)
-                                    else:
-                                        now = (marker,0)
-                                elif marker >= 4:
-                                    now  = (marker,70)
-
-                    elif markers[direction]["count_player"] == 1 or markers[direction+4]["count_player"] == 1:
-
-                        if markers[direction]["count_player"] == 1:
-
-                            if markers[direction]["stucked"] == False:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 1:
-                                    now = (marker,10)
-                                    
-                                elif marker == 2:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now = (marker,40)
-                                    else:
-                                        now = (marker,30)
-                                    
-                            else:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 1:
-                                    if markers[direction+4]["stucked"] == False:
-                                       now  = (marker,10)
-                                    else:
-                                        now  = (marker,0)
-                                elif marker == 2:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now  = (marker,30)
-                                    else:
-                                        now  = (marker,0)
-  
-                        else :
-
-                            if markers[direction+4]["stucked"] == False:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 1:
-                                    now  = (marker,10)
-                                    
-                                elif marker == 2:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,40)
-                                    else:
-                                        now = (marker,30)
-
-                                    
-                            else:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 1:
-                                    if markers[direction]["stucked"] == False:
-                                        now = (marker,10)
-                                    else:
-                                        now = (marker,0)
-                                elif marker == 2:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,30)
-                                    else:
-                                        now = (marker,0)
-
-                    elif markers[direction]["count_player"] == 0 or markers[direction+4]["count_player"] == 0:
-
-                        if markers[direction]["count_player"] == 0:
-
-                            if markers[direction]["stucked"] == False:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 0:
-                                    now = (marker,0)
-                                    
-                                elif marker == 1:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now = (marker,10)
-                                    else:
-                                        now = (marker,0)
-                                    
-                            else:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 0:
-                                    now  = (marker,0)
-
-                                elif marker == 1:
-                                    if markers[direction+4]["stucked"] == False:
-                                        now = (marker,10)
-                                    else:
-                                        now = (marker,0)
-
-                        else :
-
-                            if markers[direction+4]["stucked"] == False:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 0:
-                                    now  = (marker,0)
-                                    
-                                elif marker == 1:
-                                    if markers[direction]["stucked"] == False:
-                                        now  = (marker,10)
-                                    else:
-                                        now = (marker,0)
-
-                                    
-                            else:
-                                marker = markers[direction]["count_player"] + markers[direction+4]["count_player"]
-                                if marker == 0:
-                                    now  = (marker,0)
-                                    
-                                elif marker == 1:
-                                    if markers[direction]["stucked"] == False:
-                                        now = (marker,10)
-                                    else:
-                                        now = (marker,0)
-
-                    board_info_direction.append(now)
-
-                # 4 방향을 조사하고, 그 중 가장 높은 값을 갖는 방향의 값을 
-                # 현재 위치의 heuristic value로 합니다.
-                board_info[(y,x)] = max(board_info_direction, key=lambda x:x[1])
-
-        # 전체 오목판에서 가장 큰 heuristic value를
-        # 현재 state의 heuristic value로 합니다.
-        h = max(board_info.values(), key=lambda x:x[1])
+    def heuristic_evaluation(self, player, phase, cache=None, scores=None):
+
+        # 같은 position을 같은 플레이어의 관점에서 평가한 적이 있다면 그 결과를 사용합니다.
+        if cache is not None:
+            key = (self.board.hash, player.color)
+            h = cache.get(key)
+            if h is not None:
+                return h
+
+        if scores is None:
+            scores = weights.active
+        h = None
+
+        cells = self.board.cells
+        rays = self.board.rays
+        color = player.color
+
+        for index, cur_color in enumerate(cells):
+            if (cur_color != '.'):
+                continue
+
+            # 현재 칸을 기준으로 8 방향에 대해 돌들을 탐색합니다.
+            # 방향의 순서는 board.DY / board.DX와 같습니다.
+            # (y,x): (0, 1) / (1, 1) / (1, 0) / (1, -1) / (0, -1) / (-1, -1) / (-1, 0) / (-1, 1)
+            # ray는 오목판 안의 칸들만 담고 있으므로, 오목판을 넘어가는지 검사하지 않습니다.
+
+            # 8 방향에 대한 연속된 돌의 수와, 상대 플레이어의 돌에 막혔는지를 저장합니다.
+            counts = []
+            stucked = []
+
+            for ray in rays[index]:
+                count_player = 0
+                is_stucked = False
+                for cell in ray:
+                    # 시작점의 돌의 direction의 방향으로 상대 플레이어에의해 돌의 막혔으면 멈춥니다.
+                    if cells[cell] != color:
+                        if cells[cell] != '.':
+                            is_stucked = True
+                        break
+                    count_player +=1
+
+                # 방향별로 돌의 갯수를 저장합니다.
+                counts.append(count_player)
+                stucked.append(is_stucked)
+
+
+            # 4 방향에 대해 돌을 조사하고, 그 중 가장 높은 값을 갖는 방향의 값을
+            # 현재 위치의 heuristic value로 합니다.
+            # 한 방향의 패턴은 (돌의 수, 반대 방향의 돌의 수, 양쪽의 막힘 여부)로 정해지므로
+            # 미리 분류해 둔 PATTERN_TABLE에서 찾습니다.
+            cell_best = None
+            for direction in range(4):
+                marker, pattern = PATTERN_TABLE[((counts[direction]*RAY_SIDES + counts[direction+4])*2
+                                                 + stucked[direction])*2 + stucked[direction+4]]
+                value = scores[pattern]
+                if cell_best is None or value > cell_best[1]:
+                    cell_best = (marker, value)
+
+            # 전체 오목판에서 가장 큰 heuristic value를
+            # 현재 state의 heuristic value로 합니다.
+            if h is None or cell_best[1] > h[1]:
+                h = cell_best
+
+        if h is None:
+            raise ValueError("비어있는 칸이 없습니다.")
+
+        if cache is not None:
+            cache.put(key, h)
 
         return h
 
+    # 흑과 백의 heuristic_evaluation 결과를 오목판을 한 번만 조사하여 함께 구합니다.
+    # 결과는 각각 heuristic_evaluation(Player('B'), ...) / (Player('W'), ...)와 같습니다.
+    # 반환값 : (흑의 (marker, value), 백의 (marker, value))
+    def heuristic_evaluation_both(self, cache=None, scores=None):
+        if cache is not None:
+            black_key = (self.board.hash, 'B')
+            white_key = (self.board.hash, 'W')
+            black = cache.get(black_key)
+            white = cache.get(white_key)
+            if black is not None and white is not None:
+                return black, white
+
+        if scores is None:
+            scores = weights.active
+        black = None
+        white = None
+
+        cells = self.board.cells
+        rays = self.board.rays
+        for index, cur_color in enumerate(cells):
+            if cur_color != '.':
+                continue
+
+            black_keys, white_keys = scan_both(cells, rays[index])
+
+            # 칸마다 가장 높은 값을 갖는 방향, 오목판 전체에서 가장 높은 값을 갖는 칸을 고릅니다.
+            # 값이 같다면 먼저 조사한 방향과 칸을 사용합니다. (heuristic_evaluation과 같습니다)
+            cell_best = None
+            for key in black_keys:
+                marker, pattern = PATTERN_TABLE[key]
+                if cell_best is None or scores[pattern] > cell_best[1]:
+                    cell_best = (marker, scores[pattern])
+            if black is None or cell_best[1] > black[1]:
+                black = cell_best
+
+            cell_best = None
+            for key in white_keys:
+                marker, pattern = PATTERN_TABLE[key]
+                if cell_best is None or scores[pattern] > cell_best[1]:
+                    cell_best = (marker, scores[pattern])
+            if white is None or cell_best[1] > white[1]:
+                white = cell_best
+
+        if black is None:
+            raise ValueError("비어있는 칸이 없습니다.")
+
+        if cache is not None:
+            cache.put(black_key, black)
+            cache.put(white_key, white)
+
+        return black, white
+
+    # player의 관점에서 빈 칸과 방향(4 방향)마다의 패턴을 세어, weights.PATTERNS 순서의 리스트로 반환합니다.
+    # heuristic_evaluation의 값은 0보다 많이 센 패턴들의 가중치 중 가장 큰 값과 같으므로,
+    # 가중치 tuning은 position마다 이 결과만 저장하고 오목판을 다시 조사하지 않습니다.
+    def pattern_counts(self, player):
+        pattern_counts = [0] * len(weights.PATTERNS)
+        cells = self.board.cells
+        rays = self.board.rays
+        color = player.color
+
+        for index, cur_color in enumerate(cells):
+            if cur_color != '.':
+                continue
+
+            counts = []
+            stucked = []
+            for ray in rays[index]:
+                count_player = 0
+                is_stucked = False
+                for cell in ray:
+                    if cells[cell] != color:
+                        if cells[cell] != '.':
+                            is_stucked = True
+                        break
+                    count_player += 1
+                counts.append(count_player)
+                stucked.append(is_stucked)
+
+            for direction in range(4):
+                marker, pattern = PATTERN_TABLE[((counts[direction]*RAY_SIDES + counts[direction+4])*2
+                                                 + stucked[direction])*2 + stucked[direction+4]]
+                pattern_counts[pattern] += 1
+
+        return pattern_counts
+
         
 
 
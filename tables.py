@@ -0,0 +1,96 @@
+import os
+import pickle
+
+#####################################################################
+#
+#   Precomputed Tables
+#   오목판의 크기마다 미리 계산하는 표들(ray, Zobrist, 거리 순서 등)을
+#   cache directory에 저장하고, 다음 프로세스부터는 파일에서 불러옵니다.
+#   self-play처럼 프로세스를 많이 시작할 때, 프로세스마다 표를 다시 만들지 않습니다.
+#
+#   - load(name, key, build, check)
+#       name 표를 cache directory에서 불러옵니다.
+#       파일이 없거나, 파일의 버전이나 key가 다르거나, 불러온 표가 check(tables)를 통과하지 못하면
+#       build()로 만들어 저장합니다.
+#       key에는 표를 만드는 데 사용한 모든 값(오목판의 크기, seed 등)을 넣습니다.
+#       check는 불러온 표의 모양(칸의 수 등)이 key와 맞는지 확인합니다.
+#
+#   - cache_dir()
+#       표를 저장하는 directory를 반환합니다.
+#       GOMOKU_CACHE_DIR 환경 변수로 바꿀 수 있으며, 빈 문자열이라면 파일에 저장하지 않습니다.
+#       기본값은 $XDG_CACHE_HOME/gomoku (없다면 ~/.cache/gomoku) 입니다.
+#
+#####################################################################
+
+# 표를 만드는 방식이나 파일의 형식이 바뀌면 값을 올립니다.
+# 버전이 다른 파일은 불러오지 않고 새로 만듭니다.
+TABLES_VERSION = 1
+
+CACHE_DIR_ENV = "GOMOKU_CACHE_DIR"
+
+
+def cache_dir():
+    path = os.environ.get(CACHE_DIR_ENV)
+    if path is not None:
+        return path or None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "gomoku")
+
+
+def table_path(name, key):
+    directory = cache_dir()
+    if directory is None:
+        return None
+    return os.path.join(directory, "{}-{}-v{}.pkl".format(name, "-".join(str(part) for part in key), TABLES_VERSION))
+
+
+# path의 표를 읽습니다. 읽을 수 없거나 사용할 수 없는 표라면 None을 반환합니다.
+def read(path, key, check):
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, TypeError,
+            ImportError, IndexError, KeyError):
+        return None
+
+    # 다른 버전이나 다른 key로 만든 표, 모양이 맞지 않는 표는 사용하지 않습니다.
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get("version") != TABLES_VERSION or snapshot.get("key") != key:
+        return None
+    tables = snapshot.get("tables")
+    try:
+        if check is not None and not check(tables):
+            return None
+    except (TypeError, KeyError, IndexError, AttributeError):
+        return None
+    return tables
+
+
+def load(name, key, build, check=None):
+    path = table_path(name, key)
+    if path is not None:
+        tables = read(path, key, check)
+        if tables is not None:
+            return tables
+
+    tables = build()
+    if path is None:
+        return tables
+
+    # 여러 프로세스가 동시에 같은 표를 저장할 수 있으므로,
+    # 프로세스마다 다른 임시 파일에 저장한 뒤 교체합니다.
+    # 저장할 수 없는 환경이라면 만든 표를 그대로 사용합니다.
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            pickle.dump({"version": TABLES_VERSION, "key": key, "tables": tables},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return tables
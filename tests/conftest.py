@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 모듈들은 저장소의 최상위에 있으므로, tests 밖에서 import할 수 있도록 경로를 추가합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트가 사용자의 cache directory에 표를 쓰지 않도록 합니다. (tables.cache_dir 참고)
+os.environ.setdefault("GOMOKU_CACHE_DIR", "")
@@ -0,0 +1,83 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import analyze
+from record import GameRecord, RecordWriter
+from scheduler import worker_engine
+from weights import OPEN_THREE, THREE, TWO
+
+
+class ThreatTest(unittest.TestCase):
+
+    def test_largest_weight(self):
+        counts = [0, 0, 0, 2, 0, 5, 9, 30]
+        self.assertEqual(analyze.threat(counts, (80, 70, 60, 50, 40, 30, 10, 0)), "three")
+
+    def test_tied_weights_prefer_stronger_pattern(self):
+        counts = [0, 0, 1, 2, 0, 5, 9, 30]
+        scores = (80, 70, 50, 50, 40, 30, 10, 0)
+        self.assertEqual(analyze.threat(counts, scores), "open three")
+        # 더 강한 패턴이 없다면 가중치가 같은 다른 패턴입니다.
+        counts[OPEN_THREE] = 0
+        self.assertEqual(analyze.threat(counts, scores), "three")
+
+    def test_no_pattern(self):
+        self.assertIsNone(analyze.threat([0] * 8, (80, 70, 60, 50, 40, 30, 10, 0)))
+
+
+class AnalysePositionTest(unittest.TestCase):
+
+    def test_labels_with_tied_weights(self):
+        engine = worker_engine(9)
+        scores = engine.scores
+        tied = list(scores)
+        tied[THREE] = tied[TWO] = tied[OPEN_THREE]
+        engine.scores = tuple(tied)
+        try:
+            # 백이 둘 차례이며 백의 3은 흑에 막혀 있고, 흑은 열린 3을 가지고 있습니다.
+            moves = [(4, 2), (1, 1), (4, 3), (1, 2), (4, 4), (1, 3), (1, 0), (8, 8)]
+            result = analyze.analyse_position(("games.jsonl", 0, 7, 9, moves, 200))
+        finally:
+            engine.scores = scores
+        self.assertEqual(result["color"], 'W')
+        self.assertEqual(result["threat"], "three")
+        self.assertEqual(result["opponent_threat"], "open three")
+        self.assertEqual(result["played"], [8, 8])
+
+
+class RunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.records = os.path.join(self.directory.name, "games.jsonl")
+        self.output = os.path.join(self.directory.name, "analysis.jsonl")
+        with RecordWriter(self.records) as writer:
+            writer.write(GameRecord(9, [(4, 4), (4, 5), (3, 3), (5, 5)], 'B'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output(self):
+        with open(self.output, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_writes_in_order_and_resumes(self):
+        log = io.StringIO()
+        self.assertEqual(analyze.run([self.records], self.output, 100, workers=1, min_ply=1, log=log), 3)
+        results = self.read_output()
+        self.assertEqual([result["ply"] for result in results], [1, 2, 3])
+
+        # 같은 명령을 다시 실행하면 분석한 position을 건너뜁니다.
+        self.assertEqual(analyze.run([self.records], self.output, 100, workers=1, min_ply=1, log=log), 3)
+        self.assertEqual(self.read_output(), results)
+
+    def test_rejects_other_settings(self):
+        analyze.run([self.records], self.output, 100, workers=1, log=io.StringIO())
+        self.assertRaises(ValueError, analyze.run, [self.records], self.output, 200, workers=1, log=io.StringIO())
+
+
+if __name__ == "__main__":
+    unittest.main()
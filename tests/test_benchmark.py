@@ -0,0 +1,36 @@
+import contextlib
+import io
+import unittest
+
+import benchmark
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def test_load_position_side_to_move(self):
+        for name, moves in benchmark.POSITIONS.items():
+            state, player = benchmark.load_position(moves)
+            self.assertEqual(player.color, "BW"[len(moves) % 2])
+            self.assertEqual(state.get_current_coordinate(), moves[-1])
+
+    def test_hot_path_benchmarks_leave_position_unchanged(self):
+        state, player = benchmark.load_position(benchmark.POSITIONS["early"])
+        cells = list(state.board.cells)
+        board_hash = state.board.hash
+        with contextlib.redirect_stdout(io.StringIO()):
+            for name, bench in benchmark.BENCHMARKS:
+                ops, elapsed = benchmark.measure(bench(state, player), 1)
+                self.assertGreater(ops, 0, name)
+        self.assertEqual(state.board.cells, cells)
+        self.assertEqual(state.board.hash, board_hash)
+
+    def test_compare_reports_slowdowns_only(self):
+        baseline = {"a": {"ops_per_sec": 100.0}, "b": {"nodes_per_sec": 100.0}, "c": {"ops_per_sec": 100.0}}
+        current = {"a": {"ops_per_sec": 95.0}, "b": {"nodes_per_sec": 80.0}, "c": {"ops_per_sec": 150.0},
+                   "d": {"ops_per_sec": 1.0}}
+        regressions = benchmark.compare(baseline, current, 0.1)
+        self.assertEqual([name for name, before, after, change in regressions], ["b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import random
+import unittest
+
+from board import Board, DY, DX, RAY_LENGTH, MIN_DIMENSION, MAX_DIMENSION, check_dimension, row_label, parse_row
+from player import Player
+
+
+class FindCurrentClosestTest(unittest.TestCase):
+
+    def test_returns_nearest_action(self):
+        board = Board(9)
+        actions = [(0, 0), (4, 6), (8, 8), (1, 1)]
+        self.assertEqual(board.find_current_closest((4, 4), actions), (4, 6))
+        self.assertIsNone(board.find_current_closest((4, 4), []))
+
+    def test_ties_are_broken_by_seeded_rng(self):
+        actions = [(3, 3), (3, 5), (5, 3), (5, 5), (0, 0)]
+        choices = []
+        for _ in range(2):
+            board = Board(9, random.Random(7))
+            choices.append([board.find_current_closest((4, 4), actions) for _ in range(20)])
+        self.assertEqual(choices[0], choices[1])
+        self.assertTrue(set(choices[0]) <= {(3, 3), (3, 5), (5, 3), (5, 5)})
+        self.assertGreater(len(set(choices[0])), 1)
+
+    def test_action_order_does_not_matter(self):
+        actions = [(3, 3), (3, 5), (5, 3), (5, 5)]
+        first = Board(9, random.Random(3)).find_current_closest((4, 4), actions)
+        second = Board(9, random.Random(3)).find_current_closest((4, 4), list(reversed(actions)))
+        self.assertEqual(first, second)
+
+    def test_current_outside_board(self):
+        board = Board(9, random.Random(0))
+        self.assertEqual(board.find_current_closest((-5, -5), [(0, 1), (8, 8)]), (0, 1))
+
+
+# (y, x)의 돌을 지나는 4 방향의 연속된 같은 색 돌의 수 중 가장 큰 값을 좌표로 직접 셉니다.
+def naive_line_length(board, y, x):
+    color = board.on((y, x))
+    longest = 0
+    for direction in range(4):
+        count = 1
+        for sign in (1, -1):
+            ny, nx = y + sign*DY[direction], x + sign*DX[direction]
+            while board.on((ny, nx)) == color:
+                count += 1
+                ny, nx = ny + sign*DY[direction], nx + sign*DX[direction]
+        longest = max(longest, count)
+    return longest
+
+
+class RayTableTest(unittest.TestCase):
+
+    def test_rays_follow_directions(self):
+        for dimension in (5, 9):
+            board = Board(dimension)
+            for index in range(dimension * dimension):
+                y, x = divmod(index, dimension)
+                for direction, ray in enumerate(board.rays[index]):
+                    expected = []
+                    for dist in range(1, RAY_LENGTH + 1):
+                        ny, nx = y + dist*DY[direction], x + dist*DX[direction]
+                        if not (0 <= ny < dimension and 0 <= nx < dimension):
+                            break
+                        expected.append(ny*dimension + nx)
+                    self.assertEqual(ray, tuple(expected))
+
+    def test_line_length_matches_coordinate_scan(self):
+        # ray는 최대 RAY_LENGTH칸이므로 line_length는 5보다 긴 줄을 끝까지 세지 않습니다.
+        rng = random.Random(1)
+        board = Board(9)
+        for _ in range(60):
+            board.put((rng.randrange(9), rng.randrange(9)), rng.choice("BW"))
+        for index, color in enumerate(board.cells):
+            if color == '.':
+                continue
+            y, x = divmod(index, 9)
+            self.assertEqual(min(board.line_length(index), 6), min(naive_line_length(board, y, x), 6))
+
+    def test_double_three(self):
+        board = Board(9)
+        for coordinate in [(4, 2), (4, 3), (2, 5), (3, 5)]:
+            board.put(coordinate, 'B')
+
+        # (4, 5)는 가로와 세로의 열린 3을 함께 만듭니다.
+        self.assertFalse(board.place(board.index((4, 5)), 'B'))
+        self.assertEqual(board.on((4, 5)), '.')
+        self.assertTrue(board.place(board.index((4, 4)), 'B'))
+        self.assertEqual(board.on((4, 4)), 'B')
+
+    def test_double_three_removes_stone(self):
+        board = Board(9)
+        for coordinate in [(4, 2), (4, 3), (2, 5), (3, 5)]:
+            board.put(coordinate, 'B')
+        self.assertIn(board.index((4, 5)), board.forbidden_points('B'))
+        self.assertNotIn(board.index((4, 4)), board.forbidden_points('B'))
+        self.assertTrue(board.double_three((4, 5), Player('B')))
+        self.assertEqual(board.on((4, 5)), '.')
+
+
+class MakeUnmakeTest(unittest.TestCase):
+
+    def test_hash_follows_place_and_remove(self):
+        rng = random.Random(5)
+        board = Board(9)
+        placed = []
+        for _ in range(200):
+            if placed and rng.random() < 0.4:
+                board.remove(placed.pop(rng.randrange(len(placed))))
+            else:
+                index = rng.randrange(81)
+                if board.cells[index] == '.' and board.place(index, rng.choice("BW")):
+                    placed.append(index)
+
+            expected = Board(9)
+            expected.set_position(board.cells)
+            self.assertEqual(board.hash, expected.hash)
+
+        for index in placed:
+            board.remove(index)
+        self.assertEqual(board.hash, 0)
+        self.assertEqual(board.cells, ['.'] * 81)
+
+    def test_generate_moves_orders_by_distance(self):
+        board = Board(9)
+        board.put((4, 4), 'B')
+        buffer = [0] * 81
+        count = board.generate_moves(board.index((4, 4)), buffer)
+        self.assertEqual(count, 80)
+        distances = [max(abs(y - 4), abs(x - 4)) for y, x in map(board.coordinate, buffer[:count])]
+        self.assertEqual(distances, sorted(distances))
+        self.assertNotIn(board.index((4, 4)), buffer[:count])
+
+
+class DimensionTest(unittest.TestCase):
+
+    def test_check_dimension(self):
+        self.assertEqual(check_dimension(MIN_DIMENSION), MIN_DIMENSION)
+        self.assertEqual(check_dimension(MAX_DIMENSION), MAX_DIMENSION)
+        for dimension in (MIN_DIMENSION - 1, MAX_DIMENSION + 1, 9.0, "9"):
+            with self.assertRaises(ValueError):
+                check_dimension(dimension)
+
+    def test_row_labels_round_trip(self):
+        for y in range(MAX_DIMENSION):
+            self.assertEqual(parse_row(row_label(y)), y)
+        self.assertEqual(parse_row("?"), -1)
+        self.assertEqual(parse_row("AB"), -1)
+
+    def test_tables_follow_dimension(self):
+        for dimension in (MIN_DIMENSION, 13, MAX_DIMENSION):
+            board = Board(dimension)
+            self.assertEqual(len(board.cells), dimension * dimension)
+            self.assertEqual(len(board.rays), dimension * dimension)
+            self.assertEqual(len(board.zobrist['B']), dimension * dimension)
+        # 크기가 다른 오목판의 같은 칸은 다른 해시를 갖습니다.
+        self.assertNotEqual(Board(9).zobrist['B'][0], Board(13).zobrist['B'][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+
+from cache import EvaluationCache, TranspositionTable, MemoryBudget, EXACT, LOWER, UPPER
+
+
+class EvaluationCacheTest(unittest.TestCase):
+
+    def test_get_and_put(self):
+        cache = EvaluationCache()
+        self.assertIsNone(cache.get((1, 'B')))
+        cache.put((1, 'B'), (4, 80))
+        self.assertEqual(cache.get((1, 'B')), (4, 80))
+        self.assertEqual(cache.usage()["hits"], 1)
+        self.assertEqual(cache.usage()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = EvaluationCache()
+        cache.put((1, 'B'), (1, 10))
+        cache.resize(cache.size * 2)
+        cache.put((2, 'B'), (1, 10))
+
+        # (1, 'B')를 사용했으므로 다음 항목이 들어오면 (2, 'B')가 먼저 지워집니다.
+        cache.get((1, 'B'))
+        cache.put((3, 'B'), (1, 10))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get((1, 'B')))
+        self.assertIsNone(cache.get((2, 'B')))
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.pkl")
+            cache = EvaluationCache(path=path)
+            cache.signature = [80, 70]
+            for key in range(10):
+                cache.put((key, 'W'), (2, key))
+            self.assertTrue(cache.save())
+
+            loaded = EvaluationCache(path=path)
+            loaded.signature = [80, 70]
+            self.assertTrue(loaded.load())
+            self.assertEqual(list(loaded.entries.items()), list(cache.entries.items()))
+
+    def test_load_rejects_other_signature(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.pkl")
+            cache = EvaluationCache(path=path)
+            cache.signature = [80, 70]
+            cache.put((1, 'B'), (4, 80))
+            cache.save()
+
+            loaded = EvaluationCache(path=path)
+            loaded.signature = [10, 0]
+            self.assertFalse(loaded.load())
+            self.assertEqual(len(loaded), 0)
+
+    def test_load_ignores_broken_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.pkl")
+            with open(path, "wb") as f:
+                f.write(b"not a pickle")
+            self.assertFalse(EvaluationCache(path=path).load())
+
+
+class TranspositionTableTest(unittest.TestCase):
+
+    def test_put_and_get(self):
+        table = TranspositionTable()
+        self.assertIsNone(table.get((1, 0)))
+        table.put((1, 0), 2, LOWER, 30, 40)
+        self.assertEqual(table.get((1, 0)), (2, LOWER, 30, 40))
+        self.assertEqual(table.best_action((1, 0)), 40)
+        self.assertIsNone(table.best_action((2, 0)))
+
+    def test_keeps_deeper_exact_result(self):
+        table = TranspositionTable()
+        table.put((1, 0), 3, EXACT, 10, 5)
+        table.put((1, 0), 1, UPPER, -20, 6)
+        self.assertEqual(table.get((1, 0)), (3, EXACT, 10, 5))
+
+        # 같거나 더 깊은 결과는 덮어씁니다.
+        table.put((1, 0), 3, LOWER, 20, 7)
+        self.assertEqual(table.get((1, 0)), (3, LOWER, 20, 7))
+
+    def test_evicts_oldest_entry(self):
+        table = TranspositionTable()
+        table.put((1, 0), 1, EXACT, 0, 1)
+        table.resize(table.size * 2)
+        table.put((2, 0), 1, EXACT, 0, 1)
+        table.put((3, 0), 1, EXACT, 0, 1)
+        self.assertIsNone(table.get((1, 0)))
+        self.assertIsNotNone(table.get((3, 0)))
+        self.assertLessEqual(table.size, table.max_bytes)
+
+
+class MemoryBudgetTest(unittest.TestCase):
+
+    def test_split_by_weights(self):
+        budget = MemoryBudget(1000, {"evaluation": 1, "transposition": 3})
+        evaluation = budget.register("evaluation", EvaluationCache())
+        table = budget.register("transposition", TranspositionTable())
+        self.assertEqual(evaluation.max_bytes, 250)
+        self.assertEqual(table.max_bytes, 750)
+
+        budget.set_total(2000)
+        self.assertEqual(evaluation.max_bytes, 500)
+        self.assertEqual(table.max_bytes, 1500)
+
+    def test_caches_stay_within_budget(self):
+        budget = MemoryBudget(20000)
+        evaluation = budget.register("evaluation", EvaluationCache())
+        table = budget.register("transposition", TranspositionTable())
+        for key in range(1000):
+            evaluation.put((key, 'B'), (2, 60))
+            table.put((key, 0), 1, EXACT, 0, key)
+        usage = budget.usage()
+        self.assertLessEqual(usage["total"]["bytes"], 20000)
+        self.assertEqual(usage["total"]["max_bytes"], 20000)
+        self.assertGreater(len(evaluation), 0)
+        self.assertGreater(len(table), 0)
+
+    def test_shrinking_evicts(self):
+        budget = MemoryBudget(100000)
+        evaluation = budget.register("evaluation", EvaluationCache())
+        for key in range(100):
+            evaluation.put((key, 'B'), (2, 60))
+        budget.set_total(2000)
+        self.assertLessEqual(evaluation.size, evaluation.max_bytes)
+        self.assertIsNotNone(evaluation.get((99, 'B')))
+
+
+if __name__ == "__main__":
+    unittest.main()
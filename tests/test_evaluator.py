@@ -0,0 +1,64 @@
+import random
+import unittest
+
+from board import Board
+from evaluator import VALUE_LIMIT, PatternEvaluator
+from player import Player
+from position import state_from_moves
+import weights
+
+
+# 빈 칸과 방향마다의 패턴 가중치를 모두 더한 값입니다.
+def pattern_sum(state, color, scores):
+    counts = state.pattern_counts(Player(color))
+    return sum(count * score for count, score in zip(counts, scores))
+
+
+class PatternEvaluatorTest(unittest.TestCase):
+
+    def test_reset_matches_pattern_counts(self):
+        state = state_from_moves([(4, 4), (4, 5), (3, 3), (5, 5), (3, 5), (2, 6)], 9)
+        evaluator = PatternEvaluator(weights.DEFAULT_WEIGHTS)
+        evaluator.reset(state.board)
+        self.assertEqual(evaluator.totals, [pattern_sum(state, 'B', weights.DEFAULT_WEIGHTS),
+                                            pattern_sum(state, 'W', weights.DEFAULT_WEIGHTS)])
+
+    # search와 같이 돌을 두고 되돌리는 순서를 랜덤하게 만들어, 매번 다시 계산한 합과 비교합니다.
+    def test_update_after_random_make_unmake(self):
+        rng = random.Random(0)
+        scores = (90, 75, 60, 45, 40, 20, 5, 1)
+        for dimension in (7, 9):
+            state = state_from_moves([], dimension)
+            board = state.board
+            evaluator = PatternEvaluator(scores)
+            evaluator.reset(board)
+            placed = []
+            for step in range(200):
+                if placed and (rng.random() < 0.4 or len(placed) > dimension * 2):
+                    index = placed.pop(rng.randrange(len(placed)))
+                    board.remove(index)
+                else:
+                    empty = [index for index, cell in enumerate(board.cells) if cell == '.']
+                    index = rng.choice(empty)
+                    if not board.place(index, 'BW'[len(placed) % 2]):
+                        continue
+                    placed.append(index)
+                evaluator.update(board, index)
+
+                self.assertEqual(evaluator.totals, [pattern_sum(state, 'B', scores), pattern_sum(state, 'W', scores)])
+
+            fresh = PatternEvaluator(scores)
+            fresh.reset(board)
+            self.assertEqual(list(evaluator.values[0]), list(fresh.values[0]))
+            self.assertEqual(list(evaluator.values[1]), list(fresh.values[1]))
+
+    def test_value_is_limited(self):
+        evaluator = PatternEvaluator(weights.DEFAULT_WEIGHTS)
+        evaluator.reset(Board(9))
+        evaluator.totals = [VALUE_LIMIT * 3, 10]
+        self.assertEqual(evaluator.value(0), VALUE_LIMIT)
+        self.assertEqual(evaluator.value(1), -VALUE_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import json
+import unittest
+
+import perft
+
+
+def golden():
+    with open(perft.GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+class PerftTest(unittest.TestCase):
+
+    def test_golden_covers_two_plies(self):
+        depths = golden()["depths"]
+        self.assertIn("1", depths)
+        self.assertIn("2", depths)
+        for depth, positions in depths.items():
+            self.assertEqual(sorted(positions), sorted(perft.POSITIONS), depth)
+
+    def test_late_position_matches_golden(self):
+        expected = golden()["depths"]["1"]
+        results = perft.run(1, ["late"])
+        failed, messages = perft.check(expected, results, strict=True)
+        self.assertFalse(failed, messages)
+
+    def test_check_reports_changes(self):
+        expected = {"late": {"best_action": [5, 9], "utility": 1001, "nodes": 983, "evaluations": 708, "seconds": 1.0}}
+
+        result = dict(expected["late"], nodes=900)
+        failed, messages = perft.check(expected, {"late": result}, strict=False)
+        self.assertFalse(failed)
+        self.assertIn("TREE", messages[0])
+        failed, messages = perft.check(expected, {"late": result}, strict=True)
+        self.assertTrue(failed)
+
+        result = dict(expected["late"], best_action=[0, 0])
+        failed, messages = perft.check(expected, {"late": result}, strict=False)
+        self.assertTrue(failed)
+        self.assertIn("FAIL", messages[0])
+
+    def test_main_rejects_missing_depth(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(perft.main(["--depth", "7", "--positions"]), 1)
+        self.assertIn("depth 7", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
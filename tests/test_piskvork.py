@@ -0,0 +1,127 @@
+import io
+import time
+import unittest
+from unittest import mock
+
+import Piskvork
+from Piskvork import ABOUT, TIME_MARGIN, PiskvorkBrain
+
+
+class PiskvorkBrainTest(unittest.TestCase):
+
+    def brain(self, dimension=15):
+        brain = PiskvorkBrain(io.StringIO())
+        brain.handle("START {}".format(dimension), iter([]))
+        brain.handle("INFO timeout_turn 300", iter([]))
+        return brain
+
+    def responses(self, brain):
+        return brain.output.getvalue().splitlines()
+
+    def test_start_and_about(self):
+        brain = self.brain()
+        brain.handle("ABOUT", iter([]))
+        self.assertEqual(self.responses(brain), ["OK", ABOUT])
+        brain.handle("START 3", iter([]))
+        self.assertTrue(self.responses(brain)[-1].startswith("ERROR"))
+
+    def test_turn_answers_empty_cell(self):
+        brain = self.brain()
+        brain.handle("TURN 7,7", iter([]))
+        x, y = [int(value) for value in self.responses(brain)[-1].split(",")]
+        self.assertNotEqual((x, y), (7, 7))
+        self.assertEqual(brain.moves, [(7, 7), (y, x)])
+        board = brain.engine.state.board
+        self.assertEqual(board.cells[board.index((y, x))], 'W')
+
+    def test_takeback(self):
+        brain = self.brain()
+        brain.handle("BEGIN", iter([]))
+        y, x = brain.moves[-1]
+        brain.handle("TAKEBACK {},{}".format(x, y), iter([]))
+        self.assertEqual(self.responses(brain)[-1], "OK")
+        self.assertEqual(brain.moves, [])
+        board = brain.engine.state.board
+        self.assertEqual(board.cells[board.index((y, x))], '.')
+
+    def test_turn_rejects_occupied_cell(self):
+        brain = self.brain()
+        brain.handle("BEGIN", iter([]))
+        y, x = brain.moves[-1]
+        board = brain.engine.state.board
+        cells, moves = list(board.cells), list(brain.moves)
+        self.assertRaises(ValueError, brain.handle, "TURN {},{}".format(x, y), iter([]))
+        self.assertRaises(ValueError, brain.handle, "TURN 15,0", iter([]))
+        self.assertEqual(board.cells, cells)
+        self.assertEqual(brain.moves, moves)
+
+    def test_play_rejects_forbidden_move(self):
+        brain = self.brain()
+        # 흑(engine)이 (7, 7)에 두면 쌍삼입니다.
+        for move in [(7, 5), (0, 0), (7, 6), (0, 14), (5, 7), (14, 0), (6, 7), (14, 14)]:
+            brain.put(move, 'BW'[len(brain.moves) % 2])
+        board = brain.engine.state.board
+        cells, moves = list(board.cells), list(brain.moves)
+        with mock.patch.object(brain.engine, "think", return_value=((7, 7), 1)):
+            brain.play()
+        self.assertTrue(self.responses(brain)[-1].startswith("ERROR"))
+        self.assertEqual(board.cells, cells)
+        self.assertEqual(brain.moves, moves)
+
+    def test_takeback_rejects_unknown_move(self):
+        brain = self.brain()
+        brain.handle("TURN 7,7", iter([]))
+        board = brain.engine.state.board
+        cells, moves = list(board.cells), list(brain.moves)
+        self.assertRaises(ValueError, brain.handle, "TAKEBACK 0,0", iter([]))
+        self.assertEqual(board.cells, cells)
+        self.assertEqual(brain.moves, moves)
+
+    def test_board_sets_colors(self):
+        brain = self.brain()
+        brain.handle("BOARD", iter(["7,7,2", "7,8,1", "8,8,2", "DONE"]))
+        board = brain.engine.state.board
+        # 상대가 한 수 더 두었으므로 engine은 백입니다.
+        self.assertEqual(board.cells[board.index((7, 7))], 'B')
+        self.assertEqual(board.cells[board.index((8, 7))], 'W')
+        self.assertEqual(board.cells[board.index(brain.moves[-1])], 'W')
+
+    def test_turn_seconds(self):
+        brain = self.brain()
+        self.assertAlmostEqual(brain.turn_seconds(), 0.3 - TIME_MARGIN)
+        brain.handle("INFO timeout_match 10000", iter([]))
+        brain.handle("INFO time_left 1000", iter([]))
+        # 남은 시간을 앞으로 둘 수의 수로 나눕니다. (15 x 15에서 112수)
+        self.assertAlmostEqual(brain.turn_seconds(), max(0.01, 1.0 / 112 - TIME_MARGIN))
+
+
+class MainTest(unittest.TestCase):
+
+    # 잘못된 명령에는 ERROR를 답하고, 그 뒤의 명령도 처리합니다.
+    def test_errors_are_answered(self):
+        commands = "START 15\nINFO timeout_turn 200\nTURN 7,7\nTURN 7,7\nTAKEBACK 0,0\nABOUT\nEND\n"
+        output = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(commands)), mock.patch("sys.stdout", output):
+            Piskvork.main()
+        responses = output.getvalue().splitlines()
+        self.assertEqual(responses[0], "OK")
+        self.assertEqual([line.split(" ")[0] for line in responses[-3:]], ["ERROR", "ERROR", ABOUT.split(" ")[0]])
+
+
+class TurnTimeTest(unittest.TestCase):
+
+    # leaf의 evaluation이 가장 오래 걸리는 큰 오목판에서도 제한 시간을 지킵니다.
+    def test_think_returns_within_margin(self):
+        brain = PiskvorkBrain(io.StringIO())
+        brain.handle("START 19", iter([]))
+        brain.handle("INFO timeout_turn 100", iter([]))
+        brain.handle("BOARD", iter(["9,9,2", "9,10,1", "10,10,2", "8,8,1", "10,9,2", "DONE"]))
+        engine = brain.engine
+        for seconds in (0.2, 0.5):
+            started = time.monotonic()
+            engine.think(engine.players[1], seconds)
+            self.assertLess(time.monotonic() - started, seconds + TIME_MARGIN)
+
+
+if __name__ == "__main__":
+    unittest.main()
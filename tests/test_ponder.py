@@ -0,0 +1,69 @@
+import contextlib
+import io
+import time
+import unittest
+
+from gomoku import Gomoku
+from position import state_from_moves
+from ponder import Ponder
+
+
+MOVES = [(4, 4), (4, 5), (3, 3), (5, 5), (3, 5)]
+
+
+def game(dimension=9):
+    game = Gomoku(seed=0, dimension=dimension)
+    game.verbose = False
+    return game
+
+
+class PonderTest(unittest.TestCase):
+
+    def test_predict_replies_is_silent_and_restores_board(self):
+        ponder = Ponder(game())
+        state = state_from_moves(MOVES, 9)
+        cells = list(state.board.cells)
+        board_hash = state.board.hash
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            replies = ponder.predict_replies(state, ponder.engine.player_w)
+
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(len(replies), ponder.width)
+        self.assertEqual(len(set(replies)), len(replies))
+        for reply in replies:
+            self.assertEqual(state.on_board(reply), '.')
+        self.assertEqual(state.board.cells, cells)
+        self.assertEqual(state.board.hash, board_hash)
+
+    def test_result_for_predicted_reply(self):
+        owner = game()
+        ponder = Ponder(owner)
+        state = state_from_moves(MOVES, 9)
+        ponder.start(state, 'B', [(2, 6)])
+        deadline = time.monotonic() + 10
+        reply_state = state_from_moves(MOVES + [(2, 6)], 9)
+        while ponder.result(reply_state) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        ponder.stop()
+
+        action, depth = ponder.result(reply_state)
+        self.assertEqual(reply_state.on_board(action), '.')
+        self.assertGreaterEqual(depth, 0)
+        self.assertIsNone(ponder.result(state_from_moves(MOVES + [(0, 0)], 9)))
+
+    def test_run_does_not_hide_errors(self):
+        ponder = Ponder(game())
+
+        def broken(*args):
+            raise RuntimeError("broken search")
+        ponder.engine.alpha_beta_search = broken
+
+        state = state_from_moves(MOVES, 9)
+        with self.assertRaises(RuntimeError):
+            ponder.run(state, ponder.engine.player_b, ponder.engine.player_w, [(2, 6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
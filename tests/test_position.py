@@ -0,0 +1,54 @@
+import unittest
+
+from board import Board
+from position import (board_from_moves, board_from_string, board_to_string, side_to_move,
+                      state_from_moves, state_from_string, summary)
+
+MOVES = [(4, 4), (4, 5), (3, 3), (5, 5), (3, 5), (2, 6)]
+
+
+class PositionTest(unittest.TestCase):
+
+    def test_hash_matches_incremental_board(self):
+        board = Board(9)
+        for i, (y, x) in enumerate(MOVES):
+            board.set_cell(board.index((y, x)), 'BW'[i % 2])
+        self.assertEqual(board_from_moves(MOVES, 9).hash, board.hash)
+        self.assertEqual(board_from_moves(MOVES, 9).cells, board.cells)
+
+    def test_rejects_bad_moves(self):
+        self.assertRaises(ValueError, board_from_moves, [(4, 4), (4, 4)], 9)
+        self.assertRaises(ValueError, board_from_moves, [(9, 0)], 9)
+
+    def test_string_round_trip(self):
+        board = board_from_moves(MOVES, 9)
+        text = board_to_string(board)
+        self.assertEqual(text, "9/9/6W2/3B1B3/4BW3/5W3/9/9/9")
+        loaded = board_from_string(text)
+        self.assertEqual(loaded.cells, board.cells)
+        self.assertEqual(loaded.hash, board.hash)
+        self.assertEqual(board_to_string(Board(9)), "/".join(["9"] * 9))
+
+    def test_rejects_bad_string(self):
+        self.assertRaises(ValueError, board_from_string, "9/9/9/9/4X4/9/9/9/9")
+        self.assertRaises(ValueError, board_from_string, "9/9/9/9/4B3/9/9/9/9")
+
+    def test_states(self):
+        self.assertEqual(state_from_moves(MOVES, 9).get_current_coordinate(), (2, 6))
+        self.assertIsNone(state_from_string("9/9/9/9/4B4/9/9/9/9").get_current_coordinate())
+        self.assertEqual(state_from_string("9/9/9/9/4B4/9/9/9/9", [4, 4]).get_current_coordinate(), (4, 4))
+
+    def test_side_to_move_and_summary(self):
+        self.assertEqual(side_to_move(board_from_moves(MOVES, 9)), 0)
+        board = board_from_moves(MOVES[:5], 9)
+        self.assertEqual(side_to_move(board), 1)
+        info = summary(board, distance=1)
+        self.assertEqual(info["hash"], board.hash)
+        self.assertEqual(info["stones"], {'B': 3, 'W': 2})
+        self.assertEqual(info["to_move"], 'W')
+        self.assertEqual(info["candidates"], board.candidates(1))
+        self.assertEqual(info["forbidden"], board.forbidden_points('W'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from record import GameRecord, RecordWriter, from_notation, read_records, to_notation
+
+
+class GameRecordTest(unittest.TestCase):
+
+    def record(self):
+        record = GameRecord(15, metadata={"black": "AI"})
+        record.add((7, 7), [2, 150, 120, 30])
+        record.add((7, 8))
+        record.add((8, 8), [3, 900, 700, 210])
+        record.result = 'B'
+        return record
+
+    def test_json_round_trip(self):
+        record = self.record()
+        loaded = GameRecord.from_json(record.to_json())
+        self.assertEqual(loaded.dimension, 15)
+        self.assertEqual(loaded.moves, [(7, 7), (7, 8), (8, 8)])
+        self.assertEqual(loaded.result, 'B')
+        self.assertEqual(loaded.metadata, {"black": "AI"})
+        self.assertIsNone(loaded.stat(1))
+        self.assertEqual(loaded.stat(2), {"depth": 3, "nodes": 900, "evaluations": 700, "ms": 210})
+
+    def test_rejects_broken_line(self):
+        self.assertRaises(ValueError, GameRecord.from_json, '{"v": 2, "dimension": 15, "moves": []}')
+        self.assertRaises(ValueError, GameRecord.from_json, '{"v": 1, "dimension": 15, "moves": [225]}')
+        self.assertRaises(ValueError, GameRecord.from_json,
+                          '{"v": 1, "dimension": 15, "moves": [0, 1], "stats": [null]}')
+
+    def test_notation(self):
+        record = self.record()
+        self.assertEqual(to_notation(record), "h8 i8 i9")
+        self.assertEqual(from_notation("h8, i8 i9", 15).moves, record.moves)
+        self.assertRaises(ValueError, from_notation, "p1", 15)
+        self.assertRaises(ValueError, from_notation, "a0", 15)
+
+
+class RecordFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_and_read(self, name):
+        path = os.path.join(self.directory.name, name)
+        with RecordWriter(path, append=False) as writer:
+            writer.write(GameRecord(9, [(4, 4), (4, 5)], 'W'))
+        with RecordWriter(path) as writer:
+            writer.write(GameRecord(9, [(0, 0)]))
+            self.assertEqual(writer.count, 1)
+        records = list(read_records(path))
+        self.assertEqual([record.moves for record in records], [[(4, 4), (4, 5)], [(0, 0)]])
+        self.assertEqual([record.result for record in records], ['W', ""])
+        return path
+
+    def test_plain_file(self):
+        self.write_and_read("games.jsonl")
+
+    def test_gzip_file(self):
+        path = self.write_and_read("games.jsonl.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+
+    def test_reports_broken_line(self):
+        path = os.path.join(self.directory.name, "broken.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(GameRecord(9, [(4, 4)]).to_json() + "\n\nnot json\n")
+        records = read_records(path)
+        self.assertEqual(next(records).moves, [(4, 4)])
+        with self.assertRaises(ValueError) as context:
+            next(records)
+        self.assertIn(":3", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
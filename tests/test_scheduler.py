@@ -0,0 +1,107 @@
+import concurrent.futures
+import threading
+import time
+import unittest
+
+from scheduler import EngineScheduler, Job, JobStop
+
+
+class Target(object):
+
+    # multiprocessing.Value 대신 사용하는 값입니다.
+    def __init__(self, value=-1):
+        self.value = value
+
+
+class JobStopTest(unittest.TestCase):
+
+    def test_ignores_stop_for_other_job(self):
+        target = Target()
+        stop = JobStop(target, 3)
+        self.assertFalse(stop.is_set())
+        target.value = 2
+        self.assertFalse(stop.is_set())
+        self.assertFalse(stop.triggered)
+
+    def test_stays_set_after_trigger(self):
+        target = Target()
+        stop = JobStop(target, 3)
+        target.value = 3
+        self.assertTrue(stop.is_set())
+        # dispatcher가 다음 job을 위해 값을 지워도 이 job은 계속 중단됩니다.
+        target.value = -1
+        self.assertTrue(stop.is_set())
+        self.assertTrue(stop.triggered)
+
+
+class FinishTest(unittest.TestCase):
+
+    # worker process 없이 dispatcher의 상태만 가진 scheduler를 만듭니다.
+    def scheduler(self, job):
+        scheduler = EngineScheduler.__new__(EngineScheduler)
+        scheduler.waiting = []
+        scheduler.running = [job]
+        scheduler.count = 1
+        scheduler.lock = threading.Lock()
+        return scheduler
+
+    def job(self, preemptible=True):
+        return Job(7, 9, [], 1.0, time.monotonic() + 1.0, preemptible, None)
+
+    def test_keeps_result_that_finished_before_stop(self):
+        job = self.job()
+        scheduler = self.scheduler(job)
+        scheduler.finish(0, job.id, ([4, 4], 2), False)
+        self.assertEqual(job.future.result(timeout=0), ([4, 4], 2))
+        self.assertEqual(scheduler.waiting, [])
+        self.assertEqual(scheduler.count, 0)
+
+    def test_requeues_stopped_job(self):
+        job = self.job()
+        scheduler = self.scheduler(job)
+        scheduler.finish(0, job.id, ([4, 4], 1), True)
+        self.assertFalse(job.future.done())
+        self.assertEqual([entry[2] for entry in scheduler.waiting], [job])
+        self.assertEqual(scheduler.count, 1)
+        self.assertIsNone(scheduler.running[0])
+
+    def test_delivers_error_of_stopped_job(self):
+        job = self.job()
+        scheduler = self.scheduler(job)
+        scheduler.finish(0, job.id, ValueError("error"), True)
+        self.assertRaises(ValueError, job.future.result, 0)
+
+    def test_ignores_result_of_other_job(self):
+        job = self.job()
+        scheduler = self.scheduler(job)
+        scheduler.finish(0, job.id + 1, ([4, 4], 1), False)
+        self.assertFalse(job.future.done())
+
+
+class PreemptionTest(unittest.TestCase):
+
+    def test_urgent_job_preempts_analysis(self):
+        scheduler = EngineScheduler(workers=1)
+        try:
+            # worker의 engine을 미리 만들어서 첫 요청의 시간에 포함되지 않도록 합니다.
+            scheduler.submit(15, [(7, 7)], 0.05).result(timeout=30)
+
+            moves = [(7, 7), (7, 8), (8, 8), (6, 6)]
+            analysis = scheduler.submit(15, moves, 3.0, preemptible=True)
+            time.sleep(0.3)
+            urgent = scheduler.submit(15, moves, 0.2)
+
+            done, _ = concurrent.futures.wait([analysis, urgent], timeout=30,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            self.assertEqual(done, {urgent})
+
+            # 중단된 분석은 다시 queue에 들어가서 끝까지 계산됩니다.
+            action, depth = analysis.result(timeout=30)
+            self.assertIsNotNone(action)
+            self.assertEqual(scheduler.pending(), 0)
+        finally:
+            scheduler.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
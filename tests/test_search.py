@@ -0,0 +1,341 @@
+import random
+import unittest
+from array import array
+from unittest import mock
+
+from board import Board
+from evaluator import PatternEvaluator
+from gomoku import Gomoku, NoLegalMove, SearchStopped, TimeOutRecord
+from position import state_from_moves
+from state import PATTERN_TABLE, scan_both
+from weights import FOUR, NONE, OPEN_TWO, THREE
+
+
+# 9x9 오목판의 position입니다. 흑부터 번갈아 둔 (y, x) 좌표들입니다.
+MOVES = [(4, 4), (4, 5), (3, 3), (5, 5), (3, 5), (2, 6)]
+
+
+def engine(dimension=9):
+    game = Gomoku(seed=0, dimension=dimension)
+    game.verbose = False
+    return game
+
+
+class TreeReuseTest(unittest.TestCase):
+
+    def test_search_result_is_stored(self):
+        game = engine()
+        state = state_from_moves(MOVES, 9)
+        action, continuity = game.alpha_beta_search(game.player_b, 1, state)
+        entry = game.transposition_table.get((state.board.hash, 0))
+        self.assertEqual(entry[0], 2)
+        self.assertEqual(state.board.coordinate(entry[3]), action)
+
+    def test_second_search_reuses_table(self):
+        game = engine()
+        state = state_from_moves(MOVES, 9)
+        game.alpha_beta_search(game.player_b, 1, state)
+        first = game.nodes
+
+        game.alpha_beta_search(game.player_b, 1, state)
+        self.assertLess(game.nodes - first, first)
+
+
+class AspirationWindowTest(unittest.TestCase):
+
+    def search(self, window, depth):
+        game = engine()
+        game.aspiration_window = window
+        state = state_from_moves(MOVES, 9)
+        for max_depth in range(depth + 1):
+            action, continuity = game.alpha_beta_search(game.player_b, max_depth, state)
+        entry = game.transposition_table.get((state.board.hash, 0))
+        return action, entry[2]
+
+    def test_window_does_not_change_result(self):
+        self.assertEqual(self.search(10, 1), self.search(None, 1))
+
+    def test_narrow_window_researches(self):
+        # window가 좁아 fail low / fail high가 발생해도 같은 결과를 얻습니다.
+        self.assertEqual(self.search(1, 1), self.search(None, 1))
+
+
+# 5 x 5 오목판을 5가 없도록 채운 칸들입니다. 각 행은 BBWWB를 두 칸씩 밀어 둡니다.
+def full_board():
+    return ['B' if (index % 5 + 2 * (index // 5)) % 4 < 2 else 'W' for index in range(25)]
+
+
+class ThinkFallbackTest(unittest.TestCase):
+
+    # 흑이 (4, 4)에 두면 쌍삼입니다.
+    DOUBLE_THREE = [(4, 2), (0, 0), (4, 3), (0, 8), (2, 4), (8, 0), (3, 4), (5, 5)]
+
+    def test_fallback_skips_double_three(self):
+        for seed in range(40):
+            game = Gomoku(seed=seed, dimension=9)
+            game.verbose = False
+            state = state_from_moves(self.DOUBLE_THREE, 9)
+            for nodes in (0, 3):
+                action, completed = game.think(game.player_b, max_nodes=nodes, state=state)
+                self.assertEqual(completed, -1)
+                self.assertNotEqual(action, (4, 4))
+                self.assertTrue(state.board.is_legal(action, 'B'), action)
+
+    def test_uses_scored_root_moves(self):
+        game = engine()
+        state = state_from_moves(MOVES, 9)
+        action, completed = game.think(game.player_b, max_nodes=20, state=state)
+        self.assertEqual(completed, -1)
+        self.assertTrue(game.root_utilities)
+        best = max(game.root_utilities.items(), key=lambda u: u[1])[0]
+        self.assertEqual(action, state.board.coordinate(best))
+
+    def test_no_legal_move(self):
+        game = engine(5)
+        state = state_from_moves([], 5)
+        state.board.set_position(full_board())
+        state.set_current_coordinate((0, 0))
+        with self.assertRaises(NoLegalMove):
+            game.alpha_beta_search(game.player_b, 0, state)
+        self.assertEqual(game.think(game.player_b, state=state), (None, -1))
+
+    def test_last_empty_cell(self):
+        # 마지막 빈 칸에 두어 오목판이 가득 차는 leaf는 비긴 것으로 평가합니다.
+        game = engine(5)
+        state = state_from_moves([], 5)
+        cells = full_board()
+        cells[12] = '.'
+        state.board.set_position(cells)
+        state.set_current_coordinate((0, 0))
+        self.assertEqual(game.think(game.player_b, max_depth=0, state=state), ((2, 2), 0))
+
+    def test_errors_are_not_hidden(self):
+        game = engine()
+        state = state_from_moves(MOVES, 9)
+        with mock.patch.object(Board, "generate_moves", side_effect=ValueError("bug")):
+            self.assertRaises(ValueError, game.think, game.player_b, state=state)
+
+
+class NegamaxTest(unittest.TestCase):
+
+    def test_finds_win_in_one(self):
+        # 흑은 (4, 2)-(4, 5)의 4를 가지고 있으므로 (4, 1)이나 (4, 6)에 두면 승리합니다.
+        game = engine()
+        state = state_from_moves([(4, 2), (0, 0), (4, 3), (0, 8), (4, 4), (8, 0), (4, 5), (8, 8)], 9)
+        action, continuity = game.alpha_beta_search(game.player_b, 0, state)
+        self.assertIn(action, [(4, 1), (4, 6)])
+        self.assertEqual(continuity, 5)
+
+    def test_blocks_four(self):
+        # 흑의 4는 (4, 1)이 막혀 있으므로, 백은 (4, 6)을 막지 않으면 다음 수에 집니다.
+        game = engine()
+        state = state_from_moves([(4, 2), (4, 1), (4, 3), (0, 8), (4, 4), (8, 0), (4, 5)], 9)
+        action, continuity = game.alpha_beta_search(game.player_w, 1, state)
+        self.assertEqual(action, (4, 6))
+
+    def test_utility_is_from_side_to_move(self):
+        # 같은 position의 utility는 두 플레이어의 관점에서 부호가 반대입니다.
+        game = engine()
+        state = state_from_moves(MOVES, 9)
+        self.assertEqual(game.evaluate(state, 0), -game.evaluate(state, 1))
+
+
+class DimensionTest(unittest.TestCase):
+
+    def test_search_on_small_boards(self):
+        for dimension in (5, 7, 11):
+            game = engine(dimension)
+            center = dimension // 2
+            state = state_from_moves([(center, center)], dimension)
+            action, completed = game.think(game.player_w, max_depth=1, state=state)
+            self.assertEqual(state.on_board(action), '.')
+            self.assertEqual(completed, 1)
+
+    def test_finished_on_small_board(self):
+        game = engine(5)
+        for x in range(5):
+            game.state.board.put((4, x), 'W')
+        self.assertEqual(game.finished(), 'W')
+
+
+class SearchStoppedTest(unittest.TestCase):
+
+    def assert_board_restored(self, game, state, cells, board_hash):
+        self.assertEqual(state.board.cells, cells)
+        self.assertEqual(state.board.hash, board_hash)
+        if game.evaluation_mode == "sum":
+            fresh = PatternEvaluator(game.scores)
+            fresh.reset(state.board)
+            self.assertEqual(game.evaluator.totals, fresh.totals)
+
+    def test_node_limit_restores_board(self):
+        for mode in ("max", "sum"):
+            for limit in (1, 7, 40, 150, 600):
+                game = engine()
+                game.evaluation_mode = mode
+                state = state_from_moves(MOVES, 9)
+                cells, board_hash = list(state.board.cells), state.board.hash
+
+                game.node_limit = limit
+                with self.assertRaises(SearchStopped):
+                    game.alpha_beta_search(game.player_b, 2, state)
+                self.assert_board_restored(game, state, cells, board_hash)
+
+    def test_stop_inside_place_restores_board(self):
+        # 돌을 둔 뒤 쌍삼을 검사하는 도중에 search가 중단되어도 오목판이 원래대로 돌아가야 합니다.
+        original = Board.is_double_three
+        for stop_after in (1, 5, 30, 120):
+            game = engine()
+            game.evaluation_mode = "sum"
+            state = state_from_moves(MOVES, 9)
+            cells, board_hash = list(state.board.cells), state.board.hash
+            calls = [0]
+
+            def is_double_three(board, index, color):
+                calls[0] += 1
+                if calls[0] == stop_after:
+                    raise SearchStopped()
+                return original(board, index, color)
+
+            with mock.patch.object(Board, "is_double_three", is_double_three):
+                with self.assertRaises(SearchStopped):
+                    game.alpha_beta_search(game.player_b, 2, state)
+            self.assert_board_restored(game, state, cells, board_hash)
+
+    def test_think_leaves_game_board_unchanged(self):
+        game = engine()
+        for move, color in zip(MOVES, "BWBWBW"):
+            game.state.board.put(move, color)
+        game.state.set_current_coordinate(MOVES[-1])
+        cells, board_hash = list(game.state.board.cells), game.state.board.hash
+
+        action, completed = game.think(game.player_b, max_nodes=300)
+        self.assertEqual(game.state.on_board(action), '.')
+        self.assertEqual(game.state.board.cells, cells)
+        self.assertEqual(game.state.board.hash, board_hash)
+
+
+class QuiescenceTest(unittest.TestCase):
+
+    # 모든 빈 칸을 조사하여 forcing move들을 고릅니다. (Gomoku.forcing_moves와 같아야 합니다)
+    def full_scan(self, board, color, threes):
+        groups = [[], [], [], []]
+        for index, cell in enumerate(board.cells):
+            if cell != '.':
+                continue
+            keys = scan_both(board.cells, board.rays[index])
+            own = min(PATTERN_TABLE[key][1] for key in keys[color])
+            opponent = min(PATTERN_TABLE[key][1] for key in keys[1 - color])
+            if own <= FOUR:
+                groups[0].append(index)
+            elif opponent <= FOUR:
+                groups[1].append(index)
+            elif own <= THREE:
+                groups[2].append(index)
+            elif own == OPEN_TWO and threes:
+                groups[3].append(index)
+        if groups[0]:
+            return groups[0], True
+        if groups[1]:
+            return groups[1], True
+        return groups[2] + groups[3], False
+
+    def test_forcing_moves_match_full_scan(self):
+        rng = random.Random(0)
+        game = engine()
+        moves = array('H', bytes(2 * 81))
+        coordinates = [(y, x) for y in range(9) for x in range(9)]
+        for _ in range(30):
+            state = state_from_moves(rng.sample(coordinates, rng.randrange(0, 30)), 9)
+            black, white = state.heuristic_evaluation_both(scores=game.scores)
+            for threes in (False, True):
+                game.quiescence_threes = threes
+                for color in (0, 1):
+                    count, forced, bests = game.forcing_moves(state.board, color, moves)
+                    self.assertEqual((list(moves[:count]), forced), self.full_scan(state.board, color, threes))
+                    # 같은 조사로 구한 값은 "max" 방식의 평가와 같습니다.
+                    self.assertEqual(bests, [black[1], white[1]])
+
+    def test_forcing_moves_on_empty_board(self):
+        game = engine()
+        count, forced, bests = game.forcing_moves(Board(9), 0, array('H', bytes(2 * 81)))
+        self.assertEqual((count, forced), (0, False))
+        self.assertEqual(bests, [game.scores[NONE], game.scores[NONE]])
+
+    def test_search_restores_board(self):
+        for mode in ("max", "sum"):
+            game = engine()
+            game.evaluation_mode = mode
+            game.quiescence_depth = 3
+            game.quiescence_threes = True
+            state = state_from_moves(MOVES, 9)
+            cells, board_hash = list(state.board.cells), state.board.hash
+            game.alpha_beta_search(game.player_b, 1, state)
+            self.assertEqual(state.board.cells, cells)
+            self.assertEqual(state.board.hash, board_hash)
+
+    def test_blocks_four_at_depth_zero(self):
+        game = engine()
+        game.quiescence_depth = 2
+        state = state_from_moves([(4, 2), (4, 1), (4, 3), (0, 8), (4, 4), (8, 0), (4, 5)], 9)
+        action, continuity = game.alpha_beta_search(game.player_w, 0, state)
+        self.assertEqual(action, (4, 6))
+
+    def test_setting_change_clears_table(self):
+        game = engine()
+        state = state_from_moves(MOVES, 9)
+        game.alpha_beta_search(game.player_b, 1, state)
+        root_key = (state.board.hash, 0)
+        entry = game.transposition_table.get(root_key)
+
+        # 설정이 같다면 이전 search의 결과를 그대로 사용합니다.
+        game.transposition_table.put((0, 0), 9, 0, 1, 0)
+        game.alpha_beta_search(game.player_b, 0, state)
+        self.assertIsNotNone(game.transposition_table.get((0, 0)))
+        self.assertEqual(game.transposition_table.get(root_key), entry)
+
+        game.quiescence_depth = 2
+        game.alpha_beta_search(game.player_b, 0, state)
+        self.assertIsNone(game.transposition_table.get((0, 0)))
+        self.assertEqual(game.transposition_table.get(root_key)[0], 1)
+
+
+class TimeOutRecordTest(unittest.TestCase):
+
+    def test_keeps_only_best_utility(self):
+        board = Board(9)
+        record = TimeOutRecord(81)
+        self.assertEqual(record.votes(board), [])
+
+        record.add(10, 5)
+        record.add(11, 5)
+        record.add(10, 5)
+        self.assertEqual(record.votes(board), [(board.coordinate(10), 2), (board.coordinate(11), 1)])
+
+        # 더 큰 utility가 기록되면 이전의 선택 횟수는 지워지고, 더 작은 utility는 무시됩니다.
+        record.add(12, 9)
+        record.add(10, 3)
+        self.assertEqual(record.votes(board), [(board.coordinate(12), 1)])
+
+    def test_reset(self):
+        board = Board(9)
+        record = TimeOutRecord(81)
+        record.add(3, 1)
+        record.reset()
+        self.assertEqual(record.votes(board), [])
+
+        record.reset(25)
+        record.add(24, 0)
+        self.assertEqual(record.votes(Board(5)), [((4, 4), 1)])
+
+    def test_fallback_uses_record(self):
+        # 완료된 depth가 없다면 think()는 기록된 action 중에서 수를 고릅니다.
+        game = engine()
+        state = state_from_moves(MOVES, 9)
+        action, completed = game.think(game.player_b, max_nodes=3, state=state)
+        self.assertEqual(completed, -1)
+        self.assertEqual(state.on_board(action), '.')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+
+from server import GameServer, Session
+
+
+class SessionTest(unittest.TestCase):
+
+    def test_play_checks_turn_and_cells(self):
+        session = Session(1, 9, 'B', 1.0)
+        self.assertIsNone(session.play((4, 4), 'B'))
+        self.assertEqual(session.play((4, 5), 'B'), "차례가 아닙니다.")
+        self.assertEqual(session.play((4, 4), 'W'), "돌을 둘 수 없는 좌표입니다.")
+        self.assertEqual(session.play((9, 0), 'W'), "돌을 둘 수 없는 좌표입니다.")
+        self.assertIsNone(session.play((0, 0), 'W'))
+        self.assertEqual(session.to_move(), 'B')
+
+    def test_five_wins(self):
+        session = Session(1, 9, 'B', 1.0)
+        for x in range(4):
+            session.play((4, x), 'B')
+            session.play((0, x * 2), 'W')
+        self.assertIsNone(session.play((4, 4), 'B'))
+        self.assertEqual(session.winner, 'B')
+        self.assertEqual(session.play((8, 8), 'W'), "게임이 끝났습니다.")
+
+    def test_ai_seconds(self):
+        self.assertEqual(Session(1, 9, 'B', 2.0).ai_seconds(), 2.0)
+        # 남은 시간을 앞으로 둘 수의 수로 나눕니다.
+        self.assertAlmostEqual(Session(1, 9, 'B', 2.0, match_time=10.0).ai_seconds(), 0.25)
+        self.assertEqual(Session(1, 9, 'B', 2.0, match_time=0.0).ai_seconds(), 0.05)
+
+
+class GameServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = GameServer(workers=1, move_time=0.2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def request(self, request, owned):
+        return asyncio.run(self.server.handle(request, owned))
+
+    def test_game_flow(self):
+        owned = set()
+        response = self.request({"cmd": "new", "dimension": 9, "color": "W"}, owned)
+        self.assertTrue(response["ok"])
+        session = response["session"]
+        self.assertIn(session, owned)
+
+        # AI가 흑이므로 첫 수를 둡니다.
+        ai_move = response["ai_move"]
+        board = self.request({"cmd": "board", "session": session}, owned)
+        self.assertEqual(board["to_move"], 'W')
+        self.assertEqual(board["board"][ai_move[0]][ai_move[1]], 'B')
+
+        empty = next((y, x) for y in range(9) for x in range(9) if board["board"][y][x] == '.')
+        response = self.request({"cmd": "move", "session": session, "move": list(empty)}, owned)
+        self.assertTrue(response["ok"])
+        self.assertEqual(len(self.request({"cmd": "board", "session": session}, owned)["moves"]), 3)
+
+        response = self.request({"cmd": "move", "session": session, "move": list(empty)}, owned)
+        self.assertFalse(response["ok"])
+
+        self.assertEqual(self.request({"cmd": "resign", "session": session}, owned)["winner"], 'B')
+        self.assertTrue(self.request({"cmd": "close", "session": session}, owned)["ok"])
+        self.assertNotIn(session, owned)
+
+    def test_sessions_belong_to_connection(self):
+        owned = set()
+        session = self.request({"cmd": "new", "dimension": 9, "color": "B"}, owned)["session"]
+        with self.assertRaises(KeyError):
+            self.request({"cmd": "board", "session": session}, set())
+
+    def test_bad_requests(self):
+        with self.assertRaises(ValueError):
+            self.request({"cmd": "new", "dimension": 3}, set())
+        with self.assertRaises(ValueError):
+            self.request({"cmd": "new", "color": "X"}, set())
+        with self.assertRaises(ValueError):
+            self.request({"cmd": "unknown"}, set())
+        status = self.request({"cmd": "status"}, set())
+        self.assertEqual(status["workers"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
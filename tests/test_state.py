@@ -0,0 +1,76 @@
+import copy
+import random
+import unittest
+
+from board import Board
+from cache import EvaluationCache
+from player import Player
+from position import state_from_moves
+from state import State
+
+
+MOVES = [(4, 4), (4, 5), (3, 3), (5, 5), (3, 5)]
+
+
+class SlotsTest(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        for instance in (State(9), Board(9), Player('B')):
+            self.assertFalse(hasattr(instance, "__dict__"), type(instance).__name__)
+            with self.assertRaises(AttributeError):
+                instance.unknown = 1
+
+    def test_copy_is_independent(self):
+        state = state_from_moves(MOVES, 9)
+        for clone in (state.copy(), copy.deepcopy(state)):
+            self.assertEqual(clone.board.cells, state.board.cells)
+            self.assertEqual(clone.board.hash, state.board.hash)
+            self.assertEqual(clone.get_current_coordinate(), state.get_current_coordinate())
+
+            clone.board.put((0, 0), 'W')
+            self.assertEqual(state.on_board((0, 0)), '.')
+            self.assertNotEqual(clone.board.hash, state.board.hash)
+
+            # 표들은 복사하지 않고 공유합니다.
+            self.assertIs(clone.board.rays, state.board.rays)
+            self.assertIs(clone.board.zobrist, state.board.zobrist)
+
+    def test_new_state(self):
+        state = state_from_moves(MOVES, 9)
+        child = state.new_state((0, 0), Player('W'))
+        self.assertEqual(child.on_board((0, 0)), 'W')
+        self.assertEqual(child.get_current_coordinate(), (0, 0))
+        self.assertEqual(state.on_board((0, 0)), '.')
+
+
+class HeuristicEvaluationBothTest(unittest.TestCase):
+
+    # 한 번의 조사로 구한 양쪽의 결과는 플레이어마다 따로 구한 결과와 marker까지 같아야 합니다.
+    def test_matches_heuristic_evaluation(self):
+        rng = random.Random(0)
+        scores = (90, 75, 60, 60, 40, 20, 5, 0)
+        black, white = Player('B'), Player('W')
+        for dimension in (5, 9, 15):
+            coordinates = [(y, x) for y in range(dimension) for x in range(dimension)]
+            for _ in range(10):
+                state = state_from_moves(rng.sample(coordinates, rng.randrange(0, dimension * 2)), dimension)
+                self.assertEqual(state.heuristic_evaluation_both(scores=scores),
+                                 (state.heuristic_evaluation(black, "max", scores=scores),
+                                  state.heuristic_evaluation(white, "max", scores=scores)))
+
+    def test_uses_cache(self):
+        state = state_from_moves(MOVES, 9)
+        cache = EvaluationCache()
+        both = state.heuristic_evaluation_both(cache)
+        self.assertEqual(cache.get((state.board.hash, 'B')), both[0])
+        self.assertEqual(cache.get((state.board.hash, 'W')), both[1])
+        self.assertEqual(state.heuristic_evaluation_both(cache), both)
+
+    def test_full_board(self):
+        state = State(5)
+        state.board.set_position(['B' if (index // 5 + index) % 2 else 'W' for index in range(25)])
+        self.assertRaises(ValueError, state.heuristic_evaluation_both)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import board
+import tables
+
+
+class TablesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.environ = mock.patch.dict(os.environ, {tables.CACHE_DIR_ENV: self.directory.name})
+        self.environ.start()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.directory.cleanup()
+
+    def builder(self, value):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"values": list(value)}
+        return build, calls
+
+    def test_builds_once_then_loads(self):
+        build, calls = self.builder([1, 2, 3])
+        self.assertEqual(tables.load("test", (3,), build), {"values": [1, 2, 3]})
+        self.assertEqual(tables.load("test", (3,), build), {"values": [1, 2, 3]})
+        self.assertEqual(len(calls), 1)
+
+    def test_rebuilds_when_check_fails(self):
+        path = tables.table_path("test", (3,))
+        with open(path, "wb") as f:
+            pickle.dump({"version": tables.TABLES_VERSION, "key": (3,), "tables": {"values": [1]}}, f)
+
+        build, calls = self.builder([1, 2, 3])
+        check = lambda loaded: len(loaded["values"]) == 3
+        self.assertEqual(tables.load("test", (3,), build, check), {"values": [1, 2, 3]})
+        self.assertEqual(len(calls), 1)
+
+        # 다시 만든 표가 저장되었으므로 다음에는 파일에서 불러옵니다.
+        self.assertEqual(tables.load("test", (3,), build, check), {"values": [1, 2, 3]})
+        self.assertEqual(len(calls), 1)
+
+    def test_rebuilds_other_version_key_or_broken_file(self):
+        path = tables.table_path("test", (3,))
+        snapshots = [
+            {"version": tables.TABLES_VERSION + 1, "key": (3,), "tables": {"values": [9]}},
+            {"version": tables.TABLES_VERSION, "key": (4,), "tables": {"values": [9]}},
+            ["not", "a", "snapshot"],
+        ]
+        for snapshot in snapshots:
+            with open(path, "wb") as f:
+                pickle.dump(snapshot, f)
+            build, calls = self.builder([1])
+            self.assertEqual(tables.load("test", (3,), build), {"values": [1]})
+            self.assertEqual(len(calls), 1)
+
+        with open(path, "wb") as f:
+            f.write(b"broken")
+        build, calls = self.builder([1])
+        self.assertEqual(tables.load("test", (3,), build), {"values": [1]})
+
+    def test_disabled_cache_dir(self):
+        with mock.patch.dict(os.environ, {tables.CACHE_DIR_ENV: ""}):
+            self.assertIsNone(tables.cache_dir())
+            build, calls = self.builder([1])
+            tables.load("test", (3,), build)
+            tables.load("test", (3,), build)
+            self.assertEqual(len(calls), 2)
+
+    def test_board_tables_reject_other_dimension(self):
+        self.assertTrue(board.check_tables(7, board.build_tables(7)))
+        self.assertFalse(board.check_tables(7, board.build_tables(9)))
+
+        # 다른 크기의 표가 7x7의 파일에 저장되어 있어도 7x7의 표를 다시 만듭니다.
+        key = (7, board.RAY_LENGTH, board.ZOBRIST_SEED)
+        with open(tables.table_path("board", key), "wb") as f:
+            pickle.dump({"version": tables.TABLES_VERSION, "key": key, "tables": board.build_tables(9)}, f)
+        with mock.patch.dict(board._board_tables, clear=True):
+            self.assertEqual(len(board.ray_table(7)), 49)
+
+
+if __name__ == "__main__":
+    unittest.main()
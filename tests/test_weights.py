@@ -0,0 +1,97 @@
+import json
+import math
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import tune
+import weights
+from player import Player
+from position import state_from_moves
+
+
+class WeightsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "weights.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_check(self):
+        self.assertEqual(weights.check([80, 70, 60, 50, 40, 30, 10, 0]), weights.DEFAULT_WEIGHTS)
+        self.assertRaises(ValueError, weights.check, weights.DEFAULT_WEIGHTS[:-1])
+        self.assertRaises(ValueError, weights.check, (101,) + weights.DEFAULT_WEIGHTS[1:])
+        self.assertRaises(ValueError, weights.check, ("80",) + weights.DEFAULT_WEIGHTS[1:])
+
+    def test_save_and_load(self):
+        scores = (90, 75, 60, 45, 40, 20, 5, 0)
+        weights.save(scores, self.path, meta={"method": "test"})
+        self.assertEqual(weights.load(self.path), scores)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["meta"], {"method": "test"})
+
+    def test_load_rejects_broken_file(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": weights.WEIGHTS_VERSION, "weights": {"open four": 80}}, f)
+        self.assertRaises(ValueError, weights.load, self.path)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 0, "weights": {}}, f)
+        self.assertRaises(ValueError, weights.load, self.path)
+
+    def test_load_default(self):
+        scores = (90, 75, 60, 45, 40, 20, 5, 0)
+        weights.save(scores, self.path)
+        with mock.patch.dict(os.environ, {weights.WEIGHTS_ENV: self.path}):
+            self.assertEqual(weights.load_default(), scores)
+        # 환경 변수로 지정한 파일이 없다면 오류입니다.
+        with mock.patch.dict(os.environ, {weights.WEIGHTS_ENV: self.path + ".missing"}):
+            self.assertRaises(OSError, weights.load_default)
+
+
+class TexelTest(unittest.TestCase):
+
+    # 패턴의 유무만으로 구한 값이 heuristic_evaluation의 값과 같아야 tuning이 engine과 같은 평가를 최적화합니다.
+    def test_mask_value_matches_heuristic_evaluation(self):
+        rng = random.Random(0)
+        scores = (90, 75, 60, 60, 40, 20, 5, 0)
+        for _ in range(20):
+            cells = rng.sample([(y, x) for y in range(9) for x in range(9)], rng.randrange(1, 30))
+            state = state_from_moves(cells, 9)
+            for color in 'BW':
+                player = Player(color)
+                mask = tune.pattern_mask(state.pattern_counts(player))
+                self.assertEqual(tune.mask_value(mask, scores), state.heuristic_evaluation(player, "max", scores=scores)[1])
+
+    def test_error_matches_direct_sum(self):
+        samples = [(0b0100, 0b1000, 1.0), (0b0100, 0b1000, 0.0), (0b0001, 0b0010, 0.5), (0b1000, 0b0001, 1.0)]
+        data = tune.TexelData()
+        for sample in samples:
+            data.add(*sample)
+        self.assertEqual(len(data.groups), 3)
+
+        scores = weights.DEFAULT_WEIGHTS
+        expected = 0.0
+        for own, opponent, result in samples:
+            evaluation = tune.mask_value(own, scores) - tune.mask_value(opponent, scores)
+            expected += (result - 1.0 / (1.0 + math.exp(-0.5 * evaluation / 100.0))) ** 2
+        self.assertAlmostEqual(data.error(scores, 0.5), expected / len(samples))
+
+    def test_tune_reduces_error(self):
+        data = tune.TexelData()
+        # 열린 3(bit 2)을 가진 플레이어가 거의 항상 이기는 data입니다.
+        for i in range(50):
+            data.add(1 << weights.OPEN_THREE, 1 << weights.TWO, 1.0 if i % 10 else 0.0)
+            data.add(1 << weights.TWO, 1 << weights.OPEN_THREE, 0.0 if i % 10 else 1.0)
+        log = open(os.devnull, "w")
+        self.addCleanup(log.close)
+        scores, meta = tune.texel_tune(data, weights.DEFAULT_WEIGHTS, log=log)
+        self.assertLessEqual(meta["error"], data.error(weights.DEFAULT_WEIGHTS, meta["k"]))
+        self.assertEqual(weights.check(scores), scores)
+
+
+if __name__ == "__main__":
+    unittest.main()
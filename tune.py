@@ -0,0 +1,290 @@
+import argparse
+import math
+import multiprocessing
+import random
+import sys
+
+import weights
+from gomoku import Gomoku
+from player import COLORS, Player
+from position import state_from_moves
+from record import read_records
+
+#####################################################################
+#
+#   Weight Tuning
+#   heuristic evaluation의 패턴 가중치(weights.PATTERNS 순서의 parameter vector)를 조정하여
+#   가중치 파일로 저장합니다. engine은 시작할 때 이 파일을 불러옵니다. (weights.py 참고)
+#
+#   - texel : 기보의 position들과 게임 결과로 logistic regression을 합니다. (Texel's tuning method)
+#       둘 차례인 플레이어가 이길 확률을 sigmoid(K * evaluation / 100)으로 보고,
+#       게임 결과(이김 1 / 비김 0.5 /짐 0)와의 평균 제곱 오차가 작아지도록 가중치를 하나씩 바꿉니다.
+#       evaluation은 양쪽 플레이어가 가진 패턴들에서만 정해지므로, position마다 패턴의 유무만
+#       process pool에서 한 번 조사하고, 그 뒤의 최적화는 오목판을 다시 조사하지 않습니다.
+#
+#   - spsa : 가중치를 조금 바꾼 두 engine(theta + c*delta, theta - c*delta)끼리 대국시켜
+#       결과로 gradient를 어림합니다. (Simultaneous Perturbation Stochastic Approximation)
+#       한 iteration의 대국들은 process pool에서 동시에 진행합니다.
+#       search는 고정된 노드 수까지만 진행하므로 대국 결과는 실행 환경에 영향을 받지 않습니다.
+#
+#   사용법
+#   python tune.py texel games.jsonl.gz --output weights.json
+#   python tune.py spsa --output weights.json --iterations 200 --nodes 2000 --dimension 15
+#
+#####################################################################
+
+# 가중치의 변화 범위입니다. tuning 결과는 정수로 저장합니다.
+def clamp(weight):
+    return max(weights.MIN_WEIGHT, min(weights.MAX_WEIGHT, int(round(weight))))
+
+
+# ---------------------------------------------------------------- texel
+
+# 패턴마다의 유무를 bit 하나로 합친 mask입니다. (bit i : weights.PATTERNS[i]가 있음)
+def pattern_mask(pattern_counts):
+    mask = 0
+    for pattern, count in enumerate(pattern_counts):
+        if count:
+            mask |= 1 << pattern
+    return mask
+
+
+# 기보 하나의 position들을 (둘 차례인 플레이어의 mask, 상대의 mask, 결과) 리스트로 바꿉니다.
+# 결과는 둘 차례인 플레이어의 관점이며, 승자가 없는 기보는 사용하지 않습니다.
+def record_samples(job):
+    record, min_ply, every = job
+    if record.result not in ("B", "W", "draw"):
+        return []
+    samples = []
+    players = [Player('B'), Player('W')]
+    for ply in range(min_ply, len(record.moves), every):
+        state = state_from_moves(record.moves[:ply], record.dimension)
+        color = ply % 2
+        if record.result == "draw":
+            result = 0.5
+        else:
+            result = 1.0 if record.result == COLORS[color] else 0.0
+        own = pattern_mask(state.pattern_counts(players[color]))
+        opponent = pattern_mask(state.pattern_counts(players[1 - color]))
+        samples.append((own, opponent, result))
+    return samples
+
+
+# mask에 있는 패턴들의 가중치 중 가장 큰 값입니다. (heuristic_evaluation과 같습니다)
+def mask_value(mask, scores):
+    return max(scores[pattern] for pattern in range(len(scores)) if mask >> pattern & 1)
+
+
+class TexelData(object):
+
+    #####################################################################
+    #
+    #   Texel Data
+    #   같은 (mask, 상대의 mask)를 갖는 position들을 묶어, 묶음마다 수와 결과의 합만 저장합니다.
+    #   평균 제곱 오차는 묶음의 수만큼의 계산으로 구할 수 있습니다.
+    #
+    #   - add(own, opponent, result)
+    #   - error(scores, k)
+    #       scores로 평가했을 때의 평균 제곱 오차를 반환합니다.
+    #
+    #####################################################################
+
+    def __init__(self):
+        super(TexelData, self).__init__()
+        self.groups = {}
+        self.count = 0
+
+    def add(self, own, opponent, result):
+        group = self.groups.setdefault((own, opponent), [0, 0.0, 0.0])
+        group[0] += 1
+        group[1] += result
+        group[2] += result * result
+        self.count += 1
+
+    def error(self, scores, k):
+        total = 0.0
+        for (own, opponent), (count, results, squares) in self.groups.items():
+            evaluation = mask_value(own, scores) - mask_value(opponent, scores)
+            p = 1.0 / (1.0 + math.exp(-k * evaluation / 100.0))
+            # sum((r - p)^2) = sum(r^2) - 2p*sum(r) + n*p^2
+            total += squares - 2 * p * results + count * p * p
+        return total / self.count
+
+
+def load_texel_data(paths, min_ply, every, workers, log=sys.stderr):
+    data = TexelData()
+    jobs = ((record, min_ply, every) for path in paths for record in read_records(path))
+    with multiprocessing.Pool(workers) as pool:
+        for samples in pool.imap_unordered(record_samples, jobs, chunksize=16):
+            for sample in samples:
+                data.add(*sample)
+    print("{}개의 position, {}개의 묶음".format(data.count, len(data.groups)), file=log)
+    return data
+
+
+# 현재 가중치에서 오차가 가장 작은 K를 찾습니다.
+def fit_k(data, scores):
+    best_k, best_error = 1.0, data.error(scores, 1.0)
+    for step in (1.0, 0.1, 0.01):
+        improved = True
+        while improved:
+            improved = False
+            for k in (best_k - step, best_k + step):
+                if k <= 0:
+                    continue
+                error = data.error(scores, k)
+                if error < best_error:
+                    best_k, best_error, improved = k, error, True
+    return best_k
+
+
+# 가중치를 하나씩 step만큼 올리거나 내려 보고, 오차가 줄어들면 받아들입니다. (local search)
+# 더 이상 줄어들지 않으면 step을 줄입니다.
+def texel_tune(data, scores, steps=(8, 4, 2, 1), log=sys.stderr):
+    scores = list(scores)
+    k = fit_k(data, scores)
+    best = data.error(scores, k)
+    print("K = {:.2f} / 처음 오차 {:.6f}".format(k, best), file=log)
+    for step in steps:
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(scores)):
+                for delta in (step, -step):
+                    candidate = scores[:]
+                    candidate[i] = clamp(candidate[i] + delta)
+                    if candidate[i] == scores[i]:
+                        continue
+                    error = data.error(candidate, k)
+                    if error < best:
+                        scores, best, improved = candidate, error, True
+                        break
+        print("step {} : 오차 {:.6f} {}".format(step, best, scores), file=log)
+    return tuple(scores), {"method": "texel", "k": k, "error": best, "positions": data.count}
+
+
+# ---------------------------------------------------------------- spsa
+
+# 두 가중치의 engine이 대국합니다. 첫 수는 중앙, 다음 opening 수는 seed로 중앙 근처에 둡니다.
+# 반환값 : 흑의 관점의 결과 (1 : 흑 승 / 0.5 : 비김 / 0 : 백 승)
+def play_game(job):
+    scores_black, scores_white, dimension, nodes, opening, seed = job
+
+    # 대국마다 새 engine을 만들어, 이전 대국의 캐시가 다른 가중치의 결과를 섞지 않도록 합니다.
+    rng = random.Random(seed)
+    engines = [Gomoku(dimension=dimension, seed=seed, scores=scores) for scores in (scores_black, scores_white)]
+    for engine in engines:
+        engine.verbose = False
+        engine.pondering = False
+
+    center = dimension // 2
+    moves = [(center, center)]
+    while len(moves) < opening:
+        move = (center + rng.randint(-2, 2), center + rng.randint(-2, 2))
+        if move not in moves:
+            moves.append(move)
+
+    state = state_from_moves(moves, dimension)
+    board = state.board
+    board.rng = rng
+    last = board.index(moves[-1])
+    while True:
+        # 직전의 수로 5개의 돌이 연속되었다면 그 수를 둔 플레이어의 승리입니다.
+        if board.line_length(last) >= 5:
+            return 1.0 if len(moves) % 2 == 1 else 0.0
+        if len(moves) == dimension * dimension:
+            return 0.5
+        color = len(moves) % 2
+        engine = engines[color]
+        action, depth = engine.think(engine.players[color], max_nodes=nodes, state=state)
+        if action is None:
+            return 0.5
+        last = board.index(action)
+        if not board.place(last, COLORS[color]):
+            # 쌍삼에 둔 플레이어는 패배합니다.
+            return 0.0 if color == 0 else 1.0
+        moves.append(action)
+        state.set_current_coordinate(action)
+
+
+def spsa_tune(scores, iterations, dimension, nodes, workers, pairs=None, a=20.0, c=4.0, opening=3,
+              seed=0, log=sys.stderr):
+    rng = random.Random(seed)
+    theta = [float(score) for score in scores]
+    pairs = pairs or workers
+    game_seed = seed
+
+    with multiprocessing.Pool(workers) as pool:
+        for iteration in range(iterations):
+            # 표준적인 SPSA의 감소하는 step 크기입니다.
+            a_k = a / (iteration + 1 + iterations * 0.1) ** 0.602
+            c_k = c / (iteration + 1) ** 0.101
+
+            # iteration마다 pairs개의 delta로 대국하여 gradient를 평균합니다.
+            # delta마다 색을 바꾼 두 대국을 합니다.
+            jobs = []
+            deltas = []
+            for pair in range(pairs):
+                delta = [rng.choice((-1, 1)) for _ in theta]
+                plus = tuple(clamp(t + c_k * d) for t, d in zip(theta, delta))
+                minus = tuple(clamp(t - c_k * d) for t, d in zip(theta, delta))
+                deltas.append(delta)
+                jobs.append((plus, minus, dimension, nodes, opening, game_seed))
+                jobs.append((minus, plus, dimension, nodes, opening, game_seed))
+                game_seed += 1
+
+            results = pool.map(play_game, jobs)
+            gradient = [0.0] * len(theta)
+            for pair, delta in enumerate(deltas):
+                # theta + c*delta의 관점의 점수 (-1부터 1까지)
+                score = (results[2 * pair] - 0.5) + (0.5 - results[2 * pair + 1])
+                for i, d in enumerate(delta):
+                    gradient[i] += score / (2 * c_k * d) / pairs
+
+            theta = [min(weights.MAX_WEIGHT, max(weights.MIN_WEIGHT, t + a_k * g)) for t, g in zip(theta, gradient)]
+            print("iteration {} : {}".format(iteration + 1, [clamp(t) for t in theta]), file=log)
+
+    return tuple(clamp(t) for t in theta), {"method": "spsa", "iterations": iterations, "nodes": nodes,
+                                            "dimension": dimension, "games": game_seed - seed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="heuristic evaluation의 패턴 가중치를 조정합니다.")
+    subparsers = parser.add_subparsers(dest="method", required=True)
+
+    texel = subparsers.add_parser("texel", help="기보의 결과로 logistic regression을 합니다.")
+    texel.add_argument("records", nargs="+", help="기보 파일들 (record.py 형식)")
+    texel.add_argument("--min-ply", type=int, default=4, help="이 수부터 position을 사용합니다.")
+    texel.add_argument("--every", type=int, default=1, help="이 수마다 한 position을 사용합니다.")
+
+    spsa = subparsers.add_parser("spsa", help="self-play 대국으로 가중치를 조정합니다.")
+    spsa.add_argument("--iterations", type=int, default=100)
+    spsa.add_argument("--pairs", type=int, default=None, help="iteration마다의 delta 수 (기본값 : worker 수)")
+    spsa.add_argument("--nodes", type=int, default=2000, help="수마다 search할 노드의 수")
+    spsa.add_argument("--dimension", type=int, default=15)
+    spsa.add_argument("--seed", type=int, default=0)
+
+    for subparser in (texel, spsa):
+        subparser.add_argument("--output", required=True, help="가중치를 저장할 파일")
+        subparser.add_argument("--start", default=None, help="시작 가중치 파일 (기본값 : 현재 가중치)")
+        subparser.add_argument("--workers", type=int, default=None, help="process 수 (기본값 : CPU 수)")
+    args = parser.parse_args(argv)
+
+    scores = weights.load(args.start) if args.start else weights.active
+    workers = args.workers or multiprocessing.cpu_count() or 1
+
+    if args.method == "texel":
+        data = load_texel_data(args.records, args.min_ply, args.every, workers)
+        if data.count == 0:
+            parser.exit(1, "승자가 있는 기보의 position이 없습니다.\n")
+        scores, meta = texel_tune(data, scores)
+    else:
+        scores, meta = spsa_tune(scores, args.iterations, args.dimension, args.nodes, workers,
+                                 args.pairs, seed=args.seed)
+
+    weights.save(scores, args.output, meta)
+    print("저장했습니다. {} : {}".format(args.output, dict(zip(weights.PATTERNS, scores))), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import json
+import os
+
+#####################################################################
+#
+#   Evaluation Weights
+#   State.heuristic_evaluation이 패턴마다 주는 값(가중치)들입니다.
+#   가중치는 PATTERNS 순서의 tuple 하나(parameter vector)이며, tune.py로 조정할 수 있습니다.
+#
+#   - load(path) / save(weights, path, meta)
+#       가중치 파일(JSON)을 읽거나 씁니다.
+#       {"version": 1, "weights": {"open four": 80, ...}, "meta": {...}}
+#
+#   - default_path()
+#       시작할 때 불러오는 가중치 파일의 경로입니다.
+#       GOMOKU_WEIGHTS 환경 변수로 바꿀 수 있으며, 기본값은 이 모듈 옆의 weights.json입니다.
+#
+#   - active
+#       새로 만드는 engine이 사용하는 가중치입니다.
+#       import할 때 default_path()의 파일이 있다면 불러오고, 없다면 DEFAULT_WEIGHTS입니다.
+#
+#   - use(weights)
+#       active를 바꿉니다. 이미 만들어진 engine의 가중치는 바뀌지 않습니다.
+#
+#####################################################################
+
+WEIGHTS_VERSION = 1
+
+WEIGHTS_ENV = "GOMOKU_WEIGHTS"
+
+# 패턴의 이름입니다. (state.heuristic_evaluation 참고)
+PATTERNS = ("open four", "four", "open three", "three", "open two", "two", "one", "none")
+
+OPEN_FOUR, FOUR, OPEN_THREE, THREE, OPEN_TWO, TWO, ONE, NONE = range(len(PATTERNS))
+
+# 손으로 정한 원래의 가중치입니다.
+DEFAULT_WEIGHTS = (80, 70, 60, 50, 40, 30, 10, 0)
+
+# 가중치의 범위입니다. 승리한 state의 utility(gomoku.WIN_UTILITY)보다 항상 작아야 합니다.
+MIN_WEIGHT = 0
+MAX_WEIGHT = 100
+
+
+def check(weights):
+    weights = tuple(weights)
+    if len(weights) != len(PATTERNS):
+        raise ValueError("가중치는 {}개입니다. : {}".format(len(PATTERNS), len(weights)))
+    for weight in weights:
+        if not isinstance(weight, (int, float)) or not MIN_WEIGHT <= weight <= MAX_WEIGHT:
+            raise ValueError("가중치는 {}부터 {}까지입니다. : {}".format(MIN_WEIGHT, MAX_WEIGHT, weight))
+    return weights
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != WEIGHTS_VERSION:
+        raise ValueError("지원하지 않는 가중치 파일 버전입니다. : {}".format(snapshot.get("version")))
+    values = snapshot["weights"]
+    missing = [name for name in PATTERNS if name not in values]
+    if missing:
+        raise ValueError("가중치 파일에 없는 패턴입니다. : {}".format(", ".join(missing)))
+    return check(values[name] for name in PATTERNS)
+
+
+def save(weights, path, meta=None):
+    weights = check(weights)
+    snapshot = {"version": WEIGHTS_VERSION, "weights": dict(zip(PATTERNS, weights))}
+    if meta:
+        snapshot["meta"] = meta
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def default_path():
+    path = os.environ.get(WEIGHTS_ENV)
+    if path:
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights.json")
+
+
+def load_default():
+    path = default_path()
+    # 환경 변수로 지정한 파일이 없다면 오류이고, 기본 경로의 파일은 없어도 됩니다.
+    if not os.path.exists(path) and not os.environ.get(WEIGHTS_ENV):
+        return DEFAULT_WEIGHTS
+    return load(path)
+
+
+active = load_default()
+
+
+def use(weights):
+    global active
+    active = check(weights)
+    return active